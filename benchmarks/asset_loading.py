@@ -0,0 +1,125 @@
+"""Arranque de una escena con modelos OBJ (sin la caché binaria, para medir el parseo) y esferas de alta
+resolución: carga síncrona en el hilo de GL vs Asset_Manager con hilos y con procesos.
+
+- primer frame: tiempo hasta poder dibujar (la síncrona tiene que cargarlo todo antes)
+- todo listo: tiempo hasta que la última malla sustituye a su caja
+- frames: frames dibujados mientras se cargaba, y el más lento de ellos
+- solapamiento: segundos de carga en el pool / segundos de pared hasta tener todo listo (con un solo
+  núcleo no pasa de 1: la carga solo se reparte entre los frames)
+
+Uso: python -m benchmarks.asset_loading
+"""
+from benchmarks.gl_context import create_context
+
+import contextlib
+import io
+import os
+import time
+
+import pygame
+from OpenGL.GL import *
+
+import main
+from glApp.AssetManager import Asset_Manager
+from glApp.Camera import Camera
+from glApp.Geometry import _cached_sphere
+from glApp.LoadMesh import LoadMesh
+from glApp.Matrices import identity, translate
+from glApp.RenderQueue import render_state
+from glApp.Sphere import Sphere
+
+WIDTH, HEIGHT = 320, 240
+# La tetera tres veces: las peticiones repetidas comparten carga y malla
+MODELS = ["models/teapot.obj", "models/teapot.obj", "models/teapot.obj", "models/donut.obj",
+          "models/cube.obj", "models/tabletop.obj", "models/tableleg.obj", "models/plane.obj"]
+SPHERES = [(radius, 512, 256) for radius in (0.5, 1.0, 1.5, 2.0)]
+
+
+class Loaded_Sphere(Sphere):
+    """Sphere con la geometría ya calculada en el pool (con procesos no se comparte la caché de sphere_geometry)"""
+    def __init__(self, program_id, size, geometry):
+        self.geometry = geometry
+        super().__init__(program_id, *size)
+
+    def create_geometry(self):
+        self.vertex_attributes, self.index_data = self.geometry
+        self.vertex_count = len(self.index_data)
+
+
+def sphere(program_id, size, geometry=None):
+    # Sphere anuncia cada esfera creada; aquí solo ensucia la tabla
+    with contextlib.redirect_stdout(io.StringIO()):
+        if geometry is None:
+            return Sphere(program_id, *size)
+        return Loaded_Sphere(program_id, size, geometry)
+
+
+def draw_frame(program_id, camera, objects):
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    render_state.use_program(program_id)
+    camera.load()
+    for item in objects:
+        item.draw()
+    glFinish()
+
+
+def synchronous(program_id, camera):
+    start = time.perf_counter()
+    objects = [LoadMesh(filename, program_id, use_cache=False) for filename in MODELS]
+    objects += [sphere(program_id, size) for size in SPHERES]
+    draw_frame(program_id, camera, objects)
+    first = time.perf_counter() - start
+    return first, first, 1, first, None
+
+
+def asynchronous(program_id, camera, processes):
+    manager = Asset_Manager(processes=processes)
+    # Los trabajadores arrancan fuera de la medida (un proceso nuevo tarda en importar NumPy y compañía)
+    manager.executor().submit(int).result()
+    start = time.perf_counter()
+    objects = [manager.load_mesh(filename, program_id, use_cache=False) for filename in MODELS]
+    spheres = [(size, manager.sphere_geometry(*size, cached=False)) for size in SPHERES]
+    first = None
+    frames = 0
+    slowest = 0.0
+    while manager.loading() or spheres:
+        frame_start = time.perf_counter()
+        manager.update()
+        # Las esferas terminadas solo suben su geometría
+        ready = [(size, future) for size, future in spheres if future.done()]
+        for size, future in ready:
+            spheres.remove((size, future))
+            objects.append(sphere(program_id, size, future.result()[0]))
+        draw_frame(program_id, camera, objects)
+        frames += 1
+        slowest = max(slowest, time.perf_counter() - frame_start)
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    manager.shutdown()
+    return first, total, frames, slowest, manager.stats["load_seconds"] / total
+
+
+def main_benchmark():
+    create_context(WIDTH, HEIGHT)
+    glViewport(0, 0, WIDTH, HEIGHT)
+    render_state.set_capability(GL_DEPTH_TEST, True)
+    program_id = main.create_program(main.vertex_shader, main.fragment_shader)
+    camera = Camera(program_id, WIDTH, HEIGHT)
+    camera.transformation = translate(identity(), 0, 0, 8)
+    camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+    print(f"{len(MODELS)} modelos OBJ sin caché binaria + {len(SPHERES)} esferas {SPHERES[0][1]}x{SPHERES[0][2]}, "
+          f"{os.cpu_count()} núcleos")
+    print(f"  {'modo':<12}{'primer frame':>14}{'todo listo':>12}{'frames':>8}{'más lento':>11}{'solapamiento':>14}")
+    for name, run in [("síncrono", lambda: synchronous(program_id, camera)),
+                      ("hilos", lambda: asynchronous(program_id, camera, False)),
+                      ("procesos", lambda: asynchronous(program_id, camera, True))]:
+        _cached_sphere.cache_clear()
+        first, total, frames, slowest, overlap = run()
+        overlap = "-" if overlap is None else f"{overlap:.2f}"
+        print(f"  {name:<12}{first * 1000:>11.1f} ms{total * 1000:>9.1f} ms{frames:>8}{slowest * 1000:>8.1f} ms"
+              f"{overlap:>14}")
+
+
+if __name__ == "__main__":
+    main_benchmark()
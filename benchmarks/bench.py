@@ -0,0 +1,291 @@
+"""Suite reproducible de render sin ventana: esferas, modelos de models/ y escenas con muchos objetos.
+
+Cada escena corre en su propio proceso (contexto GL limpio y pico de memoria propio) con un número fijo
+de frames y la cámara en una órbita fija alrededor del origen. Se guardan en JSON el arranque, la carga
+de mallas, el tiempo de frame en CPU, total y en GPU, y el pico de RSS; --compare marca las regresiones.
+
+Uso: python -m benchmarks.bench [--frames N] [--size 1000x800] [--filter texto] [--output resultados.json]
+                                [--compare base.json] [--threshold 0.1] [--list]
+"""
+from glApp.Headless import Headless_Session
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+import main
+import main2
+import main3
+from glApp.Camera import Camera
+from glApp.Culling import Bounds_Array, Frustum_Culler
+from glApp.LoadMesh import LoadMesh
+from glApp.MatteSphere import MatteSphere
+from glApp.Matrices import identity, rotate, translate
+from glApp.Profiler import profiler
+from glApp.RenderQueue import Render_Queue, render_state
+from glApp.Sphere import Sphere
+from glApp.WaterSphere import WaterSphere
+
+SPHERE_SIZES = [(32, 16), (128, 64), (512, 256)]
+SPHERES = {"metal": Sphere, "water": WaterSphere, "matte": MatteSphere}
+MANY_SPHERES = 300
+MANY_CUBES = 2000
+
+# Métrica -> (claves en el resultado, diferencia absoluta mínima para no marcar ruido)
+METRICS = {"startup_s": (("startup_s",), 0.05),
+           "mesh_load_s": (("mesh_load_s",), 0.01),
+           "cpu_ms p50": (("cpu_ms", "p50"), 0.1),
+           "frame_ms p50": (("frame_ms", "p50"), 0.2),
+           "frame_ms p95": (("frame_ms", "p95"), 0.5),
+           "gpu_ms p50": (("gpu_ms", "p50"), 0.1),
+           "peak_rss_mb": (("peak_rss_mb",), 5.0)}
+
+
+def scene_names():
+    names = [f"sphere-{material}-{slices}x{stacks}" for material in SPHERES for slices, stacks in SPHERE_SIZES]
+    names += [f"mesh-{os.path.splitext(name)[0]}" for name in sorted(os.listdir("models")) if name.endswith(".obj")]
+    names += [f"many-spheres-{MANY_SPHERES}", f"many-cubes-{MANY_CUBES}"]
+    return names
+
+
+class Bench_Scene():
+    """Escena con la interfaz de PyOGApp (initialise, camera_init, display) para correrla en Headless_Session"""
+    def __init__(self, name, width, height, frames):
+        self.name = name
+        self.screen_width = width
+        self.screen_height = height
+        self.frames = frames
+        self.frame = 0
+        self.mesh_load = 0.0
+        self.objects = []
+        self.culler = None
+        self.bounds = None
+        self.distance = 5.0
+
+    def initialise(self):
+        self.programs = {"metal": main.create_program(main.vertex_shader, main.fragment_shader),
+                         "water": main2.create_program(main2.vertex_shader_water, main2.fragment_shader_water),
+                         "matte": main3.create_program(main3.vertex_shader_matte, main3.fragment_shader_matte)}
+        self.camera = Camera(self.programs["metal"], self.screen_width, self.screen_height)
+        for program_id in self.programs.values():
+            self.camera.attach(program_id)
+        self.camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+        self.queue = Render_Queue(self.camera)
+        render_state.set_capability(GL_DEPTH_TEST, True)
+        glClearColor(0.1, 0.1, 0.12, 1.0)
+
+        kind, _, detail = self.name.partition("-")
+        start = time.perf_counter()
+        getattr(self, "build_" + kind)(detail)
+        self.mesh_load = time.perf_counter() - start
+
+    def build_sphere(self, detail):
+        material, size = detail.split("-")
+        slices, stacks = map(int, size.split("x"))
+        self.objects = [SPHERES[material](self.programs[material], slices=slices, stacks=stacks)]
+
+    def build_mesh(self, detail):
+        # Sin caché binario: se mide siempre el parseo del OBJ
+        mesh = LoadMesh(os.path.join("models", detail + ".obj"), self.programs["matte"], use_cache=False)
+        self.objects = [mesh]
+        self.distance = 2.5 * mesh.bounds.radius + float(np.abs(mesh.bounds.center).max())
+
+    def build_many(self, detail):
+        kind, count = detail.split("-")
+        rng = np.random.default_rng(18)
+        positions = rng.uniform(-20, 20, (int(count), 3))
+        materials = list(SPHERES)
+        for index, (x, y, z) in enumerate(positions):
+            location = pygame.Vector3(x, y, z)
+            if kind == "spheres":
+                material = materials[index % len(materials)]
+                self.objects.append(SPHERES[material](self.programs[material], radius=0.5, slices=16, stacks=8,
+                                                      location=location))
+            else:
+                self.objects.append(LoadMesh("models/cube.obj", self.programs["matte"], location=location))
+        if kind == "cubes":
+            self.culler = Frustum_Culler(self.camera)
+            self.bounds = Bounds_Array([item.bounds for item in self.objects])
+        self.distance = 30.0
+
+    def camera_init(self):
+        # Órbita fija: una vuelta completa en la duración de la prueba, sin depender del reloj
+        angle = 360.0 * self.frame / self.frames
+        self.camera.transformation = rotate(translate(identity(), 0, 0, -self.distance), angle, "y", True)
+
+    def display(self):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        # Solo las esferas de agua leen "time"; lo fijan en su propio render()
+        for item in self.objects:
+            if isinstance(item, WaterSphere):
+                item.time = self.frame / 60.0
+        self.camera.load()
+        if self.culler is not None:
+            self.culler.update()
+            model_mats = np.array([item.model_matrix() for item in self.objects], np.float32)
+            mask = self.culler.test(model_mats, self.bounds)
+            for item, model_mat, visible in zip(self.objects, model_mats, mask):
+                if visible:
+                    self.queue.submit(item, model_mat)
+        else:
+            for item in self.objects:
+                self.queue.submit(item)
+        self.queue.flush()
+        self.frame += 1
+
+
+def run_scene(name, width, height, frames, result_path):
+    """Proceso hijo: una escena en su propio contexto EGL; escribe el resultado en result_path"""
+    start = time.perf_counter()
+    pygame.init()
+    session = Headless_Session(width, height, frames=frames, output="", report="")
+    context_time = time.perf_counter() - start
+    profiler.enabled = True
+    scene = Bench_Scene(name, width, height, frames)
+    report = session.run(scene)
+    gpu = (report["profile"] or {}).get("display", {}).get("gpu")
+    result = {"startup_s": context_time + report["startup_s"],
+              "mesh_load_s": scene.mesh_load,
+              "objects": len(scene.objects),
+              "frames": report["frames"],
+              "fps": report["fps"],
+              "cpu_ms": report["cpu_ms"],
+              "frame_ms": report["frame_ms"],
+              "gpu_ms": gpu,
+              # ru_maxrss está en KiB en Linux
+              "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+              "renderer": report["renderer"]}
+    with open(result_path, "w") as file:
+        json.dump(result, file)
+
+
+def run_suite(names, width, height, frames):
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for name in names:
+            result_path = os.path.join(folder, name + ".json")
+            command = [sys.executable, "-m", "benchmarks.bench", "--run-scene", name, "--frames", str(frames),
+                       "--size", f"{width}x{height}", "--result", result_path]
+            process = subprocess.run(command, capture_output=True, text=True)
+            if process.returncode != 0:
+                # Se guarda el error para que la escena quede registrada; compare() lo cuenta como regresión
+                error = (process.stderr.strip().splitlines() or ["sin salida"])[-1]
+                results[name] = {"error": error}
+                print(f"  {name:<24}❌ {error}")
+                continue
+            with open(result_path) as file:
+                results[name] = json.load(file)
+            print_result(name, results[name])
+    return results
+
+
+def print_result(name, result):
+    gpu = result["gpu_ms"]["p50"] if result["gpu_ms"] else float("nan")
+    print(f"  {name:<24}{result['startup_s']:9.2f}{result['mesh_load_s']:9.3f}{result['cpu_ms']['p50']:9.2f}"
+          f"{result['frame_ms']['p50']:10.2f}{result['frame_ms']['p95']:9.2f}{gpu:9.3f}{result['peak_rss_mb']:9.1f}")
+
+
+def metric(result, keys):
+    value = result
+    for key in keys:
+        if not isinstance(value, dict) or value.get(key) is None:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(results, baseline, threshold, name_filter=""):
+    """(escena, métrica, base, actual) de lo que empeora más de threshold y más que el ruido mínimo.
+
+    Una escena que en la base funcionaba y ahora falla, o que ya no se ejecuta (de las que contienen
+    name_filter), también es una regresión: métrica "error" o "ausente", con el error como valor actual.
+    """
+    regressions = []
+    for name, old_result in baseline["scenes"].items():
+        if name_filter not in name or "error" in old_result:
+            continue
+        result = results.get(name)
+        if result is None:
+            regressions.append((name, "ausente", None, None))
+            continue
+        if "error" in result:
+            regressions.append((name, "error", None, result["error"]))
+            continue
+        for label, (keys, floor) in METRICS.items():
+            old, new = metric(old_result, keys), metric(result, keys)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append((name, label, old, new))
+    return regressions
+
+
+def print_regression(name, label, old, new):
+    if old is None:
+        print(f"  {name:<24}{label:<14}{new or 'no se ejecutó'}")
+        return
+    # Con una base de 0 el cambio relativo no existe
+    change = f"({new / old - 1:+.0%})" if old else "(base 0)"
+    print(f"  {name:<24}{label:<14}{old:10.3f} -> {new:10.3f}  {change}")
+
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de render sin ventana")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--size", default="1000x800")
+    parser.add_argument("--filter", default="", help="solo escenas cuyo nombre contiene este texto")
+    parser.add_argument("--output", help="JSON donde guardar los resultados (sirve luego como base)")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior con la que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10, help="empeoramiento relativo tolerado")
+    parser.add_argument("--list", action="store_true", help="solo listar las escenas")
+    parser.add_argument("--run-scene", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    width, height = map(int, args.size.split("x"))
+
+    if args.run_scene:
+        run_scene(args.run_scene, width, height, args.frames, args.result)
+        return 0
+    names = [name for name in scene_names() if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    print(f"{len(names)} escenas, {args.frames} frames a {width}x{height} (tiempos en s y ms)")
+    print(f"  {'escena':<24}{'arranque':>9}{'mallas':>9}{'CPU p50':>9}{'frame p50':>10}{'p95':>9}{'GPU p50':>9}"
+          f"{'RSS MB':>9}")
+    results = run_suite(names, width, height, args.frames)
+    document = {"meta": {"frames": args.frames, "size": [width, height], "python": sys.version.split()[0],
+                         "machine": os.uname().machine,
+                         "renderer": next((result["renderer"] for result in results.values() if "renderer" in result),
+                                          None)},
+                "scenes": results}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(document, file, indent=2)
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold, args.filter)
+    if not regressions:
+        print(f"✅ Sin regresiones respecto a {args.compare} (umbral {args.threshold:.0%})")
+        return 0
+    print(f"⚠️ {len(regressions)} regresiones respecto a {args.compare} (umbral {args.threshold:.0%}):")
+    for regression in regressions:
+        print_regression(*regression)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
@@ -0,0 +1,101 @@
+"""Construcción y consultas del BVH frente a fuerza bruta.
+
+- Triangle_BVH sobre teapot.obj: tiempo de construcción y rayos por segundo (picking)
+- Object_BVH sobre N objetos: construcción, refit y consultas de frustum por segundo
+
+Uso: python -m benchmarks.bvh [objetos]
+"""
+import sys
+import time
+
+import numpy as np
+
+from glApp.BVH import Triangle_BVH, Object_BVH
+from glApp.Culling import Bounds, Bounds_Array, frustum_planes, visible_mask
+from glApp.Matrices import identity, translate, rotate, rotation_matrix
+from glApp.ObjParser import parse_obj
+from glApp.Utils import format_vertices
+from benchmarks.frustum_culling import scatter
+
+
+def timed(function, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def brute_ray(triangles, origin, direction):
+    corners = triangles.astype(np.float64)
+    edge1 = corners[:, 1] - corners[:, 0]
+    edge2 = corners[:, 2] - corners[:, 0]
+    p = np.cross(direction, edge2)
+    determinant = (edge1 * p).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        offset = origin - corners[:, 0]
+        u = (offset * p).sum(axis=1) / determinant
+        q = np.cross(offset, edge1)
+        v = (q @ direction) / determinant
+        distance = (edge2 * q).sum(axis=1) / determinant
+    hit = (np.abs(determinant) > 1e-12) & (u >= 0) & (v >= 0) & (u + v <= 1) & (distance >= 0)
+    return float(distance[hit].min()) if hit.any() else None
+
+
+def perspective(angle, aspect, near, far):
+    d = 1.0 / np.tan(np.radians(angle) / 2)
+    return np.array([[d / aspect, 0, 0, 0], [0, d, 0, 0],
+                     [0, 0, (far + near) / (near - far), far * near / (near - far)], [0, 0, -1, 0]], np.float32)
+
+
+def triangles_benchmark(rays=500):
+    vertices, triangles, *_ = parse_obj("models/teapot.obj")
+    positions = format_vertices(vertices, triangles)
+    build, bvh = timed(lambda: Triangle_BVH(positions))
+    print(f"teapot.obj: {len(bvh)} triángulos, {len(bvh.node_start)} nodos, construcción {build * 1e3:.1f} ms")
+
+    rng = np.random.default_rng(5)
+    center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    origins = rng.uniform(-5, 5, (rays, 3)) + center + (0, 0, 20)
+    directions = center + rng.uniform(-2, 2, (rays, 3)) - origins
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    bvh_time, bvh_hits = timed(lambda: [bvh.ray_cast(o, d) for o, d in zip(origins, directions)])
+    batch_time, (batch_distances, _) = timed(lambda: bvh.ray_cast_many(origins, directions))
+    brute_time, brute_hits = timed(lambda: [brute_ray(bvh.triangles, o, d) for o, d in zip(origins, directions)])
+    same = all((a is None and b is None) or (a is not None and b is not None and abs(a[0] - b) < 1e-6)
+               for a, b in zip(bvh_hits, brute_hits))
+    same = same and np.array_equal(np.isfinite(batch_distances), [hit is not None for hit in bvh_hits])
+    print(f"  rayos/s: BVH {rays / bvh_time:9.0f}   BVH por lotes {rays / batch_time:9.0f}"
+          f"   fuerza bruta {rays / brute_time:9.0f}"
+          f"   ({sum(hit is not None for hit in bvh_hits)} impactos, iguales: {same})")
+
+
+def objects_benchmark(count, queries=50):
+    rng = np.random.default_rng(12)
+    positions = scatter(count, rng) * 10
+    model_mats = np.stack([translate(identity(), *position) for position in positions])
+    bounds = Bounds_Array([Bounds.from_sphere(float(radius)) for radius in rng.uniform(0.5, 2, count)])
+    build, bvh = timed(lambda: Object_BVH(model_mats, bounds))
+    moved = model_mats.copy()
+    moved[:, :3, 3] += rng.normal(0, 1, (count, 3))
+    refit, _ = timed(lambda: bvh.refit_objects(moved), 5)
+    print(f"{count} objetos: construcción {build * 1e3:.1f} ms, refit {refit * 1e3:.2f} ms")
+
+    projection = perspective(60, 1.25, 0.1, 1000)
+    views = [rotation_matrix(angle, "y") for angle in np.linspace(0, 360, queries)]
+    frustums = [frustum_planes(projection, view) for view in views]
+    bvh_time, bvh_visible = timed(lambda: [bvh.query_frustum(planes) for planes in frustums])
+    brute_time, brute_visible = timed(lambda: [visible_mask(planes, moved, bounds) for planes in frustums])
+    visible = np.mean([len(items) for items in bvh_visible])
+    print(f"  frustums/s: BVH {queries / bvh_time:8.0f}   visible_mask {queries / brute_time:8.0f}"
+          f"   ({visible:.0f} visibles de media)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    triangles_benchmark()
+    for objects in (1000, count):
+        objects_benchmark(objects)
+
+
+if __name__ == "__main__":
+    main()
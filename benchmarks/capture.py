@@ -0,0 +1,72 @@
+"""Frames capturados por segundo a 1000x800 con la escena de main.py: glReadPixels síncrono vs Frame_Capture.
+
+Síncrono: leer y escribir en el hilo de render antes del siguiente frame. Frame_Capture: anillo de PBOs
+con un frame de retraso y la codificación (PNG, RAW o vídeo mapeado) en un ThreadPoolExecutor.
+
+Uso: python -m benchmarks.capture [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+from benchmarks.gl_calls import make_app
+from glApp.Capture import Frame_Capture, Png_Writer, Raw_Writer, Video_File
+
+WIDTH, HEIGHT = 1000, 800
+
+
+def run(app, frames, capture=None):
+    start = time.perf_counter()
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        app.display()
+        if capture is not None:
+            capture()
+    glFinish()
+    return time.perf_counter() - start
+
+
+def main(frames=60):
+    create_context(WIDTH, HEIGHT)
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    pygame.mouse.set_visible(False)
+    app = make_app("main", "ShaderObjects")
+    glViewport(0, 0, WIDTH, HEIGHT)
+    run(app, 5)
+
+    print(f"{frames} frames a {WIDTH}x{HEIGHT} (escena de main.py)")
+    elapsed = run(app, frames)
+    print(f"  {'sin captura':<28}{frames / elapsed:8.1f} frames/s")
+    with tempfile.TemporaryDirectory() as folder:
+        writers = [("png", lambda: Png_Writer(os.path.join(folder, "png"))),
+                   ("raw", lambda: Raw_Writer(os.path.join(folder, "raw"))),
+                   ("vídeo mapeado", lambda: Video_File(os.path.join(folder, "video.rgba"), WIDTH, HEIGHT, frames))]
+        for name, make_writer in writers:
+            writer = make_writer()
+            counter = iter(range(frames))
+
+            def capture_sync():
+                pixels = glReadPixels(0, 0, WIDTH, HEIGHT, GL_RGBA, GL_UNSIGNED_BYTE)
+                writer.write(next(counter), np.frombuffer(pixels, np.uint8).reshape(HEIGHT, WIDTH, 4))
+            elapsed = run(app, frames, capture_sync)
+            writer.close()
+            print(f"  {'síncrono ' + name:<28}{frames / elapsed:8.1f} frames/s")
+
+            capture = Frame_Capture(WIDTH, HEIGHT, make_writer())
+            start = time.perf_counter()
+            run(app, frames, capture.capture)
+            captured = capture.finish()
+            elapsed = time.perf_counter() - start
+            print(f"  {'Frame_Capture ' + name:<28}{captured / elapsed:8.1f} frames/s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
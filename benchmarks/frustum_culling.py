@@ -0,0 +1,76 @@
+"""Escena con la mayoría de los objetos fuera de pantalla: draw() de todos frente a Frustum_Culler.
+
+Esferas y cubos (LoadMesh) repartidos alrededor de la cámara; solo los que caen en el
+campo de visión de 60 grados se envían a GL cuando se usa el culling.
+
+Uso: python -m benchmarks.frustum_culling [objetos] [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import sys
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+import main
+from benchmarks.instancing import time_frames
+from glApp.Camera import Camera
+from glApp.Culling import Frustum_Culler
+from glApp.LoadMesh import LoadMesh
+from glApp.RenderQueue import render_state
+from glApp.Sphere import Sphere
+
+WIDTH, HEIGHT = 320, 240
+
+
+def scatter(count, rng):
+    # Direcciones uniformes en la esfera y distancias entre 5 y 60 unidades
+    directions = rng.standard_normal((count, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    return directions * rng.uniform(5, 60, (count, 1))
+
+
+def build_scene(program_id, count):
+    rng = np.random.default_rng(12)
+    objects = []
+    for index, (x, y, z) in enumerate(scatter(count, rng)):
+        if index % 2:
+            objects.append(Sphere(program_id, slices=32, stacks=16, location=pygame.Vector3(x, y, z)))
+        else:
+            objects.append(LoadMesh("models/cube.obj", program_id, location=pygame.Vector3(x, y, z)))
+    return objects
+
+
+def main_benchmark(count=2000, frames=10):
+    create_context(WIDTH, HEIGHT)
+    glViewport(0, 0, WIDTH, HEIGHT)
+    render_state.set_capability(GL_DEPTH_TEST, True)
+    program_id = main.create_program(main.vertex_shader, main.fragment_shader)
+    camera = Camera(program_id, WIDTH, HEIGHT)
+    camera.transformation = np.identity(4, dtype=np.float32)
+    camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+    camera.load()
+    render_state.use_program(program_id)
+    objects = build_scene(program_id, count)
+    culler = Frustum_Culler(camera)
+
+    def draw_all():
+        render_state.use_program(program_id)
+        for item in objects:
+            item.draw()
+
+    def draw_culled():
+        render_state.use_program(program_id)
+        culler.update()
+        culler.draw(objects)
+
+    print(f"{count} objetos, {WIDTH}x{HEIGHT}: ms/frame (envío CPU / total)")
+    for name, draw in [("draw() de todos", draw_all), ("Frustum_Culler", draw_culled)]:
+        submit, total = time_frames(draw, frames)
+        print(f"  {name:<20}{submit * 1000:9.2f} /{total * 1000:9.2f}")
+    print(f"  probados {culler.tested}, descartados {culler.culled}, dibujados {culler.drawn}")
+
+
+if __name__ == "__main__":
+    main_benchmark(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,84 @@
+"""Cuenta las llamadas Python -> OpenGL por frame en display() de main.py, main2.py y main3.py.
+
+También las que el caché de Render_State se salta por redundantes.
+
+Uso: python -m benchmarks.gl_calls [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import collections
+import importlib
+import sys
+
+import pygame
+
+from glApp.RenderQueue import render_state
+
+DEMOS = [("main", "ShaderObjects"), ("main2", "WaterSphereApp"), ("main3", "MatteSphereApp")]
+
+
+class CallCounter:
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.patched = []
+
+    def install(self):
+        # from OpenGL.GL import * copia los nombres en cada módulo: envolverlos ahí
+        for module in list(sys.modules.values()):
+            name = getattr(module, "__name__", "")
+            if not (name.startswith("glApp") or name.startswith("main")):
+                continue
+            for attribute, value in list(vars(module).items()):
+                if attribute.startswith("gl") and attribute[2:3].isupper() and callable(value):
+                    setattr(module, attribute, self._wrap(attribute, value))
+                    self.patched.append((module, attribute, value))
+
+    def uninstall(self):
+        for module, attribute, value in self.patched:
+            setattr(module, attribute, value)
+        self.patched = []
+
+    def _wrap(self, name, function):
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+        return counted
+
+
+def make_app(module_name, class_name):
+    module = importlib.import_module(module_name)
+    app_class = getattr(module, class_name)
+    # Saltar PyOGApp.__init__ (abre una ventana) y llamar solo a la inicialización de la escena
+    app = app_class.__new__(app_class)
+    app.screen_width, app.screen_height = 1000, 800
+    app.camera = None
+    app.program_id = None
+    app.start_time = 0
+    app.initialise()
+    return app
+
+
+def main(frames=100):
+    create_context()
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    pygame.mouse.set_visible(False)
+    for module_name, class_name in DEMOS:
+        app = make_app(module_name, class_name)
+        counter = CallCounter()
+        counter.install()
+        render_state.reset_counters()
+        for _ in range(frames):
+            app.display()
+        counter.uninstall()
+        total = sum(counter.counts.values())
+        avoided = sum(render_state.skipped.values())
+        print(f"{module_name}: {total / frames:.1f} llamadas GL por frame, {avoided / frames:.1f} evitadas por el caché")
+        for name, count in counter.counts.most_common():
+            print(f"    {name:<28}{count / frames:>6.1f}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,5 @@
+"""Contexto OpenGL 3.3 core sin ventana (EGL surfaceless + Mesa llvmpipe) para los benchmarks.
+
+Debe importarse antes que OpenGL.GL para que PyOpenGL use la plataforma EGL.
+"""
+from glApp.Headless import create_context
@@ -0,0 +1,34 @@
+"""Vértices y bytes de VBO/EBO de cada modelo con y sin soldado de vértices (modo indexado).
+
+Uso: python -m benchmarks.indexed_meshes [carpeta]
+"""
+import os
+import sys
+
+from glApp.MeshCache import build_mesh
+from glApp.Utils import weld_vertices
+
+# Mesh sube posición, color y normal: 3 VBOs vec3 float32
+BYTES_PER_VERTEX = 3 * 3 * 4
+
+
+def main(folder="models"):
+    print(f"{'modelo':<24}{'vértices':>10}{'únicos':>10}{'bytes antes':>14}{'bytes después':>16}{'ahorro':>9}")
+    for entry in sorted(os.listdir(folder)):
+        if not entry.endswith(".obj"):
+            continue
+        filename = os.path.join(folder, entry)
+        try:
+            vertices, normals, uvs = build_mesh(filename)
+        except (ValueError, IndexError) as error:
+            print(f"{filename:<24}omitido ({error})")
+            continue
+        welded, _, _, indices = weld_vertices(vertices, normals, uvs)
+        before = len(vertices) * BYTES_PER_VERTEX
+        after = len(welded) * BYTES_PER_VERTEX + indices.nbytes
+        print(f"{filename:<24}{len(vertices):>10}{len(welded):>10}{before:>14}{after:>16}"
+              f"{100.0 * (1 - after / before):>8.1f}%")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,125 @@
+"""Campo de esferas: una llamada Sphere.draw() por objeto vs un solo InstancedMesh.draw().
+
+Uso: python -m benchmarks.instancing [instancias] [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import sys
+import time
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+import main
+from glApp.Camera import Camera
+from glApp.InstancedMesh import InstancedMesh
+from glApp.RenderQueue import render_state
+from glApp.Sphere import Sphere
+from glApp.Utils import create_program
+
+WIDTH, HEIGHT = 320, 240
+
+instanced_vertex_shader = r'''
+#version 330 core
+layout (location = 0) in vec3 position;
+layout (location = 1) in vec3 vertex_normal;
+layout (location = 3) in mat4 instance_model_mat;
+layout (location = 7) in vec4 instance_color;
+
+layout (std140, row_major) uniform Camera
+{
+    mat4 projection_mat;
+    mat4 view_mat;
+    vec3 view_pos;
+    vec3 light_pos;
+};
+
+out vec3 frag_normal;
+out vec3 color;
+
+void main()
+{
+    gl_Position = projection_mat * view_mat * instance_model_mat * vec4(position, 1.0);
+    frag_normal = mat3(instance_model_mat) * vertex_normal;
+    color = instance_color.rgb;
+}
+'''
+
+instanced_fragment_shader = r'''
+#version 330 core
+in vec3 frag_normal;
+in vec3 color;
+out vec4 final_color;
+
+void main()
+{
+    final_color = vec4(color * max(normalize(frag_normal).y, 0.2), 1.0);
+}
+'''
+
+
+def grid_positions(count):
+    side = int(np.ceil(np.sqrt(count)))
+    index = np.arange(count)
+    return np.stack([index % side - side / 2, index // side - side / 2, np.full(count, -side * 1.2)], axis=1) * 2.5
+
+
+def time_frames(draw, frames):
+    """(tiempo de CPU enviando comandos, tiempo total con glFinish) por frame"""
+    draw()
+    glFinish()
+    submit = total = 0.0
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        start = time.perf_counter()
+        draw()
+        submitted = time.perf_counter()
+        glFinish()
+        submit += submitted - start
+        total += time.perf_counter() - start
+    return submit / frames, total / frames
+
+
+def main_benchmark(count=10000, frames=5):
+    create_context(WIDTH, HEIGHT)
+    glViewport(0, 0, WIDTH, HEIGHT)
+    render_state.set_capability(GL_DEPTH_TEST, True)
+    positions = grid_positions(count)
+
+    program_id = main.create_program(main.vertex_shader, main.fragment_shader)
+    camera = Camera(program_id, WIDTH, HEIGHT)
+    camera.transformation = np.identity(4, dtype=np.float32)
+    camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+    camera.load()
+    sphere = Sphere(program_id, slices=8, stacks=4)
+
+    def draw_each():
+        for x, y, z in positions:
+            sphere.location = pygame.Vector3(x, y, z)
+            sphere.draw()
+
+    instanced_program = create_program(instanced_vertex_shader, instanced_fragment_shader)
+    camera.attach(instanced_program)
+    instanced = InstancedMesh(Sphere(instanced_program, slices=8, stacks=4), instanced_program, count)
+    instanced.set_positions(positions)
+    instanced.set_colors(np.random.default_rng(3).uniform(0.3, 1.0, (count, 3)))
+
+    def draw_instanced():
+        render_state.use_program(instanced_program)
+        instanced.draw()
+
+    def move_and_draw_instanced():
+        # Actualización masiva: todas las instancias se mueven y se vuelve a subir el rango completo
+        instanced.translate((0.0, 0.001, 0.0))
+        draw_instanced()
+
+    print(f"{count} esferas, {WIDTH}x{HEIGHT}: ms/frame (envío CPU / total)")
+    for name, draw in [("draw() por objeto", draw_each),
+                       ("InstancedMesh estático", draw_instanced),
+                       ("InstancedMesh + translate()", move_and_draw_instanced)]:
+        submit, total = time_frames(draw, frames)
+        print(f"  {name:<30}{submit * 1000:9.2f} /{total * 1000:9.2f}")
+
+if __name__ == "__main__":
+    main_benchmark(*[int(arg) for arg in sys.argv[1:]])
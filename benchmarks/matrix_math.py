@@ -0,0 +1,103 @@
+"""Micro-benchmarks de Matrices.py frente a las funciones de Transformations.py/Camera.py originales.
+
+Uso: python -m benchmarks.matrix_math
+"""
+import timeit
+from math import cos, sin, radians
+
+import numpy as np
+import pygame
+
+from glApp import Matrices
+
+
+# --- Copias de las implementaciones originales (Transformations.py y Camera.py) ---
+
+def legacy_translate_mat(x, y, z):
+    return np.array([[1, 0, 0, x],
+                     [0, 1, 0, y],
+                     [0, 0, 1, z],
+                     [0, 0, 0, 1]], np.float32)
+
+
+def legacy_scale_mat3(sx, sy, sz):
+    return np.array([[sx, 0, 0, 0],
+                     [0, sy, 0, 0],
+                     [0, 0, sz, 0],
+                     [0, 0, 0, 1]], np.float32)
+
+
+def legacy_rotate_axis(angle, axis):
+    c = cos(radians(angle))
+    s = sin(radians(angle))
+    axis = axis.normalize()
+    ux2 = axis.x*axis.x
+    uy2 = axis.y*axis.y
+    uz2 = axis.z*axis.z
+    return np.array([[c + (1-c)*ux2, (1-c)*axis.y*axis.x - s*axis.z, (1-c)*axis.z*axis.x + s*axis.y, 0],
+                     [(1-c)*axis.y*axis.x + s*axis.z, c+(1-c)*uy2, (1-c)*axis.z*axis.y - s*axis.x, 0],
+                     [(1-c)*axis.x*axis.z - s*axis.y, (1-c)*axis.y*axis.z + s*axis.x, c+(1-c)*uz2, 0],
+                     [0, 0, 0, 1]], np.float32)
+
+
+def legacy_translate(matrix, x, y, z):
+    return matrix @ legacy_translate_mat(x, y, z)
+
+
+def legacy_scale3(matrix, x, y, z):
+    return matrix @ legacy_scale_mat3(x, y, z)
+
+
+def legacy_rotateA(matrix, angle, axis):
+    return matrix @ legacy_rotate_axis(angle, axis)
+
+
+def legacy_camera_translate(matrix, x, y, z):
+    translation = np.identity(4, dtype=np.float32)
+    translation[0, 3] = x
+    translation[1, 3] = y
+    translation[2, 3] = z
+    return np.dot(matrix, translation)
+
+
+def best(statement, number):
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number
+
+
+def main():
+    matrix = np.identity(4, dtype=np.float32)
+    out = np.empty_like(matrix)
+    axis = pygame.Vector3(0, 1, 0)
+    count = 10000
+    stack = Matrices.identity(count)
+    stack_out = np.empty_like(stack)
+    offsets = np.random.default_rng(1).standard_normal((count, 3)).astype(np.float32)
+    angles = np.linspace(0, 360, count, dtype=np.float32)
+
+    cases = [
+        ("translate", lambda: legacy_translate(matrix, 1, 2, 3),
+         lambda: Matrices.translate(matrix, 1, 2, 3, out=out), 20000),
+        ("Camera.translate", lambda: legacy_camera_translate(matrix, 1, 2, 3),
+         lambda: Matrices.translate(matrix, 1, 2, 3, out=out), 20000),
+        ("scale3", lambda: legacy_scale3(matrix, 1, 2, 3),
+         lambda: Matrices.scale(matrix, 1, 2, 3, out=out), 20000),
+        ("rotateA", lambda: legacy_rotateA(matrix, 30, axis),
+         lambda: Matrices.rotate(matrix, 30, axis, out=out), 20000),
+        ("Mesh.draw (rot+trans+scale)",
+         lambda: legacy_scale3(legacy_translate(legacy_rotateA(matrix, 1, axis), 0, 0, 0), 1, 1, 1),
+         lambda: Matrices.scale(Matrices.translate(Matrices.rotate(matrix, 1, axis, out=out), 0, 0, 0, out=out),
+                                1, 1, 1, out=out), 10000),
+        (f"translate x{count}", lambda: [legacy_translate(m, *t) for m, t in zip(stack, offsets)],
+         lambda: Matrices.translate(stack, offsets, out=stack_out), 3),
+        (f"rotateA x{count}", lambda: [legacy_rotateA(m, a, axis) for m, a in zip(stack, angles)],
+         lambda: Matrices.rotate(stack, angles, (0, 1, 0), out=stack_out), 3),
+    ]
+    print(f"{'operación':<30}{'original':>12}{'Matrices':>12}{'speedup':>10}")
+    for name, legacy, new, number in cases:
+        legacy_time = best(legacy, number)
+        new_time = best(new, number)
+        print(f"{name:<30}{legacy_time * 1e6:>10.1f}us{new_time * 1e6:>10.1f}us{legacy_time / new_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
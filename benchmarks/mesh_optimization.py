@@ -0,0 +1,147 @@
+"""ACMR de cada modelo de models/ con el orden del archivo, tras tipsify y tras ordenar clusters para el
+overdraw, y overdraw medido en la GPU desde varias direcciones.
+
+- ACMR: fallos de una caché FIFO de CACHE_SIZE vértices por triángulo; "mín" es vértices / triángulos,
+  el mejor valor posible (cada vértice se transforma una vez)
+- layout: atributos que se sueldan (p posición, n normal, t uv); pnt es lo que hacía LoadMesh antes, p y pn
+  lo que sueldan los programas que no leen uvs
+- overdraw: fragmentos que pasan el test de profundidad (GL_SAMPLES_PASSED) / píxeles cubiertos, media de
+  VIEWS direcciones con GL_CULL_FACE (1.0 = cada píxel se sombrea una vez); solo depende del orden
+
+Uso: python -m benchmarks.mesh_optimization [carpeta]
+"""
+from benchmarks.gl_context import create_context
+
+import ctypes
+import os
+import sys
+import time
+
+import numpy as np
+from OpenGL.GL import *
+
+from glApp.Matrices import identity, rotate, scale, translate
+from glApp.MeshCache import load_indexed_mesh
+from glApp.MeshOptimizer import acmr
+from glApp.RenderQueue import render_state
+from glApp.Utils import create_program, uniform_location
+
+CACHE_SIZE = 32
+LAYOUTS = ["pnt", "pn", "p"]
+SIZE = 256
+VIEWS = [(yaw, pitch) for yaw in range(0, 360, 45) for pitch in (-30, 30)]
+
+VERTEX_SHADER = r'''
+#version 330 core
+layout (location = 0) in vec3 position;
+uniform mat4 mvp;
+void main()
+{
+    gl_Position = mvp * vec4(position, 1.0);
+}
+'''
+
+FRAGMENT_SHADER = r'''
+#version 330 core
+out vec4 frag_color;
+void main()
+{
+    frag_color = vec4(1.0);
+}
+'''
+
+
+def perspective(angle, near, far):
+    """Proyección cuadrada como la de Camera.perspective_mat"""
+    d = 1.0 / np.tan(np.radians(angle) / 2.0)
+    return np.array([[d, 0, 0, 0],
+                     [0, d, 0, 0],
+                     [0, 0, (far + near) / (near - far), far * near / (near - far)],
+                     [0, 0, -1, 0]], np.float32)
+
+
+def load(filename, layout, optimize, overdraw=False):
+    start = time.perf_counter()
+    mesh = load_indexed_mesh(filename, layout, use_cache=False, optimize=optimize, overdraw=overdraw)
+    return mesh, time.perf_counter() - start
+
+
+class Overdraw_Meter():
+    def __init__(self):
+        self.program_id = create_program(VERTEX_SHADER, FRAGMENT_SHADER)
+        self.mvp = uniform_location(self.program_id, "mvp")
+        self.projection = perspective(40.0, 0.1, 100.0)
+        self.query = glGenQueries(1)[0]
+        self.vao = glGenVertexArrays(1)
+        self.buffers = glGenBuffers(2)
+
+    def measure(self, positions, indices):
+        positions = np.ascontiguousarray(positions, np.float32)
+        indices = np.ascontiguousarray(indices, np.uint32)
+        render_state.bind_vertex_array(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffers[0])
+        glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 12, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.buffers[1])
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        render_state.use_program(self.program_id)
+        # Modelo centrado y escalado a la esfera unidad, a 3 unidades de la cámara
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        radius = float(np.linalg.norm(high - low)) / 2 or 1.0
+        ratios = []
+        for yaw, pitch in VIEWS:
+            model = translate(identity(), 0.0, 0.0, -3.0)
+            model = rotate(model, pitch, "x")
+            model = rotate(model, yaw, "y")
+            model = scale(model, 1.0 / radius)
+            model = translate(model, *(-(low + high) / 2).tolist())
+            glUniformMatrix4fv(self.mvp, 1, GL_TRUE, self.projection @ model)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            glBeginQuery(GL_SAMPLES_PASSED, self.query)
+            glDrawElements(GL_TRIANGLES, len(indices), GL_UNSIGNED_INT, None)
+            glEndQuery(GL_SAMPLES_PASSED)
+            samples = glGetQueryObjectuiv(self.query, GL_QUERY_RESULT)
+            depth = np.frombuffer(glReadPixels(0, 0, SIZE, SIZE, GL_DEPTH_COMPONENT, GL_FLOAT), np.float32)
+            covered = int((depth < 1.0).sum())
+            if covered:
+                ratios.append(samples / covered)
+        return sum(ratios) / len(ratios)
+
+
+def main(folder="models"):
+    create_context(SIZE, SIZE)
+    glViewport(0, 0, SIZE, SIZE)
+    render_state.set_capability(GL_DEPTH_TEST, True)
+    render_state.set_capability(GL_CULL_FACE, True)
+    meter = Overdraw_Meter()
+    print(f"ACMR con caché FIFO de {CACHE_SIZE} vértices; overdraw medio en {len(VIEWS)} vistas (layout p)")
+    print(f"{'modelo':<22}{'layout':<8}{'triáng.':>8}{'vért.':>8}{'mín':>7}{'archivo':>9}{'tipsify':>9}"
+          f"{'+overdraw':>11}{'ms':>8}   overdraw archivo / tipsify / clusters")
+    for entry in sorted(os.listdir(folder)):
+        if not entry.endswith(".obj"):
+            continue
+        filename = os.path.join(folder, entry)
+        for layout in LAYOUTS:
+            try:
+                original, _ = load(filename, layout, False)
+            except (ValueError, IndexError) as error:
+                print(f"{filename:<22}omitido ({error})")
+                break
+            optimized, elapsed = load(filename, layout, True)
+            clustered, _ = load(filename, layout, True, True)
+            indices = original[-1]
+            triangles = len(indices) // 3
+            print(f"{filename:<22}{layout:<8}{triangles:>8}{len(original[0]):>8}"
+                  f"{len(original[0]) / triangles:>7.3f}{acmr(indices, CACHE_SIZE):>9.3f}"
+                  f"{acmr(optimized[-1], CACHE_SIZE):>9.3f}{acmr(clustered[-1], CACHE_SIZE):>11.3f}"
+                  f"{elapsed * 1000:>8.1f}", end="")
+            if layout == "p":
+                print("   " + " / ".join(f"{meter.measure(mesh[0], mesh[-1]):.3f}"
+                                         for mesh in (original, optimized, clustered)))
+            else:
+                print()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
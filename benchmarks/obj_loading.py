@@ -0,0 +1,75 @@
+"""Compara el parser OBJ vectorizado con el parser original línea por línea.
+
+Uso: python -m benchmarks.obj_loading [archivos...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from glApp.ObjParser import parse_obj
+
+
+def legacy_load_drawing(filename):
+    # Copia del LoadMesh.load_drawing original, usada como referencia
+    vertices = []
+    triangles = []
+    normals = []
+    normal_ind = []
+    uvs = []
+    uvs_ind = []
+    with open(filename) as fp:
+        line = fp.readline()
+        while line:
+            if line[:2] == "v ":
+                vx, vy, vz = [float(value) for value in line[2:].split()]
+                vertices.append((vx, vy, vz))
+            if line[:2] == "vn":
+                vx, vy, vz = [float(value) for value in line[3:].split()]
+                normals.append((vx, vy, vz))
+            if line[:2] == "vt":
+                vx, vy = [float(value) for value in line[3:].split()]
+                uvs.append((vx, vy))
+            if line[:2] == "f ":
+                t1, t2, t3 = [value for value in line[2:].split()]
+                triangles.append([int(value) for value in t1.split('/')][0]-1)
+                triangles.append([int(value) for value in t2.split('/')][0]-1)
+                triangles.append([int(value) for value in t3.split('/')][0]-1)
+                uvs_ind.append([int(value) for value in t1.split('/')][1] - 1)
+                uvs_ind.append([int(value) for value in t2.split('/')][1] - 1)
+                uvs_ind.append([int(value) for value in t3.split('/')][1] - 1)
+                normal_ind.append([int(value) for value in t1.split('/')][2] - 1)
+                normal_ind.append([int(value) for value in t2.split('/')][2] - 1)
+                normal_ind.append([int(value) for value in t3.split('/')][2] - 1)
+            line = fp.readline()
+    return vertices, triangles, uvs, uvs_ind, normals, normal_ind
+
+
+def best_time(function, filename, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(filename)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def same_data(legacy, vectorized):
+    for old, new in zip(legacy, vectorized):
+        old = np.asarray(old, np.float32).reshape(new.shape)
+        if not np.array_equal(old, new.astype(np.float32)):
+            return False
+    return True
+
+
+def main(filenames, repeat=5):
+    print(f"{'modelo':<22}{'original':>12}{'vectorizado':>14}{'speedup':>10}  iguales")
+    for filename in filenames:
+        legacy_time, legacy = best_time(legacy_load_drawing, filename, repeat)
+        new_time, new = best_time(parse_obj, filename, repeat)
+        print(f"{filename:<22}{legacy_time * 1000:>10.2f}ms{new_time * 1000:>12.2f}ms"
+              f"{legacy_time / new_time:>9.1f}x  {same_data(legacy, new)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["models/teapot.obj", "models/donut.obj"])
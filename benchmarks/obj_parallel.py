@@ -0,0 +1,88 @@
+"""Parseo de un OBJ grande (tipo escaneo, millones de caras) en serie y repartido entre 1..N procesos.
+
+El archivo se genera como lo escribe un escáner que va por filas: los vértices de cada fila seguidos de las
+caras que la unen con la anterior, la mitad de ellas con índices negativos (relativos). Así los trozos
+paralelos cortan en medio del flujo y las caras apuntan a vértices de trozos anteriores, que es lo que
+tiene que rebasar la unión. Cada resultado se compara byte a byte con el parser en serie.
+
+- aceleración: tiempo en serie / tiempo con n procesos
+- eficiencia: aceleración / n (1.0 = escalado perfecto; no puede pasar de núcleos / n)
+
+Uso: python -m benchmarks.obj_parallel [caras] [procesos máximos]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from glApp.ObjParser import parse_obj, parse_obj_parallel
+
+
+def write_scan(filename, faces):
+    """Superficie ondulada de unas faces caras en filas, con v, vt y vn por vértice"""
+    columns = int(np.sqrt(faces / 2)) + 1
+    rows = max(2, faces // (2 * (columns - 1)) + 1)
+    u = np.linspace(0.0, 1.0, columns, dtype=np.float32)
+    with open(filename, "w") as fp:
+        for row in range(rows):
+            v = np.float32(row / (rows - 1))
+            height = 0.05 * np.sin(u * 40.0) * np.cos(v * 30.0)
+            fp.write("".join(f"v {x:.6f} {v:.6f} {z:.6f}\n" for x, z in zip(u, height)))
+            fp.write("".join(f"vt {x:.6f} {v:.6f}\n" for x in u))
+            fp.write("".join(f"vn {-z:.6f} 0.0 1.0\n" for z in height))
+            if row == 0:
+                continue
+            count = (row + 1) * columns
+            top = np.arange(row * columns, (row + 1) * columns) + 1
+            bottom = top - columns
+            if row % 2:
+                # Relativos al último vértice escrito: -1 es el último de esta fila
+                top = top - count - 1
+                bottom = bottom - count - 1
+            corners = np.stack([bottom[:-1], top[:-1], top[1:], bottom[:-1], top[1:], bottom[1:]], axis=1)
+            fp.write("".join("f {0}/{0}/{0} {1}/{1}/{1} {2}/{2}/{2}\nf {3}/{3}/{3} {4}/{4}/{4} {5}/{5}/{5}\n"
+                             .format(*corner) for corner in corners.tolist()))
+    return (rows - 1) * (columns - 1) * 2
+
+
+def same_result(serial, parallel):
+    return all(a.dtype == b.dtype and a.shape == b.shape and a.tobytes() == b.tobytes()
+               for a, b in zip(serial, parallel))
+
+
+def best_time(function, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(faces=2_000_000, max_workers=None):
+    max_workers = max_workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "scan.obj")
+        start = time.perf_counter()
+        faces = write_scan(filename, faces)
+        size = os.path.getsize(filename) / 2 ** 20
+        print(f"{faces} caras, {size:.0f} MB (generado en {time.perf_counter() - start:.1f} s), "
+              f"{os.cpu_count()} núcleos")
+        serial_time, serial = best_time(lambda: parse_obj(filename))
+        print(f"  {'procesos':<10}{'tiempo':>10}{'aceleración':>13}{'eficiencia':>12}  idéntico")
+        print(f"  {'serie':<10}{serial_time * 1000:>8.0f}ms{1.0:>12.2f}x{'-':>12}  -")
+        for workers in range(1, max_workers + 1):
+            # Pool ya arrancado: se mide el parseo y la unión, no el arranque de los procesos
+            with ProcessPoolExecutor(workers) as pool:
+                list(pool.map(int, range(workers)))
+                elapsed, result = best_time(lambda: parse_obj_parallel(filename, workers, executor=pool))
+            speedup = serial_time / elapsed
+            print(f"  {workers:<10}{elapsed * 1000:>8.0f}ms{speedup:>12.2f}x{speedup / workers:>12.2f}  "
+                  f"{same_result(serial, result)}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
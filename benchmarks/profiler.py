@@ -0,0 +1,59 @@
+"""Coste del perfilador: un span vacío desactivado y activado, y un frame de main.py con y sin perfil.
+
+Uso: python -m benchmarks.profiler [spans] [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import sys
+import time
+
+import pygame
+from OpenGL.GL import *
+
+from benchmarks.gl_calls import make_app
+from glApp.Profiler import profiler
+
+
+def span_cost(count):
+    start = time.perf_counter()
+    for _ in range(count):
+        pass
+    empty = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(count):
+        with profiler.span("vacío"):
+            pass
+    return (time.perf_counter() - start - empty) / count
+
+
+def frame_time(app, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        with profiler.span("display", gpu=True):
+            app.display()
+        profiler.end_frame()
+    glFinish()
+    return (time.perf_counter() - start) / frames
+
+
+def main(spans=1000000, frames=200):
+    create_context(320, 240)
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    pygame.mouse.set_visible(False)
+    app = make_app("main", "ShaderObjects")
+    glViewport(0, 0, 320, 240)
+
+    profiler.enabled = False
+    disabled = span_cost(spans)
+    frame_disabled = frame_time(app, frames)
+    profiler.enabled = True
+    enabled = span_cost(spans)
+    frame_enabled = frame_time(app, frames)
+    profiler.enabled = False
+    print(f"span vacío: {disabled * 1e9:6.0f} ns desactivado, {enabled * 1e9:6.0f} ns activado")
+    print(f"frame de main.py: {frame_disabled * 1000:6.3f} ms desactivado, {frame_enabled * 1000:6.3f} ms activado")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,93 @@
+"""Escena mezclada (esferas metálicas, mate y de agua con tres programas): orden de envío vs Render_Queue.
+
+Sin caché cada objeto vuelve a fijar programa y VAO; con Render_Queue los objetos se agrupan por
+pasada, programa y VAO, y el caché de Render_State se salta los cambios de estado redundantes.
+
+Uso: python -m benchmarks.render_queue [objetos] [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import sys
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+import main
+import main2
+import main3
+from benchmarks.gl_calls import CallCounter
+from benchmarks.instancing import time_frames
+from glApp.Camera import Camera
+from glApp.MatteSphere import MatteSphere
+from glApp.RenderQueue import Render_Queue, render_state
+from glApp.Sphere import Sphere
+from glApp.WaterSphere import WaterSphere
+
+WIDTH, HEIGHT = 320, 240
+
+
+def build_scene(programs, count):
+    rng = np.random.default_rng(14)
+    kinds = [Sphere, MatteSphere, WaterSphere]
+    # Mallas compartidas por tipo como en una escena real; los objetos solo cambian de posición
+    objects = []
+    for index in range(count):
+        kind = index % len(kinds)
+        x, y = rng.uniform(-8, 8, 2)
+        z = rng.uniform(-40, -5)
+        objects.append(kinds[kind](programs[kind], radius=0.5, slices=16, stacks=8,
+                                   location=pygame.Vector3(x, y, z)))
+    return objects
+
+
+def main_benchmark(count=300, frames=20):
+    create_context(WIDTH, HEIGHT)
+    glViewport(0, 0, WIDTH, HEIGHT)
+    programs = [main.create_program(main.vertex_shader, main.fragment_shader),
+                main2.create_program(main2.vertex_shader_water, main2.fragment_shader_water),
+                main3.create_program(main3.vertex_shader_matte, main3.fragment_shader_matte)]
+    camera = Camera(programs[0], WIDTH, HEIGHT)
+    for program_id in programs[1:]:
+        camera.attach(program_id)
+    camera.transformation = np.identity(4, dtype=np.float32)
+    camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+    camera.load()
+    objects = build_scene(programs, count)
+    queue = Render_Queue(camera)
+
+    def draw_unsorted():
+        # Como antes del caché: cada objeto fija todo su estado aunque no haya cambiado
+        render_state.set_capability(GL_DEPTH_TEST, True)
+        render_state.set_capability(GL_BLEND, True)
+        render_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        for item in objects:
+            render_state.invalidate()
+            item.draw()
+
+    def draw_queue():
+        for item in objects:
+            queue.submit(item)
+        queue.flush()
+
+    print(f"{count} objetos, 3 programas, {WIDTH}x{HEIGHT}")
+    print(f"  {'':<22}{'ms/frame (CPU / total)':>26}{'llamadas GL':>14}{'evitadas':>10}")
+    for name, draw in [("orden de envío", draw_unsorted), ("Render_Queue", draw_queue)]:
+        submit, total = time_frames(draw, frames)
+        render_state.invalidate()
+        render_state.reset_counters()
+        counter = CallCounter()
+        counter.install()
+        for _ in range(frames):
+            draw()
+        counter.uninstall()
+        calls = sum(counter.counts.values()) / frames
+        avoided = sum(render_state.skipped.values()) / frames
+        print(f"  {name:<22}{submit * 1000:12.2f} /{total * 1000:9.2f}{calls:14.1f}{avoided:10.1f}")
+        for call in ["glUseProgram", "glBindVertexArray", "glEnable", "glDisable", "glBlendFunc", "glDepthMask"]:
+            if counter.counts[call]:
+                print(f"      {call:<24}{counter.counts[call] / frames:8.1f}")
+
+
+if __name__ == "__main__":
+    main_benchmark(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,71 @@
+"""Actualización por frame de una escena de ~10k nodos: objetos sueltos frente a Scene_Graph.
+
+La escena son mesas (tabletop + cuatro tableleg como hijos de un nodo mesa); solo se mide
+la parte de CPU, sin contexto GL.
+
+Uso: python -m benchmarks.scene_graph [mesas]
+"""
+import sys
+import time
+
+import pygame
+
+from glApp.Matrices import Rotation, identity, translate, scale, rotate
+from glApp.SceneGraph import Scene_Graph, Scene_Node
+
+LEG_OFFSETS = [(0.8, -0.5, 0.4), (-0.8, -0.5, 0.4), (0.8, -0.5, -0.4), (-0.8, -0.5, -0.4)]
+FRAMES = 60
+
+
+def build_scene(tables):
+    graph = Scene_Graph()
+    table_nodes = []
+    for index in range(tables):
+        table = graph.add(Scene_Node(name=f"table{index}"))
+        table.set_position(index % 100 * 3.0, 0, index // 100 * 3.0)
+        table.add(Scene_Node(name="tabletop"))
+        for offset in LEG_OFFSETS:
+            leg = table.add(Scene_Node(name="tableleg"))
+            leg.set_position(*offset)
+        table_nodes.append(table)
+    return graph, table_nodes
+
+
+def loose_objects(objects):
+    # Lo que hace cada PyOGApp hoy: cada objeto recalcula su matriz todos los frames
+    matrices = [identity() for _ in range(objects)]
+    axis = pygame.Vector3(0, 1, 0)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for index, matrix in enumerate(matrices):
+            matrices[index] = scale(translate(rotate(matrix, 0.0, axis), 0, 0, 0), 1, 1, 1)
+    return (time.perf_counter() - start) / FRAMES
+
+
+def graph_frames(graph, tables, moving_fraction):
+    for table in tables[:int(len(tables) * moving_fraction)]:
+        table.set_motion(angular_velocity=Rotation(90, pygame.Vector3(0, 1, 0)))
+    graph.update(0.0)
+    start = time.perf_counter()
+    updated = 0
+    for _ in range(FRAMES):
+        graph.update(1.0 / FRAMES)
+        updated += graph.matrices_updated
+    return (time.perf_counter() - start) / FRAMES, updated // FRAMES
+
+
+def main():
+    tables = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    graph, table_nodes = build_scene(tables)
+    nodes = len(graph.nodes) - 1
+    print(f"{tables} mesas, {nodes} nodos")
+    print(f"  objetos sueltos (todos cada frame)    {loose_objects(nodes) * 1e3:8.2f} ms/frame")
+    for fraction in (0.0, 0.01, 0.1, 1.0):
+        graph, table_nodes = build_scene(tables)
+        frame, updated = graph_frames(graph, table_nodes, fraction)
+        print(f"  Scene_Graph, {fraction:>4.0%} de mesas girando  {frame * 1e3:8.2f} ms/frame"
+              f"  ({updated} matrices de mundo)")
+
+
+if __name__ == "__main__":
+    main()
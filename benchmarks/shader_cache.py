@@ -0,0 +1,86 @@
+"""Arranque en frío y en caliente con la caché de programas (glApp/ShaderCache.py).
+
+Cada ejecución es un proceso nuevo que crea el contexto y los programas de las tres demos:
+- sin caché: GLAPP_SHADER_CACHE=0, siempre compila y enlaza
+- frío: carpeta vacía, compila y guarda los binarios
+- caliente: carpeta con los binarios de la ejecución anterior, glProgramBinary sin compilar
+- dañado: binarios corrompidos, el driver los rechaza y se recompila
+Cada proceso usa una caché de shaders de Mesa vacía para que no oculte el coste de compilar (desactivarla
+del todo con MESA_SHADER_CACHE_DISABLE también desactiva los binarios de programa en Mesa).
+
+Uso: python -m benchmarks.shader_cache [repeticiones]
+"""
+import time
+
+START = time.perf_counter()
+
+from benchmarks.gl_context import create_context
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+
+def child():
+    """Proceso hijo: imprime en JSON el arranque total, el tiempo de los programas y las estadísticas de la caché"""
+    create_context(64, 64)
+    import main
+    import main2
+    import main3
+    from glApp.ShaderCache import shader_cache
+    start = time.perf_counter()
+    programs = [main.create_program(main.vertex_shader, main.fragment_shader),
+                main2.create_program(main2.vertex_shader_water, main2.fragment_shader_water),
+                main3.create_program(main3.vertex_shader_matte, main3.fragment_shader_matte),
+                # Repetido: dentro del proceso se reutiliza el mismo programa
+                main.create_program(main.vertex_shader, main.fragment_shader)]
+    end = time.perf_counter()
+    assert programs[0] == programs[3]
+    print(json.dumps({"startup": end - START, "programs": end - start, **shader_cache.stats}))
+
+
+def run(folder):
+    with tempfile.TemporaryDirectory() as mesa_cache:
+        env = dict(os.environ, GLAPP_SHADER_CACHE=folder, MESA_SHADER_CACHE_DIR=mesa_cache)
+        process = subprocess.run([sys.executable, "-m", "benchmarks.shader_cache", "--child"], env=env,
+                                 capture_output=True, text=True, check=True)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def corrupt(folder):
+    for entry in os.listdir(folder):
+        path = os.path.join(folder, entry)
+        data = bytearray(open(path, "rb").read())
+        # Se respeta la cabecera y se estropea el binario del driver
+        data[64:] = bytes(len(data) - 64)
+        open(path, "wb").write(data)
+
+
+def main_benchmark(repeat=5):
+    modes = {"sin caché": [], "frío": [], "caliente": [], "dañado": []}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as folder:
+            modes["sin caché"].append(run("0"))
+            modes["frío"].append(run(folder))
+            modes["caliente"].append(run(folder))
+            corrupt(folder)
+            modes["dañado"].append(run(folder))
+    print(f"Mediana de {repeat} procesos (ms)")
+    print(f"{'modo':<12}{'arranque':>10}{'programas':>11}{'cargados':>10}{'compilados':>12}{'rechazados':>12}")
+    for mode, results in modes.items():
+        startup = np.median([result["startup"] for result in results]) * 1000
+        programs = np.median([result["programs"] for result in results]) * 1000
+        last = results[-1]
+        print(f"{mode:<12}{startup:>10.1f}{programs:>11.2f}{last['loaded']:>10}{last['compiled']:>12}"
+              f"{last['rejected']:>12}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--child"]:
+        child()
+    else:
+        main_benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,86 @@
+"""Variantes del shader de superficie: compilar todas las permutaciones vs solo las que usan las demos,
+y latencia de la recarga en caliente (editar un archivo hasta tener el programa reenlazado).
+
+La caché de programas en disco se desactiva y la de Mesa empieza vacía para medir compilaciones reales;
+las usadas se compilan primero, así que en la segunda pasada son las únicas que Mesa ya tiene.
+
+Uso: python -m benchmarks.shader_variants
+"""
+import os
+import tempfile
+
+MESA_CACHE = tempfile.TemporaryDirectory()
+os.environ["MESA_SHADER_CACHE_DIR"] = MESA_CACHE.name
+
+from benchmarks.gl_context import create_context
+
+import itertools
+import shutil
+import time
+
+from OpenGL.GL import *
+
+import main
+import main2
+import main3
+from glApp.ShaderCache import shader_cache
+from glApp.ShaderLibrary import SHADER_DIR, Shader_Library
+
+FEATURES = {"SPECULAR_MODEL": ["SPECULAR_NONE", "SPECULAR_PHONG", "SPECULAR_BLINN"],
+            "WAVES": [False, True], "FRESNEL": [False, True], "INSTANCED": [False, True]}
+
+
+def all_variants():
+    names = list(FEATURES)
+    return [dict(zip(names, values)) for values in itertools.product(*FEATURES.values())]
+
+
+def build(library, variants):
+    start = time.perf_counter()
+    for defines in variants:
+        library.program("surface", **defines)
+    return time.perf_counter() - start
+
+
+def reload_latency(library, folder, repeat=5):
+    """Segundos desde que se guarda surface.frag hasta que update() reenlazó el programa"""
+    program_id = library.program("surface", **main.METAL)
+    path = os.path.join(folder, "surface.frag")
+    library.watch(interval=0.05)
+    latencies = []
+    for index in range(repeat):
+        with open(path, "a") as file:
+            file.write(f"\n// edición {index}\n")
+        start = time.perf_counter()
+        while not library.update():
+            time.sleep(0.001)
+        latencies.append(time.perf_counter() - start)
+    library.stop()
+    assert library.program("surface", **main.METAL) == program_id
+    return latencies
+
+
+def main_benchmark():
+    create_context(64, 64)
+    shader_cache.folder = None
+    variants = all_variants()
+    used = [main.METAL, main2.WATER, main3.MATTE]
+
+    shader_cache.invalidate()
+    lazy = build(Shader_Library(), used)
+    shader_cache.invalidate()
+    eager = build(Shader_Library(), variants)
+    print(f"Todas las permutaciones ({len(variants)}): {eager * 1000:8.1f} ms")
+    print(f"Solo las usadas ({len(used)}):          {lazy * 1000:8.1f} ms  ({eager / lazy:.1f}x menos)")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for name in os.listdir(SHADER_DIR):
+            shutil.copy(os.path.join(SHADER_DIR, name), folder)
+        shader_cache.invalidate()
+        latencies = reload_latency(Shader_Library(folder), folder)
+    print(f"Recarga en caliente (sondeo cada 50 ms): media {sum(latencies) / len(latencies) * 1000:.1f} ms, "
+          f"máx {max(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main_benchmark()
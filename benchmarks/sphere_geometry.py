@@ -0,0 +1,67 @@
+"""Tiempo de generación de la esfera UV: bucles originales vs generador vectorizado.
+
+Uso: python -m benchmarks.sphere_geometry
+"""
+import time
+
+import numpy as np
+import pygame
+
+from glApp.Geometry import sphere_geometry
+
+RESOLUTIONS = [(128, 64), (256, 128), (1024, 512)]
+
+
+def legacy_sphere(radius, slices, stacks):
+    # Copia de WaterSphere.create_geometry original (posición + normal + uv)
+    vertices = []
+    normals = []
+    texcoords = []
+    indices = []
+    for i in range(stacks + 1):
+        v = i / stacks
+        phi = v * np.pi
+        for j in range(slices + 1):
+            u = j / slices
+            theta = u * 2 * np.pi
+            x = radius * np.sin(phi) * np.cos(theta)
+            y = radius * np.cos(phi)
+            z = radius * np.sin(phi) * np.sin(theta)
+            normal = pygame.Vector3(x, y, z).normalize()
+            vertices.extend([x, y, z])
+            normals.extend([normal.x, normal.y, normal.z])
+            texcoords.extend([u, 1.0 - v])
+    for i in range(stacks):
+        for j in range(slices):
+            first = i * (slices + 1) + j
+            second = first + slices + 1
+            indices.extend([first, second, first + 1])
+            indices.extend([second, second + 1, first + 1])
+    interleaved = []
+    for i in range(len(vertices) // 3):
+        interleaved.extend(vertices[i*3 : i*3+3])
+        interleaved.extend(normals[i*3 : i*3+3])
+        interleaved.extend(texcoords[i*2 : i*2+2])
+    return np.array(interleaved, dtype=np.float32), np.array(indices, dtype=np.uint32)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"{'resolución':<12}{'original':>12}{'vectorizado':>14}{'en caché':>12}{'speedup':>10}")
+    for slices, stacks in RESOLUTIONS:
+        legacy_time, (legacy_vertices, legacy_indices) = timed(legacy_sphere, 1.0, slices, stacks)
+        new_time, (vertices, indices) = timed(sphere_geometry, 1.0, slices, stacks, "pnt", False)
+        sphere_geometry(1.0, slices, stacks, "pnt")
+        cached_time, _ = timed(sphere_geometry, 1.0, slices, stacks, "pnt")
+        assert np.allclose(legacy_vertices, vertices, atol=1e-6) and np.array_equal(legacy_indices, indices)
+        print(f"{slices}x{stacks:<8}{legacy_time * 1000:>10.1f}ms{new_time * 1000:>12.2f}ms"
+              f"{cached_time * 1e6:>10.1f}us{legacy_time / new_time:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Escena con muchas esferas a distintas profundidades: triángulos enviados y tiempo de frame con y sin LOD.
+
+Uso: python -m benchmarks.sphere_lod [esferas] [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import collections
+import sys
+import time
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+import main
+from glApp.Camera import Camera
+from glApp.RenderQueue import render_state
+from glApp.Sphere import Sphere
+
+WIDTH, HEIGHT = 1000, 800
+
+
+def build_scene(program_id, count, lod, camera):
+    rng = np.random.default_rng(7)
+    spheres = []
+    for depth in np.geomspace(3.0, 300.0, count):
+        # Dentro del frustum: desplazamiento lateral proporcional a la profundidad
+        x, y = rng.uniform(-0.4, 0.4, 2) * depth
+        spheres.append(Sphere(program_id, location=pygame.Vector3(x, y, -depth), lod=lod, camera=camera))
+    return spheres
+
+
+def run(spheres, frames):
+    triangles = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        triangles = 0
+        for sphere in spheres:
+            sphere.draw()
+            triangles += sphere.triangles_drawn
+        glFinish()
+    return triangles, (time.perf_counter() - start) / frames
+
+
+def main_benchmark(count=200, frames=5):
+    create_context(WIDTH, HEIGHT)
+    glViewport(0, 0, WIDTH, HEIGHT)
+    render_state.set_capability(GL_DEPTH_TEST, True)
+    program_id = main.create_program(main.vertex_shader, main.fragment_shader)
+    camera = Camera(program_id, WIDTH, HEIGHT)
+    camera.transformation = np.identity(4, dtype=np.float32)
+    camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+    camera.load()
+
+    for lod in (False, True):
+        spheres = build_scene(program_id, count, lod, camera)
+        run(spheres, 1)
+        triangles, frame_time = run(spheres, frames)
+        print(f"LOD {'on ' if lod else 'off'}: {triangles:>10} triángulos/frame  {frame_time * 1000:8.1f} ms/frame")
+        if lod:
+            levels = collections.Counter(sphere.lod_selector.levels[sphere.lod_selector.current].slices
+                                         for sphere in spheres)
+            print("    esferas por nivel (slices):", dict(sorted(levels.items(), reverse=True)))
+
+
+if __name__ == "__main__":
+    main_benchmark(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,113 @@
+"""Esfera de agua deformada en la CPU cada frame: formas de subir los vértices a la GPU.
+
+- glBufferData: se calcula en un array aparte y se vuelve a crear el almacenamiento (como Graphics_Data.load)
+- glBufferSubData: se calcula en un array aparte y se copia sobre el mismo almacenamiento
+- mapeo por región: Stream_Buffer sin almacenamiento persistente (glMapBufferRange sin sincronizar + fences)
+- persistente: Stream_Buffer mapeado una vez; el cálculo escribe directamente en la región (sin copias)
+
+Los frames se encadenan sin glFinish, como en una aplicación real; "esperas" cuenta las veces que una
+región todavía estaba en uso por la GPU. Las filas "+ culling" escriben la esfera todos los frames pero
+solo la dibujan uno de cada CULLED_EVERY, como un objeto animado que el culling descarta: la región
+escrita y no dibujada sigue mapeada cuando llega la siguiente.
+
+Uso: python -m benchmarks.stream_buffer [frames]
+"""
+from benchmarks.gl_context import create_context
+
+import sys
+import time
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+import main2
+from glApp.Camera import Camera
+from glApp.Matrices import identity, translate
+from glApp.RenderQueue import render_state
+from glApp.StreamBuffer import supports_buffer_storage
+from glApp.Utils import uniform_location
+from glApp.WaterSphere import WaterSphere
+
+WIDTH, HEIGHT = 320, 240
+SIZES = [(128, 64), (512, 256)]
+CULLED_EVERY = 2
+
+
+def displace(base, frame, out):
+    """Ondulación radial de las posiciones de base escrita en out[:, :3]"""
+    positions = base[:, :3]
+    scale = np.sin(positions[:, 1] * 6.0 + frame * 0.1)
+    scale *= 0.05
+    scale += 1.0
+    np.multiply(positions, scale[:, None], out=out[:, :3])
+
+
+def run(sphere, upload, frames, culled_every=1):
+    """(ms de cálculo + subida, ms de CPU, ms totales) por frame; solo se dibuja uno de cada culled_every"""
+    base = np.array(sphere.vertex_data).reshape(-1, 8)
+    scratch = base.copy()
+    uploading = 0.0
+    start = time.perf_counter()
+    for frame in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        upload_start = time.perf_counter()
+        upload(sphere, base, scratch, frame)
+        uploading += time.perf_counter() - upload_start
+        if frame % culled_every == 0:
+            sphere.draw()
+    submitted = time.perf_counter()
+    glFinish()
+    end = time.perf_counter()
+    return uploading / frames, (submitted - start) / frames, (end - start) / frames
+
+
+def buffer_data(sphere, base, scratch, frame):
+    displace(base, frame, scratch)
+    glBindBuffer(GL_ARRAY_BUFFER, sphere.vbo)
+    glBufferData(GL_ARRAY_BUFFER, scratch.nbytes, scratch, GL_STATIC_DRAW)
+
+
+def buffer_sub_data(sphere, base, scratch, frame):
+    displace(base, frame, scratch)
+    glBindBuffer(GL_ARRAY_BUFFER, sphere.vbo)
+    glBufferSubData(GL_ARRAY_BUFFER, 0, scratch.nbytes, scratch)
+
+
+def stream(sphere, base, scratch, frame):
+    displace(base, frame, sphere.stream_vertices())
+
+
+def main_benchmark(frames=200):
+    create_context(WIDTH, HEIGHT)
+    glViewport(0, 0, WIDTH, HEIGHT)
+    render_state.set_capability(GL_DEPTH_TEST, True)
+    program_id = main2.create_program(main2.vertex_shader_water, main2.fragment_shader_water)
+    camera = Camera(program_id, WIDTH, HEIGHT)
+    camera.transformation = translate(identity(), 0, 0, -3)
+    camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+    camera.load()
+    render_state.use_program(program_id)
+    glUniform1f(uniform_location(program_id, "time"), 0.0)
+    persistent = supports_buffer_storage()
+    print(f"{frames} frames a {WIDTH}x{HEIGHT}; almacenamiento persistente: {'sí' if persistent else 'no'} (ms por frame)")
+    print(f"  {'método':<30}{'vértices':>10}{'subida':>9}{'CPU':>9}{'total':>9}{'esperas':>9}")
+    for slices, stacks in SIZES:
+        methods = [("glBufferData", WaterSphere(program_id, slices=slices, stacks=stacks), buffer_data, 1),
+                   ("glBufferSubData", WaterSphere(program_id, slices=slices, stacks=stacks), buffer_sub_data, 1)]
+        for culled_every, suffix in [(1, ""), (CULLED_EVERY, " + culling")]:
+            methods.append(("mapeo por región" + suffix, WaterSphere(program_id, slices=slices, stacks=stacks,
+                                                                     dynamic=True, persistent=False),
+                            stream, culled_every))
+            if persistent:
+                methods.append(("persistente" + suffix, WaterSphere(program_id, slices=slices, stacks=stacks,
+                                                                    dynamic=True, persistent=True),
+                                stream, culled_every))
+        for name, sphere, upload, culled_every in methods:
+            uploading, cpu, total = run(sphere, upload, frames, culled_every)
+            stalls = sphere.stream.stalls if sphere.stream is not None else "-"
+            print(f"  {name:<30}{len(sphere.vertex_data) // 8:>10}{uploading * 1000:>9.2f}{cpu * 1000:>9.2f}{total * 1000:>9.2f}{stalls:>9}")
+
+
+if __name__ == "__main__":
+    main_benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""Deriva y coste por frame: acumulación de move_* en la matriz frente a Transform.
+
+Uso: python -m benchmarks.transform_drift [frames]
+"""
+import sys
+import timeit
+
+import numpy as np
+import pygame
+
+from glApp.Matrices import Rotation, identity, translate, scale, rotate
+from glApp.Transform import Transform, FRAME_RATE
+
+
+def legacy_frames(frames, move_rotation, move_translate, move_scale):
+    # Lo que hacía Mesh.draw: multiplicar los movimientos en la matriz cada frame
+    matrix = identity()
+    for _ in range(frames):
+        matrix = rotate(matrix, move_rotation.angle, move_rotation.axis)
+        matrix = translate(matrix, move_translate.x, move_translate.y, move_translate.z)
+        matrix = scale(matrix, move_scale.x, move_scale.y, move_scale.z)
+    return matrix
+
+
+def transform_frames(frames, move_rotation, move_translate, move_scale):
+    transform = Transform.from_legacy(pygame.Vector3(0, 0, 0), Rotation(0, pygame.Vector3(0, 1, 0)),
+                                      pygame.Vector3(1, 1, 1), move_rotation, move_translate, move_scale)
+    for _ in range(frames):
+        transform.update(1.0 / FRAME_RATE)
+    return transform.matrix
+
+
+def exact(frames, move_rotation):
+    # Solo rotación: la solución cerrada es una única rotación de frames * angle grados, en float64
+    angle = np.radians(move_rotation.angle * frames)
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, 0, s, 0], [0, 1, 0, 0], [-s, 0, c, 0], [0, 0, 0, 1]])
+
+
+def orthogonality_error(matrix):
+    rotation = matrix[:3, :3].astype(np.float64)
+    return np.abs(rotation @ rotation.T - np.identity(3)).max()
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 216000
+    spin = Rotation(0.7, pygame.Vector3(0, 1, 0))
+    still = pygame.Vector3(0, 0, 0)
+    unit = pygame.Vector3(1, 1, 1)
+
+    print(f"{frames} frames girando {spin.angle} grados/frame ({frames / FRAME_RATE / 60:.0f} min a 60 fps)")
+    for name, run in [("matriz acumulada", legacy_frames), ("Transform", transform_frames)]:
+        matrix = run(frames, spin, still, unit)
+        print(f"  {name:<18} error vs exacto {np.abs(matrix - exact(frames, spin)).max():.2e}"
+              f"   no ortogonalidad {orthogonality_error(matrix):.2e}")
+
+    static = Transform()
+    static.update()
+    moving = Transform.from_legacy(still, Rotation(0, pygame.Vector3(0, 1, 0)), unit, spin, still, unit)
+    matrix = identity()
+    cases = [("matriz acumulada (3 matmul)",
+              lambda: scale(translate(rotate(matrix, 1, spin.axis), 0, 0, 0), 1, 1, 1)),
+             ("Transform en movimiento", lambda: moving.update(1.0 / FRAME_RATE)),
+             ("Transform estático", lambda: static.update(1.0 / FRAME_RATE))]
+    print("coste por objeto y frame")
+    for name, case in cases:
+        cost = min(timeit.repeat(case, number=20000, repeat=5)) / 20000
+        print(f"  {name:<28}{cost * 1e6:8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Simulación de olas de WaterSphere: pasos por segundo del solver y frames con el paso en el hilo de GL o en otro hilo.
+
+Uso: python -m benchmarks.water_simulation [segundos por medida]
+"""
+from benchmarks.gl_context import create_context
+
+import sys
+import time
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+import main2
+from glApp.Camera import Camera
+from glApp.Matrices import identity, translate
+from glApp.RenderQueue import render_state
+from glApp.WaterSphere import WaterSphere
+from glApp.WaterSurface import Gerstner_Waves
+
+WIDTH, HEIGHT = 320, 240
+SIZES = [(128, 64), (512, 256)]
+
+
+def rate(function, seconds):
+    """Llamadas por segundo de function(paso) durante al menos seconds"""
+    function(0)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        function(count)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main_benchmark(seconds=2.0):
+    create_context(WIDTH, HEIGHT)
+    glViewport(0, 0, WIDTH, HEIGHT)
+    render_state.set_capability(GL_DEPTH_TEST, True)
+    program_id = main2.create_program(main2.vertex_shader_water, main2.fragment_shader_water)
+    camera = Camera(program_id, WIDTH, HEIGHT)
+    camera.transformation = translate(identity(), 0, 0, -3)
+    camera.light_position = pygame.Vector3(3.0, 5.0, 3.0)
+    camera.load()
+    print(f"  {'rejilla':<10}{'vértices':>10}{'pasos/s':>10}{'ms/paso':>9}{'fps mismo hilo':>16}{'fps otro hilo':>15}")
+    for slices, stacks in SIZES:
+        waves = Gerstner_Waves(1.0, slices, stacks)
+        out = np.empty(((slices + 1) * (stacks + 1), 8), np.float32)
+        steps = rate(lambda step: waves.step(step / 60.0, out), seconds)
+        fps = []
+        for threaded in (False, True):
+            sphere = WaterSphere(program_id, slices=slices, stacks=stacks, waves=True, threaded=threaded)
+
+            def frame(step):
+                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                sphere.animate(step / 60.0)
+                sphere.draw()
+                glFinish()
+            fps.append(rate(frame, seconds))
+            sphere.simulation.close()
+        print(f"  {slices}x{stacks:<6}{len(out):>10}{steps:>10.1f}{1000 / steps:>9.2f}{fps[0]:>16.1f}{fps[1]:>15.1f}")
+
+
+if __name__ == "__main__":
+    main_benchmark(*map(float, sys.argv[1:]))
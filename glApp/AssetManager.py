@@ -0,0 +1,265 @@
+"""Carga de modelos en segundo plano: el parseo de OBJ y la geometría de esferas van a un pool de hilos
+(o de procesos) y solo la subida a la GPU ocurre en el hilo de GL.
+
+load_mesh() devuelve enseguida un Mesh_Asset que dibuja una caja de alambre con sus bounds mientras el
+archivo se lee; update(), llamado una vez por frame, crea los Mesh de las cargas terminadas hasta gastar
+el presupuesto de subida del frame (siempre al menos uno, para que una malla grande no espere para siempre).
+Las peticiones del mismo archivo con las mismas opciones comparten el Future y, con el mismo programa,
+también el Mesh en la GPU.
+
+El parser es NumPy vectorizado y suelta el GIL en las operaciones grandes, así que los hilos bastan;
+con processes=True cada carga va a otro proceso y los arrays vuelven por copia.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+from .Culling import Bounds
+from .Geometry import sphere_geometry
+from .LoadMesh import load_mesh_data, mesh_layout
+from .Matrices import Rotation, translate
+from .Matrices import scale as scale_matrix
+from .Mesh import Mesh
+from .Transform import Transform
+
+# Milisegundos por frame para crear mallas en la GPU
+UPLOAD_BUDGET_MS = 4.0
+# Un núcleo queda para el hilo de GL: con más trabajadores que núcleos los frames de la carga se alargan
+ASSET_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Caja mostrada mientras no se conocen los bounds del modelo
+PLACEHOLDER_BOUNDS = Bounds.from_sphere(0.5)
+PLACEHOLDER_COLOR = (0.6, 0.6, 0.6)
+
+# Aristas de la caja unidad [0, 1]^3 como pares de esquinas (bit 0 = x, bit 1 = y, bit 2 = z)
+BOX_EDGES = [0, 1, 2, 3, 4, 5, 6, 7, 0, 2, 1, 3, 4, 6, 5, 7, 0, 4, 1, 5, 2, 6, 3, 7]
+
+
+def mesh_key(filename, *options):
+    return ("mesh", os.path.abspath(filename)) + options
+
+
+def _mesh_job(filename, use_cache, indexed, layout, optimize):
+    """Trabajo del pool: datos de LoadMesh y sus bounds (función de módulo para poder enviarla a un proceso)"""
+    start = time.perf_counter()
+    vertices, normals, uvs, indices = load_mesh_data(filename, use_cache, indexed, 1, layout, optimize)
+    # Los arrays de la caché están mapeados en memoria: copiarlos aquí, no en el hilo de GL
+    vertices, normals, uvs, indices = (None if data is None else np.array(data)
+                                       for data in (vertices, normals, uvs, indices))
+    return (vertices, normals, uvs, indices), Bounds.from_vertices(vertices), time.perf_counter() - start
+
+
+def _sphere_job(radius, slices, stacks, layout, cached):
+    start = time.perf_counter()
+    return sphere_geometry(radius, slices, stacks, layout, cached), time.perf_counter() - start
+
+
+class Mesh_Asset():
+    """Malla que se está cargando: misma interfaz de dibujo que Mesh (draw, render, model_matrix, bounds).
+
+    Hasta que el Mesh existe se dibuja la caja envolvente; el transform es propio, así que el movimiento
+    no salta al terminar la carga.
+    """
+    def __init__(self, manager, key, future, program_id, draw_type, transform, bounds=None):
+        self.manager = manager
+        self.key = key
+        # Propio y no buscado en manager.requests: un fallo se borra de ahí para poder reintentar
+        self.future = future
+        self.program_id = program_id
+        self.draw_type = draw_type
+        self.transform = transform
+        self.mesh = None
+        self.error = None
+        self.placeholder_bounds = PLACEHOLDER_BOUNDS if bounds is None else bounds
+
+    @property
+    def ready(self):
+        return self.mesh is not None
+
+
+    @property
+    def bounds(self):
+        if self.mesh is not None:
+            return self.mesh.bounds
+        # Carga terminada pero aún sin subir: ya se conocen los bounds reales
+        future = self.future
+        if future.done() and future.exception() is None:
+            return future.result()[1]
+        return self.placeholder_bounds
+
+    def model_matrix(self, elapsed=None):
+        return self.transform.update(elapsed)
+
+    def draw(self, elapsed=None):
+        self.render(self.model_matrix(elapsed))
+
+    def render(self, model_mat):
+        if self.mesh is not None:
+            self.mesh.render(model_mat)
+            return
+        # Carga fallida: no hay nada que dibujar (el error queda en self.error y se anunció en update())
+        if self.error is not None:
+            return
+        bounds = self.bounds
+        box = translate(model_mat, *bounds.box_min.tolist())
+        box = scale_matrix(box, *np.maximum(bounds.box_max - bounds.box_min, 1e-6).tolist())
+        self.manager.placeholder(self.program_id).render(box)
+
+
+class Asset_Manager():
+    def __init__(self, workers=ASSET_WORKERS, processes=False, budget_ms=UPLOAD_BUDGET_MS):
+        self.workers = workers
+        self.processes = processes
+        self.budget_ms = budget_ms
+        self.pool = None
+        # Clave de la petición -> Future; se conserva si termina bien, así una segunda petición no vuelve a leer
+        self.requests = {}
+        # (clave, programa, tipo de primitiva) -> Mesh ya subido
+        self.meshes = {}
+        self.placeholders = {}
+        self.pending = []
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "shared": 0, "uploaded": 0, "load_seconds": 0.0}
+
+    def executor(self):
+        if self.pool is None:
+            if self.processes:
+                self.pool = ProcessPoolExecutor(self.workers)
+            else:
+                self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+        return self.pool
+
+    def submit(self, key, job, *args):
+        """Future de job(*args); si ya hay uno para key se reutiliza (también desde otros hilos)"""
+        with self.lock:
+            self.stats["requests"] += 1
+            future = self.requests.get(key)
+            if future is not None:
+                self.stats["shared"] += 1
+                return future
+            future = self.executor().submit(job, *args)
+            self.requests[key] = future
+        future.add_done_callback(self.count_load)
+        return future
+
+    def count_load(self, future):
+        if future.cancelled() or future.exception() is not None:
+            # Un fallo no se queda en caché: la siguiente petición (p. ej. con el archivo ya corregido) reintenta
+            with self.lock:
+                for key, request in list(self.requests.items()):
+                    if request is future:
+                        del self.requests[key]
+            return
+        with self.lock:
+            self.stats["load_seconds"] += future.result()[-1]
+
+    def mesh_data(self, filename, use_cache=True, indexed=True, layout="pnt", optimize=True):
+        """Future con ((vertices, normals, uvs, indices), bounds, segundos de carga)"""
+        options = (use_cache, indexed, layout, optimize)
+        return self.submit(mesh_key(filename, *options), _mesh_job, filename, *options)
+
+    def sphere_geometry(self, radius=1.0, slices=128, stacks=64, layout="pn", cached=True):
+        """Future con ((vertex_data, index_data), segundos); con hilos y cached=True también deja lista la
+        entrada de sphere_geometry que usarán Sphere, WaterSphere y MatteSphere"""
+        key = ("sphere", float(radius), int(slices), int(stacks), layout, cached)
+        return self.submit(key, _sphere_job, radius, slices, stacks, layout, cached and not self.processes)
+
+    def load_mesh(self, filename, program_id, draw_type=GL_TRIANGLES,
+                  location=pygame.Vector3(0, 0, 0),
+                  rotation=Rotation(0, pygame.Vector3(0, 1, 0)),
+                  scale=pygame.Vector3(1, 1, 1),
+                  move_rotation=Rotation(0, pygame.Vector3(0, 1, 0)),
+                  move_translate=pygame.Vector3(0, 0, 0),
+                  move_scale=pygame.Vector3(1, 1, 1),
+                  use_cache=True,
+                  indexed=True,
+                  optimize=True,
+                  bounds=None
+                  ):
+        """Como LoadMesh, pero sin esperar: devuelve un Mesh_Asset que update() completa más tarde"""
+        # Los atributos que lee el programa se consultan aquí, en el hilo de GL
+        options = (use_cache, indexed, mesh_layout(program_id), optimize)
+        future = self.mesh_data(filename, *options)
+        key = mesh_key(filename, *options)
+        transform = Transform.from_legacy(location, rotation, scale, move_rotation, move_translate, move_scale)
+        asset = Mesh_Asset(self, key, future, program_id, draw_type, transform, bounds)
+        self.pending.append(asset)
+        return asset
+
+    def placeholder(self, program_id):
+        """Caja de alambre [0, 1]^3 (12 líneas) para el programa dado"""
+        box = self.placeholders.get(program_id)
+        if box is None:
+            corners = np.array([(i & 1, i >> 1 & 1, i >> 2 & 1) for i in range(8)], np.float32)
+            vertices = corners[BOX_EDGES]
+            colors = np.tile(np.float32(PLACEHOLDER_COLOR), (len(vertices), 1))
+            box = Mesh(program_id, vertices, None, None, colors, GL_LINES)
+            self.placeholders[program_id] = box
+        return box
+
+    def update(self, budget_ms=None):
+        """En el hilo de GL, una vez por frame: sube las mallas terminadas sin pasar del presupuesto.
+
+        Devuelve cuántos Mesh_Asset quedaron listos en esta llamada.
+        """
+        if not self.pending:
+            return 0
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        start = time.perf_counter()
+        completed = 0
+        waiting = []
+        for index, asset in enumerate(self.pending):
+            future = asset.future
+            if not future.done():
+                waiting.append(asset)
+                continue
+            if future.exception() is not None:
+                asset.error = future.exception()
+                print(f"❌ No se pudo cargar {asset.key[1]}: {asset.error}")
+                continue
+            upload_key = (asset.key, asset.program_id, asset.draw_type)
+            mesh = self.meshes.get(upload_key)
+            if mesh is None:
+                # Presupuesto agotado: el resto espera al próximo frame (al menos una subida por llamada)
+                if completed and time.perf_counter() - start >= budget:
+                    waiting.extend(self.pending[index:])
+                    break
+                (vertices, normals, uvs, indices), _, _ = future.result()
+                mesh = Mesh(asset.program_id, vertices, normals, uvs, np.ones_like(vertices), asset.draw_type,
+                            indices=indices)
+                self.meshes[upload_key] = mesh
+                self.stats["uploaded"] += 1
+            asset.mesh = mesh
+            completed += 1
+        self.pending = waiting
+        return completed
+
+    def wait(self):
+        """Bloquea hasta que todas las cargas pendientes terminen y sube todas (sin presupuesto)"""
+        for asset in list(self.pending):
+            try:
+                asset.future.result()
+            except Exception:
+                pass
+        self.update(float("inf"))
+
+    def loading(self):
+        return len(self.pending)
+
+    def invalidate(self):
+        """Contexto nuevo: los Mesh subidos dejan de existir; los datos ya leídos se conservan"""
+        self.meshes.clear()
+        self.placeholders.clear()
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+# Un gestor por proceso, como shader_cache y shader_library
+asset_manager = Asset_Manager()
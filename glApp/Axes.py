@@ -15,4 +15,4 @@ class Axes(Mesh):
                   [1.0, 1.0, 0.0],
                   [0.0, 0.0, 1.0],
                   [0.0, 0.0, 1.0]]
-        super().__init__(program_id, vertices, colors, GL_LINES, location)
\ No newline at end of file
+        super().__init__(program_id, vertices, None, None, colors, GL_LINES, location)
\ No newline at end of file
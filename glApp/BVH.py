@@ -0,0 +1,335 @@
+import numpy as np
+
+from .Culling import world_boxes
+
+# Estados de un nodo frente a un volumen de consulta
+OUTSIDE, INTERSECTS, INSIDE = 0, 1, 2
+
+
+def _box_area(box_min, box_max):
+    size = np.maximum(box_max - box_min, 0.0)
+    return size[..., 0] * size[..., 1] + size[..., 1] * size[..., 2] + size[..., 2] * size[..., 0]
+
+
+def _ranges(starts, counts):
+    """Concatena los rangos [start, start + count) sin bucle de Python"""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, np.int64)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    return offsets + np.arange(total)
+
+
+class BVH():
+    """Jerarquía de volúmenes (cajas alineadas a los ejes) en arrays planos de NumPy.
+
+    Se construye con SAH por bins, un nivel entero a la vez. Cada nodo cubre el rango
+    [start, start + count) de self.order, así que un subárbol entero son primitivas contiguas.
+    Las consultas recorren el árbol por frentes: todos los nodos de un nivel se prueban a la vez.
+    """
+    def __init__(self, box_min, box_max, leaf_size=4, bins=12):
+        self.leaf_size = leaf_size
+        self.bins = bins
+        self.box_min = np.array(box_min, np.float32).reshape(-1, 3)
+        self.box_max = np.array(box_max, np.float32).reshape(-1, 3)
+        self.build()
+
+    def __len__(self):
+        return len(self.box_min)
+
+    def build(self):
+        """Construcción por niveles: todos los nodos de un nivel se parten a la vez"""
+        count = len(self.box_min)
+        self.centroids = (self.box_min + self.box_max) / 2
+        self.order = np.arange(count)
+        level_ids = np.zeros(1, np.int64)
+        level_start = np.zeros(1, np.int64)
+        level_count = np.array([count], np.int64)
+        node_start, node_count, depth, links = [level_start], [level_count], [np.zeros(1, np.int64)], []
+        next_id = 1
+        while True:
+            split = level_count > self.leaf_size
+            if not split.any():
+                break
+            parents, starts, counts = level_ids[split], level_start[split], level_count[split]
+            left_counts = self.split_level(starts, counts)
+            children = next_id + np.arange(2 * len(parents))
+            next_id += len(children)
+            links.append((parents, children[0::2], children[1::2]))
+            level_ids = children
+            level_start = np.stack([starts, starts + left_counts], axis=1).ravel()
+            level_count = np.stack([left_counts, counts - left_counts], axis=1).ravel()
+            node_start.append(level_start)
+            node_count.append(level_count)
+            depth.append(np.full(len(children), len(depth), np.int64))
+
+        self.node_start = np.concatenate(node_start)
+        self.node_count = np.concatenate(node_count)
+        self.depth = np.concatenate(depth)
+        self.left = np.full(next_id, -1, np.int64)
+        self.right = np.full(next_id, -1, np.int64)
+        for parents, left, right in links:
+            self.left[parents] = left
+            self.right[parents] = right
+        # Hojas en el orden de sus rangos, para reducir con reduceat
+        self.leaves = np.flatnonzero(self.left == -1)
+        self.leaves = self.leaves[np.argsort(self.node_start[self.leaves], kind="stable")]
+        self.levels = [parents for parents, _, _ in links]
+        self.node_min = np.empty((next_id, 3), np.float32)
+        self.node_max = np.empty((next_id, 3), np.float32)
+        del self.centroids
+        self.refit()
+
+    def split_level(self, starts, counts):
+        """Parte cada rango [start, start + count) de self.order por el mejor corte SAH de su eje más largo.
+
+        Reordena self.order en el sitio y devuelve cuántas primitivas quedan a la izquierda en cada rango.
+        """
+        segments = len(starts)
+        positions = _ranges(starts, counts)
+        segment = np.repeat(np.arange(segments), counts)
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        items = self.order[positions]
+        centroids = self.centroids[items]
+
+        low = np.minimum.reduceat(centroids, offsets)
+        extent = np.maximum.reduceat(centroids, offsets) - low
+        axis = extent.argmax(axis=1)
+        axis_extent = extent[np.arange(segments), axis]
+        value = centroids[np.arange(len(items)), axis[segment]] - low[segment, axis[segment]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bins = np.nan_to_num(value / axis_extent[segment] * self.bins).astype(np.int64)
+        bins = np.clip(bins, 0, self.bins - 1)
+
+        key = segment * self.bins + bins
+        bin_counts = np.bincount(key, minlength=segments * self.bins).reshape(segments, self.bins)
+        bin_min = np.full((segments * self.bins, 3), np.inf, np.float32)
+        bin_max = np.full((segments * self.bins, 3), -np.inf, np.float32)
+        np.minimum.at(bin_min, key, self.box_min[items])
+        np.maximum.at(bin_max, key, self.box_max[items])
+        bin_min = bin_min.reshape(segments, self.bins, 3)
+        bin_max = bin_max.reshape(segments, self.bins, 3)
+
+        # Coste SAH de cortar después de cada bin: área izquierda * n izquierda + área derecha * n derecha
+        left_area = _box_area(np.minimum.accumulate(bin_min, axis=1), np.maximum.accumulate(bin_max, axis=1))
+        right_area = _box_area(np.minimum.accumulate(bin_min[:, ::-1], axis=1)[:, ::-1],
+                               np.maximum.accumulate(bin_max[:, ::-1], axis=1)[:, ::-1])
+        left_count = np.cumsum(bin_counts, axis=1)[:, :-1]
+        cost = left_area[:, :-1] * left_count + right_area[:, 1:] * (counts[:, None] - left_count)
+        cost[(left_count == 0) | (left_count == counts[:, None])] = np.inf
+        best = cost.argmin(axis=1)
+        go_right = bins > best[segment]
+        # Todos los centroides en el mismo punto: se parte el rango por la mitad
+        degenerate = ~np.isfinite(cost[np.arange(segments), best])
+        rank = np.arange(len(items)) - offsets[segment]
+        go_right = np.where(degenerate[segment], rank >= counts[segment] // 2, go_right)
+
+        self.order[positions] = items[np.argsort(segment * 2 + go_right, kind="stable")]
+        return counts - np.bincount(segment, weights=go_right, minlength=segments).astype(np.int64)
+
+    def refit(self, box_min=None, box_max=None):
+        """Recalcula las cajas de los nodos (p. ej. con objetos que se movieron) sin reconstruir el árbol"""
+        if box_min is not None:
+            self.box_min[:] = box_min
+            self.box_max[:] = box_max
+        if not len(self.order):
+            self.node_min[:] = self.node_max[:] = 0.0
+            return
+        ordered_min = self.box_min[self.order]
+        ordered_max = self.box_max[self.order]
+        starts = self.node_start[self.leaves]
+        self.node_min[self.leaves] = np.minimum.reduceat(ordered_min, starts)
+        self.node_max[self.leaves] = np.maximum.reduceat(ordered_max, starts)
+        for nodes in reversed(self.levels):
+            self.node_min[nodes] = np.minimum(self.node_min[self.left[nodes]], self.node_min[self.right[nodes]])
+            self.node_max[nodes] = np.maximum(self.node_max[self.left[nodes]], self.node_max[self.right[nodes]])
+
+    def traverse(self, classify_nodes, classify_primitives):
+        """Primitivas aceptadas por una consulta; classify_nodes(nodos) devuelve OUTSIDE/INTERSECTS/INSIDE"""
+        frontier = np.zeros(1, np.int64)
+        inside_nodes = []
+        candidate_leaves = []
+        while frontier.size:
+            state = classify_nodes(frontier)
+            inside_nodes.append(frontier[state == INSIDE])
+            crossing = frontier[state == INTERSECTS]
+            is_leaf = self.left[crossing] == -1
+            candidate_leaves.append(crossing[is_leaf])
+            inner = crossing[~is_leaf]
+            frontier = np.concatenate([self.left[inner], self.right[inner]])
+        inside_nodes = np.concatenate(inside_nodes)
+        candidate_leaves = np.concatenate(candidate_leaves)
+        accepted = self.order[_ranges(self.node_start[inside_nodes], self.node_count[inside_nodes])]
+        candidates = self.order[_ranges(self.node_start[candidate_leaves], self.node_count[candidate_leaves])]
+        return np.concatenate([accepted, candidates[classify_primitives(candidates)]])
+
+    def query_aabb(self, box_min, box_max):
+        """Índices de las primitivas cuya caja se solapa con la caja dada"""
+        box_min = np.asarray(box_min, np.float32)
+        box_max = np.asarray(box_max, np.float32)
+
+        def classify(nodes):
+            overlap = ((self.node_min[nodes] <= box_max) & (self.node_max[nodes] >= box_min)).all(axis=1)
+            contained = ((self.node_min[nodes] >= box_min) & (self.node_max[nodes] <= box_max)).all(axis=1)
+            return np.where(contained, INSIDE, np.where(overlap, INTERSECTS, OUTSIDE))
+
+        def overlaps(items):
+            return ((self.box_min[items] <= box_max) & (self.box_max[items] >= box_min)).all(axis=1)
+
+        return self.traverse(classify, overlaps)
+
+    def query_frustum(self, planes):
+        """Índices de las primitivas cuya caja no queda fuera de los planos (frustum_planes de Culling)"""
+        normals = planes[:, :3]
+        reach_normals = np.abs(normals).T
+
+        def distances(box_min, box_max):
+            centers = (box_min + box_max) / 2
+            return centers @ normals.T + planes[:, 3], (box_max - box_min) / 2 @ reach_normals
+
+        def classify(nodes):
+            distance, reach = distances(self.node_min[nodes], self.node_max[nodes])
+            outside = (distance < -reach).any(axis=1)
+            inside = (distance >= reach).all(axis=1)
+            return np.where(outside, OUTSIDE, np.where(inside, INSIDE, INTERSECTS))
+
+        def visible(items):
+            distance, reach = distances(self.box_min[items], self.box_max[items])
+            return ~(distance < -reach).any(axis=1)
+
+        return self.traverse(classify, visible)
+
+    def query_rays(self, origins, directions, max_distance=np.inf):
+        """Pares (rayo, primitiva) cuya caja atraviesa el rayo, con la distancia de entrada; todos los rayos a la vez"""
+        origins = np.asarray(origins, np.float64).reshape(-1, 3)
+        inverses = _inverse_directions(np.asarray(directions, np.float64).reshape(-1, 3))
+        rays = np.arange(len(origins))
+        nodes = np.zeros(len(origins), np.int64)
+        leaf_rays, leaf_nodes = [], []
+        while rays.size:
+            hit, _ = _ray_boxes(origins[rays], inverses[rays], self.node_min[nodes], self.node_max[nodes],
+                                max_distance)
+            rays, nodes = rays[hit], nodes[hit]
+            is_leaf = self.left[nodes] == -1
+            leaf_rays.append(rays[is_leaf])
+            leaf_nodes.append(nodes[is_leaf])
+            rays, nodes = rays[~is_leaf], nodes[~is_leaf]
+            rays = np.concatenate([rays, rays])
+            nodes = np.concatenate([self.left[nodes], self.right[nodes]])
+        leaf_rays = np.concatenate(leaf_rays)
+        leaf_nodes = np.concatenate(leaf_nodes)
+        counts = self.node_count[leaf_nodes]
+        rays = np.repeat(leaf_rays, counts)
+        items = self.order[_ranges(self.node_start[leaf_nodes], counts)]
+        hit, entry = _ray_boxes(origins[rays], inverses[rays], self.box_min[items], self.box_max[items], max_distance)
+        return rays[hit], items[hit], entry[hit]
+
+    def query_ray(self, origin, direction, max_distance=np.inf):
+        """Primitivas cuya caja atraviesa el rayo, ordenadas por distancia de entrada: (índices, distancias)"""
+        _, items, entry = self.query_rays(origin, direction, max_distance)
+        order = np.argsort(entry, kind="stable")
+        return items[order], entry[order]
+
+
+def _inverse_directions(directions):
+    # Componentes nulas: un número enorme en vez de inf evita 0 * inf = nan en la prueba de slabs
+    with np.errstate(divide="ignore"):
+        return np.where(np.abs(directions) < 1e-30, 1e30, 1.0 / directions)
+
+
+def _ray_boxes(origins, inverses, box_min, box_max, max_distance=np.inf):
+    """Prueba de slabs fila a fila: (máscara de impacto, distancia de entrada)"""
+    near = (box_min - origins) * inverses
+    far = (box_max - origins) * inverses
+    entry = np.minimum(near, far).max(axis=1)
+    exit = np.maximum(near, far).min(axis=1)
+    return (entry <= exit) & (exit >= 0.0) & (entry <= max_distance), np.maximum(entry, 0.0)
+
+
+def local_ray(origin, direction, model_mat):
+    """Lleva rayos de mundo al espacio del objeto; la distancia a lo largo del rayo se conserva"""
+    inverse = np.linalg.inv(np.asarray(model_mat, np.float64))
+    local_origin = np.asarray(origin, np.float64) @ inverse[:3, :3].T + inverse[:3, 3]
+    return local_origin, np.asarray(direction, np.float64) @ inverse[:3, :3].T
+
+
+class Triangle_BVH(BVH):
+    """BVH sobre los triángulos de una malla (LoadMesh, Mesh) para picking y consultas de rayo"""
+    def __init__(self, triangles, leaf_size=4, bins=12):
+        self.triangles = np.asarray(triangles, np.float32).reshape(-1, 3, 3)
+        super().__init__(self.triangles.min(axis=1), self.triangles.max(axis=1), leaf_size, bins)
+
+    @classmethod
+    def from_mesh(cls, mesh, **options):
+        vertices = np.asarray(mesh.vertices, np.float32).reshape(-1, 3)
+        if getattr(mesh, "indices", None) is not None:
+            vertices = vertices[np.asarray(mesh.indices, np.int64)]
+        return cls(vertices, **options)
+
+    def ray_cast_many(self, origins, directions, model_mat=None, max_distance=np.inf):
+        """Impacto más cercano de cada rayo: (distancias, triángulos), con inf y -1 donde no hay impacto"""
+        if model_mat is not None:
+            origins, directions = local_ray(origins, directions, model_mat)
+        origins = np.asarray(origins, np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, np.float64).reshape(-1, 3)
+        rays, items, _ = self.query_rays(origins, directions, max_distance)
+
+        # Möller-Trumbore sobre todos los pares (rayo, triángulo) candidatos a la vez
+        corners = self.triangles[items].astype(np.float64)
+        direction = directions[rays]
+        edge1 = corners[:, 1] - corners[:, 0]
+        edge2 = corners[:, 2] - corners[:, 0]
+        p = np.cross(direction, edge2)
+        determinant = (edge1 * p).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = 1.0 / determinant
+            offset = origins[rays] - corners[:, 0]
+            u = (offset * p).sum(axis=1) * inverse
+            q = np.cross(offset, edge1)
+            v = (q * direction).sum(axis=1) * inverse
+            distance = (edge2 * q).sum(axis=1) * inverse
+        hit = (np.abs(determinant) > 1e-12) & (u >= 0) & (v >= 0) & (u + v <= 1) & (distance >= 0) \
+            & (distance <= max_distance)
+        rays, items, distance = rays[hit], items[hit], distance[hit]
+
+        distances = np.full(len(origins), np.inf)
+        triangles = np.full(len(origins), -1, np.int64)
+        order = np.lexsort((distance, rays))
+        first = order[np.unique(rays[order], return_index=True)[1]]
+        distances[rays[first]] = distance[first]
+        triangles[rays[first]] = items[first]
+        return distances, triangles
+
+    def ray_cast(self, origin, direction, model_mat=None, max_distance=np.inf):
+        """Impacto más cercano (distancia, índice de triángulo) o None; model_mat lleva el rayo a espacio local"""
+        distances, triangles = self.ray_cast_many(origin, direction, model_mat, max_distance)
+        if triangles[0] == -1:
+            return None
+        return float(distances[0]), int(triangles[0])
+
+
+class Object_BVH(BVH):
+    """BVH sobre las cajas de mundo de objetos con Bounds (ver Culling.Bounds_Array)"""
+    def __init__(self, model_mats, bounds, leaf_size=4, bins=12):
+        self.bounds = bounds
+        box_min, box_max = self.world_boxes(model_mats)
+        super().__init__(box_min, box_max, leaf_size, bins)
+
+    def world_boxes(self, model_mats):
+        centers, extents = world_boxes(np.asarray(model_mats, np.float32).reshape(-1, 4, 4), self.bounds)
+        return centers - extents, centers + extents
+
+    def refit_objects(self, model_mats):
+        """refit() con las cajas de mundo de nuevas matrices de modelo (objetos que se movieron, como MovingMesh)"""
+        return self.refit(*self.world_boxes(model_mats))
+
+    def with_unbounded(self, items):
+        # Los objetos sin bounds (caja de tamaño cero en el árbol) se aceptan siempre
+        unbounded = np.flatnonzero(self.bounds.unbounded)
+        return np.union1d(items, unbounded) if unbounded.size else items
+
+    def query_aabb(self, box_min, box_max):
+        return self.with_unbounded(super().query_aabb(box_min, box_max))
+
+    def query_frustum(self, planes):
+        return self.with_unbounded(super().query_frustum(planes))
@@ -1,59 +1,22 @@
 import numpy as np
+from .Matrices import Rotation, identity, translate, rotate
 import pygame
 from OpenGL.GL import *  # ← AGREGAR ESTA LÍNEA
 from OpenGL.GLU import *
 from math import *
+from .Uniform import *
+from .Profiler import profiler
 
 def identity_matrix():
-    return np.identity(4, dtype=np.float32)
+    return identity()
 
-def translate(matrix, x, y, z):
-    translation = np.identity(4, dtype=np.float32)
-    translation[0, 3] = x
-    translation[1, 3] = y
-    translation[2, 3] = z
-    return np.dot(matrix, translation)
-
-def rotate(matrix, angle, axis, local=True):
-    angle_rad = np.radians(angle)
-    cos_angle = np.cos(angle_rad)
-    sin_angle = np.sin(angle_rad)
-    
-    rotation = np.identity(4, dtype=np.float32)
-    
-    if axis == "x" or axis == 0:
-        rotation[1, 1] = cos_angle
-        rotation[1, 2] = -sin_angle
-        rotation[2, 1] = sin_angle
-        rotation[2, 2] = cos_angle
-    elif axis == "y" or axis == 1:
-        rotation[0, 0] = cos_angle
-        rotation[0, 2] = sin_angle
-        rotation[2, 0] = -sin_angle
-        rotation[2, 2] = cos_angle
-    elif axis == "z" or axis == 2:
-        rotation[0, 0] = cos_angle
-        rotation[0, 1] = -sin_angle
-        rotation[1, 0] = sin_angle
-        rotation[1, 1] = cos_angle
-    
-    if local:
-        return np.dot(matrix, rotation)
-    else:
-        return np.dot(rotation, matrix)
-
-class Uniform:
-    def __init__(self, data_type, data):
-        self.data_type = data_type
-        self.data = data
-        self.variable_id = None
-    
-    def find_variable(self, program_id, variable_name):
-        self.variable_id = glGetUniformLocation(program_id, variable_name)
-    
-    def load(self):
-        if self.data_type == "mat4":
-            glUniformMatrix4fv(self.variable_id, 1, GL_TRUE, self.data)
+# Bloque std140 con los datos de cámara y luz compartidos por todos los programas
+CAMERA_BLOCK = "Camera"
+CAMERA_BINDING = 0
+CAMERA_FIELDS = [("projection_mat", "mat4"),
+                 ("view_mat", "mat4"),
+                 ("view_pos", "vec3"),
+                 ("light_pos", "vec3")]
 
 class Camera:
     def __init__(self, program_id, w, h):
@@ -65,12 +28,24 @@ class Camera:
         self.mouse_sensitivityX = 0.1
         self.mouse_sensitivityY = 0.1
         self.key_sensitivity = 0.008
-        self.projection_mat = self.perspective_mat(60, w / h, 0.01, 10000)
+        # Planos de recorte; Render_Queue cuantiza la profundidad en [0, far_plane]
+        self.near_plane = 0.01
+        self.far_plane = 10000
+        self.projection_mat = self.perspective_mat(60, w / h, self.near_plane, self.far_plane)
         self.projection = Uniform("mat4", self.projection_mat)
         self.projection.find_variable(program_id, "projection_mat")
+        self.view = Uniform("mat4", self.transformation)
+        self.view.find_variable(program_id, "view_mat")
+        self.light_position = None
         self.screen_width = w
         self.screen_height = h
         self.program_id = program_id
+        self.block = Uniform_Block(CAMERA_BLOCK, CAMERA_FIELDS, CAMERA_BINDING)
+        self.uses_block = self.block.attach(program_id)
+
+    def attach(self, program_id):
+        """Comparte el bloque de cámara con otro programa"""
+        self.uses_block = self.block.attach(program_id) or self.uses_block
 
     def get_position(self):
         """Extrae la posición de la cámara desde la matriz de transformación"""
@@ -80,6 +55,25 @@ class Camera:
             self.transformation[2, 3]
         )
 
+    def projected_radius(self, center, radius):
+        """Radio en píxeles en pantalla de una esfera con centro en coordenadas de mundo"""
+        view_center = self.transformation @ np.array([center[0], center[1], center[2], 1.0], np.float32)
+        distance_sq = float(view_center[0] ** 2 + view_center[1] ** 2 + view_center[2] ** 2)
+        if distance_sq <= radius * radius:
+            return float("inf")
+        return radius / sqrt(distance_sq - radius * radius) * self.projection_mat[1, 1] * self.screen_height / 2
+
+    def screen_ray(self, x, y):
+        """Rayo de mundo (origen en el plano cercano, dirección unitaria) bajo el píxel (x, y) de la ventana"""
+        inverse = np.linalg.inv(self.projection_mat.astype(np.float64) @ self.transformation)
+        ndc_x = 2.0 * x / self.screen_width - 1.0
+        ndc_y = 1.0 - 2.0 * y / self.screen_height
+        near = inverse @ np.array([ndc_x, ndc_y, -1.0, 1.0])
+        far = inverse @ np.array([ndc_x, ndc_y, 1.0, 1.0])
+        near = near[:3] / near[3]
+        direction = far[:3] / far[3] - near
+        return near, direction / np.linalg.norm(direction)
+
     def perspective_mat(self, angle_of_view, aspect_ratio, near_plane, far_plane):
         a = radians(angle_of_view)
         d = 1.0 / tan(a / 2.0)
@@ -101,27 +95,38 @@ class Camera:
             self.transformation = rotate(self.transformation, pitch, "x", True)
 
     def update(self):
-        if pygame.mouse.get_visible():
-            return
+        with profiler.span("Camera.update"):
+            if pygame.mouse.get_visible():
+                return
 
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_change = self.last_mouse - pygame.math.Vector2(mouse_pos)
-        pygame.mouse.set_pos(self.screen_width / 2, self.screen_height / 2)
-        self.last_mouse = pygame.mouse.get_pos()
-        self.rotate(mouse_change.x * self.mouse_sensitivityX, mouse_change.y * self.mouse_sensitivityY)
+            mouse_pos = pygame.mouse.get_pos()
+            mouse_change = self.last_mouse - pygame.math.Vector2(mouse_pos)
+            pygame.mouse.set_pos(self.screen_width / 2, self.screen_height / 2)
+            self.last_mouse = pygame.mouse.get_pos()
+            self.rotate(mouse_change.x * self.mouse_sensitivityX, mouse_change.y * self.mouse_sensitivityY)
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_DOWN]:
-            self.transformation = translate(self.transformation, 0, 0, self.key_sensitivity)
-        if keys[pygame.K_UP]:
-            self.transformation = translate(self.transformation, 0, 0, -self.key_sensitivity)
-        if keys[pygame.K_RIGHT]:
-            self.transformation = translate(self.transformation, self.key_sensitivity, 0, 0)
-        if keys[pygame.K_LEFT]:
-            self.transformation = translate(self.transformation, -self.key_sensitivity, 0, 0)
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_DOWN]:
+                self.transformation = translate(self.transformation, 0, 0, self.key_sensitivity)
+            if keys[pygame.K_UP]:
+                self.transformation = translate(self.transformation, 0, 0, -self.key_sensitivity)
+            if keys[pygame.K_RIGHT]:
+                self.transformation = translate(self.transformation, self.key_sensitivity, 0, 0)
+            if keys[pygame.K_LEFT]:
+                self.transformation = translate(self.transformation, -self.key_sensitivity, 0, 0)
 
-        self.projection.load()
-        lookat_mat = self.transformation
-        lookat = Uniform("mat4", lookat_mat)
-        lookat.find_variable(self.program_id, "view_mat")
-        lookat.load()
\ No newline at end of file
+            self.load()
+
+    def load(self):
+        if self.uses_block:
+            # Una sola subida por frame para todos los programas que usan el bloque
+            self.block.set("projection_mat", self.projection_mat)
+            self.block.set("view_mat", self.transformation)
+            self.block.set("view_pos", self.transformation[:3, 3])
+            if self.light_position is not None:
+                self.block.set("light_pos", self.light_position)
+            self.block.load()
+        else:
+            self.projection.load()
+            self.view.data = self.transformation
+            self.view.load()
\ No newline at end of file
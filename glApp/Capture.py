@@ -0,0 +1,164 @@
+"""Captura de frames sin bloquear el render: glReadPixels a un anillo de PBOs y codificación en hilos.
+
+El frame k se lee a un PBO con una fence; el del frame k - delay se mapea (ya listo, sin esperar a la GPU)
+y la vista NumPy de la memoria mapeada pasa directamente al escritor en un ThreadPoolExecutor.
+El PBO se desmapea en el hilo de GL cuando el escritor terminó y hace falta reutilizarlo.
+"""
+import ctypes
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from OpenGL.GL import *
+
+# Espera máxima (ns) a la fence de un frame ya entregado a la GPU
+FENCE_TIMEOUT = 5 * 10 ** 9
+
+
+def flip_rows(pixels):
+    """glReadPixels devuelve la fila inferior primero: vista con la superior primero (sin copia)"""
+    return pixels[::-1]
+
+
+def encode_png(pixels, level=1):
+    """PNG RGBA de 8 bits con filtro Up; zlib libera el GIL, así que varios hilos codifican a la vez"""
+    height, width, _ = pixels.shape
+    rows = flip_rows(pixels).reshape(height, width * 4)
+    filtered = np.empty((height, width * 4 + 1), np.uint8)
+    filtered[:, 0] = 2
+    filtered[0, 1:] = rows[0]
+    np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(filtered, level)) + chunk(b"IEND", b""))
+
+
+class Png_Writer():
+    """Un PNG por frame en una carpeta"""
+    def __init__(self, folder, level=1):
+        self.folder = folder
+        self.level = level
+        os.makedirs(folder, exist_ok=True)
+
+    def write(self, index, pixels):
+        with open(os.path.join(self.folder, f"frame_{index:05d}.png"), "wb") as file:
+            file.write(encode_png(pixels, self.level))
+
+    def close(self):
+        pass
+
+
+class Raw_Writer():
+    """Un archivo .rgba por frame con los bytes tal cual salen de GL (fila inferior primero)"""
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def write(self, index, pixels):
+        with open(os.path.join(self.folder, f"frame_{index:05d}.rgba"), "wb") as file:
+            file.write(pixels.data)
+
+    def close(self):
+        pass
+
+
+class Video_File():
+    """Vídeo RAW rgba mapeado en memoria: (frames, alto, ancho, 4), fila superior primero.
+
+    Se abre con ffmpeg -f rawvideo -pix_fmt rgba -s ANCHOxALTO; el tamaño queda también en un .json al lado.
+    """
+    def __init__(self, path, width, height, frames):
+        self.path = path
+        self.frames = np.memmap(path, np.uint8, "w+", shape=(frames, height, width, 4))
+        with open(path + ".json", "w") as file:
+            json.dump({"width": width, "height": height, "frames": frames, "pix_fmt": "rgba"}, file)
+
+    def write(self, index, pixels):
+        # Un frame de más significa que se reservaron menos de los que se capturan: el vídeo saldría cortado
+        if index >= len(self.frames):
+            raise IndexError(f"{self.path}: frame {index} fuera del vídeo de {len(self.frames)} frames")
+        np.copyto(self.frames[index], flip_rows(pixels))
+
+    def close(self):
+        self.frames.flush()
+
+
+class Frame_Capture():
+    """Anillo de ring PBOs leídos con delay frames de retraso; workers hilos ejecutan writer.write(frame, píxeles).
+
+    capture() se llama tras dibujar cada frame, con el framebuffer a leer enlazado; finish() vacía el anillo.
+    """
+    def __init__(self, width, height, writer, ring=4, delay=1, workers=2):
+        if not 0 < delay < ring:
+            raise ValueError("delay debe estar entre 1 y ring - 1")
+        self.width = width
+        self.height = height
+        self.writer = writer
+        self.delay = delay
+        self.size = width * height * 4
+        self.buffers = glGenBuffers(ring) if ring > 1 else [glGenBuffers(1)]
+        for buffer in self.buffers:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.size, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        # Por ranura: (frame, fence) pendiente de mapear y el Future del escritor mientras está mapeada
+        self.pending = [None] * ring
+        self.mapped = [None] * ring
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="capture")
+        self.frame = 0
+        self.captured = 0
+
+    def capture(self):
+        slot = self.frame % len(self.buffers)
+        self.release(slot)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+        glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        self.pending[slot] = (self.frame, glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0))
+        if self.frame >= self.delay:
+            self.dispatch((self.frame - self.delay) % len(self.buffers))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.frame += 1
+
+    def dispatch(self, slot):
+        frame, fence = self.pending[slot]
+        self.pending[slot] = None
+        glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, FENCE_TIMEOUT)
+        glDeleteSync(fence)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+        address = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self.size, GL_MAP_READ_BIT)
+        # Vista directa sobre la memoria del PBO: el escritor la lee sin copiarla a Python
+        pixels = np.frombuffer((ctypes.c_ubyte * self.size).from_address(address), np.uint8)
+        pixels = pixels.reshape(self.height, self.width, 4)
+        self.mapped[slot] = self.pool.submit(self.writer.write, frame, pixels)
+
+    def release(self, slot):
+        if self.pending[slot] is not None:
+            self.dispatch(slot)
+        if self.mapped[slot] is not None:
+            future, self.mapped[slot] = self.mapped[slot], None
+            # Los errores del escritor se propagan aquí, en el hilo de GL
+            try:
+                future.result()
+            finally:
+                glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+                glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+            self.captured += 1
+
+    def finish(self):
+        """Mapea, escribe y desmapea todos los frames pendientes; devuelve el número de frames capturados"""
+        ring = len(self.buffers)
+        for frame in range(self.frame - self.delay, self.frame):
+            if frame >= 0 and self.pending[frame % ring] is not None:
+                self.dispatch(frame % ring)
+        for slot in range(ring):
+            self.release(slot)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pool.shutdown()
+        self.writer.close()
+        return self.captured
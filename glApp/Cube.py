@@ -68,4 +68,4 @@ class Cube(Mesh):
                   0.43566603, 0.11929511, 0.67476846,
                   0.96745204, 0.3360623,  0.04449883]
         vertices = format_vertices(coordinates, triangles)
-        super().__init__(program_id, vertices, colors, GL_TRIANGLES, location)
\ No newline at end of file
+        super().__init__(program_id, vertices, None, None, colors, GL_TRIANGLES, location)
\ No newline at end of file
@@ -0,0 +1,122 @@
+import numpy as np
+
+from .Profiler import profiler
+
+
+class Bounds():
+    """Caja alineada a los ejes y esfera envolvente en coordenadas locales del objeto"""
+    def __init__(self, box_min, box_max, center, radius):
+        self.box_min = np.asarray(box_min, np.float32)
+        self.box_max = np.asarray(box_max, np.float32)
+        self.center = np.asarray(center, np.float32)
+        self.radius = float(radius)
+
+    @classmethod
+    def from_vertices(cls, vertices):
+        vertices = np.asarray(vertices, np.float32).reshape(-1, 3)
+        # Malla sin caras (p. ej. un OBJ solo con vértices): caja degenerada en el origen
+        if not len(vertices):
+            return cls.from_sphere(0.0)
+        box_min = vertices.min(axis=0)
+        box_max = vertices.max(axis=0)
+        center = (box_min + box_max) / 2
+        radius = np.sqrt(((vertices - center) ** 2).sum(axis=1).max())
+        return cls(box_min, box_max, center, radius)
+
+    @classmethod
+    def from_sphere(cls, radius, center=(0, 0, 0)):
+        center = np.asarray(center, np.float32)
+        return cls(center - radius, center + radius, center, radius)
+
+
+EMPTY_BOUNDS = Bounds.from_sphere(0.0)
+
+
+class Bounds_Array():
+    """Los Bounds de una lista de objetos apilados para probarlos todos a la vez; sin bounds = siempre visible"""
+    def __init__(self, bounds):
+        self.unbounded = np.array([item is None for item in bounds], bool).reshape(-1)
+        bounds = [EMPTY_BOUNDS if item is None else item for item in bounds]
+        self.box_min = np.array([item.box_min for item in bounds], np.float32).reshape(-1, 3)
+        self.box_max = np.array([item.box_max for item in bounds], np.float32).reshape(-1, 3)
+        self.centers = np.array([item.center for item in bounds], np.float32).reshape(-1, 3)
+        self.radii = np.array([item.radius for item in bounds], np.float32).reshape(-1)
+        self.box_centers = (self.box_min + self.box_max) / 2
+        self.box_extents = (self.box_max - self.box_min) / 2
+
+    def __len__(self):
+        return len(self.radii)
+
+
+def frustum_planes(projection_mat, view_mat):
+    """Seis planos (a, b, c, d) normalizados, hacia dentro, de la matriz proyección @ vista (fila-mayor)"""
+    clip = np.asarray(projection_mat, np.float64) @ np.asarray(view_mat, np.float64)
+    rows = clip[:3]
+    planes = np.concatenate([clip[3] + rows, clip[3] - rows])  # izquierda, abajo, cerca, derecha, arriba, lejos
+    planes /= np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes.astype(np.float32)
+
+
+def world_boxes(model_mats, bounds):
+    """Cajas alineadas a los ejes de mundo (centro, semiejes) que contienen las cajas locales transformadas"""
+    rotation = model_mats[:, :3, :3]
+    centers = np.einsum("nij,nj->ni", rotation, bounds.box_centers) + model_mats[:, :3, 3]
+    extents = np.einsum("nij,nj->ni", np.abs(rotation), bounds.box_extents)
+    return centers, extents
+
+
+def visible_mask(planes, model_mats, bounds):
+    """Prueba en una pasada la esfera y la caja (llevadas a mundo con cada matriz) contra los seis planos"""
+    rotation = model_mats[:, :3, :3]
+    translation = model_mats[:, :3, 3]
+    normals = planes[:, :3]
+
+    centers = np.einsum("nij,nj->ni", rotation, bounds.centers) + translation
+    # Con escala no uniforme el radio crece con la columna de mayor norma
+    radii = bounds.radii * np.sqrt((rotation ** 2).sum(axis=1).max(axis=1))
+    sphere_outside = (centers @ normals.T + planes[:, 3] < -radii[:, None]).any(axis=1)
+
+    box_centers, box_extents = world_boxes(model_mats, bounds)
+    box_outside = (box_centers @ normals.T + planes[:, 3] < -(box_extents @ np.abs(normals).T)).any(axis=1)
+
+    return ~(sphere_outside | box_outside) | bounds.unbounded
+
+
+class Frustum_Culler():
+    """Descarta en CPU los objetos fuera del frustum de la cámara antes de cualquier llamada GL.
+
+    tested, culled y drawn cuentan los objetos del último frame (se ponen a cero en update()).
+    """
+    def __init__(self, camera=None):
+        self.camera = camera
+        self.planes = None
+        self.tested = 0
+        self.culled = 0
+        self.drawn = 0
+
+    def update(self, camera=None):
+        """Extrae los planos de la proyección y la vista actuales; una vez por frame"""
+        camera = self.camera if camera is None else camera
+        self.planes = frustum_planes(camera.projection_mat, camera.transformation)
+        self.tested = self.culled = self.drawn = 0
+
+    def test(self, model_mats, bounds):
+        if self.planes is None:
+            self.update()
+        mask = visible_mask(self.planes, np.asarray(model_mats, np.float32).reshape(-1, 4, 4), bounds)
+        self.count(len(mask), int(mask.sum()))
+        return mask
+
+    def count(self, tested, visible):
+        self.tested += tested
+        self.culled += tested - visible
+        self.drawn += visible
+
+    def draw(self, objects):
+        """Dibuja los objetos visibles de una lista (Mesh, LoadMesh, esferas...)"""
+        model_mats = np.array([item.model_matrix() for item in objects], np.float32)
+        mask = self.test(model_mats, Bounds_Array([getattr(item, "bounds", None) for item in objects]))
+        for item, model_mat, visible in zip(objects, model_mats, mask):
+            if visible:
+                with profiler.draw_span(item):
+                    item.render(model_mat)
@@ -0,0 +1,64 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Componentes por vértice de cada distribución intercalada: p = posición, n = normal, t = uv
+LAYOUT_SIZES = {"p": 3, "n": 3, "t": 2}
+
+
+def grid_indices(u_segments, v_segments):
+    """Índices de dos triángulos por celda de una rejilla de (v_segments+1) x (u_segments+1) vértices"""
+    row = u_segments + 1
+    first = (np.arange(v_segments)[:, None] * row + np.arange(u_segments)[None, :]).astype(np.uint32)
+    second = first + row
+    cells = np.stack([first, second, first + 1, second, second + 1, first + 1], axis=-1)
+    return cells.ravel()
+
+
+def parametric_surface(surface, u_segments, v_segments, layout="pnt"):
+    """Evalúa surface(u, v) -> (posiciones, normales) sobre la rejilla u, v en [0, 1].
+
+    Devuelve (vertex_data, index_data): float32 intercalado según layout y uint32 para glDrawElements.
+    """
+    u = np.arange(u_segments + 1) / u_segments
+    v = np.arange(v_segments + 1) / v_segments
+    u_grid, v_grid = np.meshgrid(u, v)
+    positions, normals = surface(u_grid, v_grid)
+    channels = {"p": positions,
+                "n": normals,
+                "t": np.stack([u_grid, 1.0 - v_grid], axis=-1)}
+
+    floats = sum(LAYOUT_SIZES[key] for key in layout)
+    vertex_data = np.empty((v_segments + 1, u_segments + 1, floats), np.float32)
+    offset = 0
+    for key in layout:
+        size = LAYOUT_SIZES[key]
+        vertex_data[..., offset:offset + size] = channels[key]
+        offset += size
+    return vertex_data.reshape(-1), grid_indices(u_segments, v_segments)
+
+
+def sphere_surface(radius):
+    def surface(u, v):
+        theta = u * 2 * np.pi
+        phi = v * np.pi
+        normals = np.stack([np.sin(phi) * np.cos(theta),
+                            np.cos(phi),
+                            np.sin(phi) * np.sin(theta)], axis=-1)
+        return radius * normals, normals
+    return surface
+
+
+def sphere_geometry(radius=1.0, slices=128, stacks=64, layout="pn", cached=True):
+    """Esfera UV como (vertex_data, index_data); con cached=True los arrays se comparten y son de solo lectura"""
+    if cached:
+        return _cached_sphere(float(radius), int(slices), int(stacks), layout)
+    return parametric_surface(sphere_surface(radius), slices, stacks, layout)
+
+
+@lru_cache(maxsize=32)
+def _cached_sphere(radius, slices, stacks, layout):
+    vertex_data, index_data = parametric_surface(sphere_surface(radius), slices, stacks, layout)
+    vertex_data.setflags(write=False)
+    index_data.setflags(write=False)
+    return vertex_data, index_data
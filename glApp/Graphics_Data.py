@@ -1,5 +1,6 @@
 from OpenGL.GL import *
 import numpy as np
+from .Utils import attribute_location
 
 class Graphics_Data():
     def __init__(self, data_type, data):
@@ -9,14 +10,57 @@ class Graphics_Data():
         self.load()
 
     def load(self):
-        data = np.array(self.data, np.float32)
+        # Sin copia si ya es float32 contiguo (p. ej. un array mapeado desde la caché)
+        data = np.ascontiguousarray(self.data, np.float32)
         glBindBuffer(GL_ARRAY_BUFFER, self.buffer_ref)
         glBufferData(GL_ARRAY_BUFFER, data.ravel(), GL_STATIC_DRAW)
 
     def create_variable(self, program_id, variable_name):
-        variable_id = glGetAttribLocation(program_id, variable_name)
+        variable_id = attribute_location(program_id, variable_name)
         glBindBuffer(GL_ARRAY_BUFFER, self.buffer_ref)
         if self.data_type == "vec3":
             glVertexAttribPointer(variable_id, 3, GL_FLOAT, False, 0, None)
 
-        glEnableVertexAttribArray(variable_id)
\ No newline at end of file
+        glEnableVertexAttribArray(variable_id)
+
+
+class Vertex_Format():
+    """Distribución intercalada de atributos float32: [(nombre, componentes), ...]"""
+    def __init__(self, attributes):
+        self.attributes = []
+        offset = 0
+        for name, size in attributes:
+            self.attributes.append((name, size, offset))
+            offset += size
+        self.floats = offset
+        self.stride = offset * 4
+
+    def pack(self, arrays):
+        """Intercala los arrays (uno por atributo, en orden) en un único bloque contiguo float32"""
+        count = len(arrays[0])
+        data = np.empty((count, self.floats), np.float32)
+        for (name, size, offset), array in zip(self.attributes, arrays):
+            data[:, offset:offset + size] = np.asarray(array, np.float32).reshape(count, size)
+        return data
+
+
+class Interleaved_Data():
+    def __init__(self, vertex_format, arrays):
+        self.vertex_format = vertex_format
+        self.data = vertex_format.pack(arrays)
+        self.buffer_ref = glGenBuffers(1)
+        self.load()
+
+    def load(self):
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_ref)
+        glBufferData(GL_ARRAY_BUFFER, self.data.nbytes, self.data, GL_STATIC_DRAW)
+
+    def create_variables(self, program_id):
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_ref)
+        stride = self.vertex_format.stride
+        for name, size, offset in self.vertex_format.attributes:
+            variable_id = attribute_location(program_id, name)
+            if variable_id == -1:
+                continue
+            glVertexAttribPointer(variable_id, size, GL_FLOAT, False, stride, ctypes.c_void_p(offset * 4))
+            glEnableVertexAttribArray(variable_id)
@@ -0,0 +1,187 @@
+"""Modo sin ventana para PyOGApp: contexto EGL (Mesa llvmpipe funciona sin GPU) y display() sobre un FBO.
+
+Sin límite de 60 fps y con un número fijo de frames; al terminar imprime (y opcionalmente guarda en JSON)
+los tiempos por frame. Con --output captura cada frame sin bloquear (glApp/Capture.py): una carpeta de PNG
+o, si la ruta termina en .rgba, un vídeo RAW mapeado en memoria.
+
+Uso: python -m glApp.Headless main.py [--frames N] [--output carpeta] [--report informe.json]
+"""
+from . import HEADLESS_ENV, use_egl
+
+use_egl()
+
+import argparse
+import ctypes
+import json
+import os
+import runpy
+import sys
+import time
+
+import numpy as np
+import pygame
+from OpenGL import EGL
+from OpenGL.GL import *
+
+from .Capture import Frame_Capture, Png_Writer, Video_File
+from .Profiler import profiler, PROFILE_ENV
+from .AssetManager import asset_manager
+
+OUTPUT_ENV = "GLAPP_OUTPUT"
+REPORT_ENV = "GLAPP_REPORT"
+DEFAULT_FRAMES = 300
+
+
+def _attributes(values):
+    values = list(values) + [EGL.EGL_NONE]
+    return (EGL.EGLint * len(values))(*values)
+
+
+def create_context(width=1000, height=800):
+    """Contexto OpenGL 3.3 core con una superficie pbuffer de width x height como framebuffer por defecto"""
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    major, minor = EGL.EGLint(), EGL.EGLint()
+    EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor))
+    config = EGL.EGLConfig()
+    count = EGL.EGLint()
+    EGL.eglChooseConfig(display, _attributes([EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                                              EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+                                              EGL.EGL_DEPTH_SIZE, 24]),
+                        ctypes.pointer(config), 1, ctypes.pointer(count))
+    if count.value == 0:
+        raise RuntimeError("No hay configuración EGL compatible")
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT,
+                                   _attributes([EGL.EGL_CONTEXT_MAJOR_VERSION, 3,
+                                                EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+                                                EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK,
+                                                EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT]))
+    surface = EGL.eglCreatePbufferSurface(display, config, _attributes([EGL.EGL_WIDTH, width,
+                                                                        EGL.EGL_HEIGHT, height]))
+    EGL.eglMakeCurrent(display, surface, surface, context)
+    return display
+
+
+class Offscreen_Target():
+    """FBO con color RGBA8 y profundidad de 24 bits donde se dibuja en lugar de la ventana"""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.fbo = glGenFramebuffers(1)
+        self.color, self.depth = glGenRenderbuffers(2)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("El framebuffer sin ventana está incompleto")
+        self.bind()
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def read(self):
+        """Píxeles RGBA (alto, ancho, 4) con la fila superior primero"""
+        glReadBuffer(GL_COLOR_ATTACHMENT0)
+        pixels = glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE)
+        return np.frombuffer(pixels, np.uint8).reshape(self.height, self.width, 4)[::-1]
+
+
+def _statistics(seconds):
+    milliseconds = np.asarray(seconds) * 1000
+    return {"mean": float(milliseconds.mean()), "p50": float(np.percentile(milliseconds, 50)),
+            "p95": float(np.percentile(milliseconds, 95)), "max": float(milliseconds.max())}
+
+
+class Headless_Session():
+    """Contexto, FBO y bucle de frames de una aplicación en modo sin ventana; se configura con variables de entorno"""
+    def __init__(self, width, height, frames=None, output=None, report=None):
+        self.width = width
+        self.height = height
+        self.frames = int(os.environ.get(HEADLESS_ENV, DEFAULT_FRAMES)) if frames is None else frames
+        self.output = os.environ.get(OUTPUT_ENV) if output is None else output
+        self.report_path = os.environ.get(REPORT_ENV) if report is None else report
+        # SDL sin vídeo: pygame.time, eventos y ratón siguen funcionando. Camera.update() solo sube
+        # la cámara con el ratón oculto; sin ventana el ratón no se mueve y la cámara queda fija
+        pygame.display.set_mode((1, 1))
+        pygame.mouse.set_visible(False)
+        self.display = create_context(width, height)
+        self.target = Offscreen_Target(width, height)
+
+    def run(self, app):
+        start = time.perf_counter()
+        app.initialise()
+        startup = time.perf_counter() - start
+        self.target.bind()
+        capture = None
+        if self.output:
+            writer = (Video_File(self.output, self.width, self.height, self.frames) if self.output.endswith(".rgba")
+                      else Png_Writer(self.output))
+            capture = Frame_Capture(self.width, self.height, writer)
+        submit_times, frame_times = [], []
+        for _ in range(self.frames):
+            pygame.event.pump()
+            start = time.perf_counter()
+            with profiler.span("assets"):
+                asset_manager.update()
+            with profiler.span("camera_init"):
+                app.camera_init()
+            with profiler.span("display", gpu=not profiler.gpu_draws):
+                app.display()
+            submitted = time.perf_counter()
+            glFinish()
+            profiler.end_frame()
+            submit_times.append(submitted - start)
+            frame_times.append(time.perf_counter() - start)
+            if capture is not None:
+                capture.capture()
+        if capture is not None:
+            capture.finish()
+        profile = profiler.finish(os.environ.get(PROFILE_ENV))
+        return self.report(app, startup, submit_times, frame_times, profile)
+
+    def report(self, app, startup, submit_times, frame_times, profile=None):
+        report = {"app": type(app).__name__,
+                  "renderer": glGetString(GL_RENDERER).decode(),
+                  "width": self.width,
+                  "height": self.height,
+                  "frames": len(frame_times),
+                  "startup_s": startup,
+                  "fps": len(frame_times) / sum(frame_times) if frame_times else 0.0,
+                  "cpu_ms": _statistics(submit_times) if submit_times else None,
+                  "frame_ms": _statistics(frame_times) if frame_times else None,
+                  "profile": profile}
+        if frame_times:
+            print(f"⏱️ {report['app']}: {report['frames']} frames a {self.width}x{self.height}, "
+                  f"{report['fps']:.1f} fps, frame {report['frame_ms']['mean']:.2f} ms "
+                  f"(p95 {report['frame_ms']['p95']:.2f} ms, CPU {report['cpu_ms']['mean']:.2f} ms)")
+        if self.report_path:
+            with open(self.report_path, "w") as file:
+                json.dump(report, file, indent=2)
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta una demo sin ventana sobre un FBO")
+    parser.add_argument("script", help="demo a ejecutar, p. ej. main.py")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--output", help="carpeta donde guardar cada frame como PNG, o vídeo .rgba")
+    parser.add_argument("--report", help="archivo JSON con los tiempos por frame")
+    args = parser.parse_args(argv)
+    os.environ[HEADLESS_ENV] = str(args.frames)
+    if args.output:
+        os.environ[OUTPUT_ENV] = args.output
+    if args.report:
+        os.environ[REPORT_ENV] = args.report
+    # La demo se ejecuta como si se lanzara directamente: python main.py
+    sys.argv = [args.script]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    runpy.run_path(args.script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from OpenGL.GL import *
+import numpy as np
+from .Utils import attribute_location
+from .RenderQueue import render_state
+
+# Por instancia: mat4 del modelo (16 floats, por columnas como espera GLSL) + color rgba (4 floats)
+INSTANCE_FLOATS = 20
+
+
+class InstancedMesh():
+    """Dibuja muchas copias de una malla (Mesh, LoadMesh o esferas) con una sola llamada instanciada.
+
+    Las matrices viven en un array NumPy compartido con el buffer de instancias; las
+    actualizaciones masivas marcan rangos sucios y draw() sube solo esos rangos.
+    El VAO de la malla se reutiliza, así que la malla queda dedicada a este uso.
+    """
+    def __init__(self, mesh, program_id, capacity,
+                 matrix_attribute="instance_model_mat", color_attribute="instance_color"):
+        self.mesh = mesh
+        self.program_id = program_id
+        self.capacity = capacity
+        self.count = capacity
+        self.instance_data = np.zeros((capacity, INSTANCE_FLOATS), np.float32)
+        # Vista (N, 4, 4) con la convención fila-mayor del resto del proyecto sobre el almacenamiento por columnas
+        self.model_mats = self.instance_data[:, :16].reshape(capacity, 4, 4).transpose(0, 2, 1)
+        self.colors = self.instance_data[:, 16:20]
+        self.model_mats[:] = np.identity(4, dtype=np.float32)
+        self.colors[:] = 1.0
+        self.dirty = []
+
+        self.vao, self.draw_type, self.element_count, self.index_type = self.mesh_draw_info(mesh)
+        self.buffer_ref = glGenBuffers(1)
+        render_state.bind_vertex_array(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_ref)
+        glBufferData(GL_ARRAY_BUFFER, self.instance_data.nbytes, self.instance_data, GL_DYNAMIC_DRAW)
+        stride = INSTANCE_FLOATS * 4
+        matrix_location = attribute_location(program_id, matrix_attribute)
+        if matrix_location != -1:
+            # Un mat4 ocupa cuatro ubicaciones consecutivas, una por columna
+            for column in range(4):
+                glVertexAttribPointer(matrix_location + column, 4, GL_FLOAT, False, stride,
+                                      ctypes.c_void_p(column * 16))
+                glEnableVertexAttribArray(matrix_location + column)
+                glVertexAttribDivisor(matrix_location + column, 1)
+        color_location = attribute_location(program_id, color_attribute)
+        if color_location != -1:
+            glVertexAttribPointer(color_location, 4, GL_FLOAT, False, stride, ctypes.c_void_p(64))
+            glEnableVertexAttribArray(color_location)
+            glVertexAttribDivisor(color_location, 1)
+        render_state.bind_vertex_array(0)
+
+    @staticmethod
+    def mesh_draw_info(mesh):
+        # Mesh/LoadMesh: vao_ref (+ EBO opcional); Sphere/WaterSphere/MatteSphere: vao + EBO uint32
+        if hasattr(mesh, "vao_ref"):
+            if getattr(mesh, "indices", None) is not None:
+                return mesh.vao_ref, mesh.draw_type, len(mesh.indices), mesh.index_type
+            return mesh.vao_ref, mesh.draw_type, len(mesh.vertices), None
+        return mesh.vao, GL_TRIANGLES, mesh.vertex_count, GL_UNSIGNED_INT
+
+    def mark_dirty(self, start=0, stop=None):
+        stop = self.capacity if stop is None else stop
+        if start < stop:
+            self.dirty.append((start, stop))
+
+    def set_transforms(self, matrices, start=0):
+        matrices = np.asarray(matrices, np.float32).reshape(-1, 4, 4)
+        self.model_mats[start:start + len(matrices)] = matrices
+        self.mark_dirty(start, start + len(matrices))
+
+    def set_positions(self, positions, start=0):
+        # Solo la traslación: columna 3 de cada matriz
+        positions = np.asarray(positions, np.float32).reshape(-1, 3)
+        self.model_mats[start:start + len(positions), :3, 3] = positions
+        self.mark_dirty(start, start + len(positions))
+
+    def translate(self, offsets, start=0, stop=None):
+        stop = self.capacity if stop is None else stop
+        # M @ T(d): la traslación local se suma rotada y escalada por la parte 3x3
+        offsets = np.broadcast_to(np.asarray(offsets, np.float32), (stop - start, 3))
+        self.model_mats[start:stop, :3, 3] += np.einsum("nij,nj->ni", self.model_mats[start:stop, :3, :3], offsets)
+        self.mark_dirty(start, stop)
+
+    def transform(self, matrix, start=0, stop=None, local=True):
+        """Compone una matriz (o una por instancia) con todas las instancias del rango"""
+        stop = self.capacity if stop is None else stop
+        current = self.model_mats[start:stop]
+        matrix = np.asarray(matrix, np.float32)
+        current[:] = current @ matrix if local else matrix @ current
+        self.mark_dirty(start, stop)
+
+    def set_colors(self, colors, start=0):
+        colors = np.asarray(colors, np.float32)
+        colors = colors.reshape(-1, colors.shape[-1])
+        self.colors[start:start + len(colors), :colors.shape[1]] = colors
+        self.mark_dirty(start, start + len(colors))
+
+    def upload(self):
+        if not self.dirty:
+            return
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_ref)
+        row_bytes = INSTANCE_FLOATS * 4
+        # Fusionar rangos solapados o contiguos y subir cada uno con glBufferSubData
+        ranges = sorted(self.dirty)
+        start, stop = ranges[0]
+        for next_start, next_stop in ranges[1:] + [(self.capacity + 1, 0)]:
+            if next_start <= stop:
+                stop = max(stop, next_stop)
+                continue
+            glBufferSubData(GL_ARRAY_BUFFER, start * row_bytes, (stop - start) * row_bytes,
+                            self.instance_data[start:stop])
+            start, stop = next_start, next_stop
+        self.dirty = []
+
+    def draw(self):
+        self.upload()
+        render_state.bind_vertex_array(self.vao)
+        if self.index_type is None:
+            glDrawArraysInstanced(self.draw_type, 0, self.element_count, self.count)
+        else:
+            glDrawElementsInstanced(self.draw_type, self.element_count, self.index_type, None, self.count)
@@ -0,0 +1,70 @@
+from math import pi
+
+import numpy as np
+
+from .Geometry import sphere_geometry, LAYOUT_SIZES
+
+
+class LOD_Level():
+    def __init__(self, slices, stacks, index_count, index_offset):
+        self.slices = slices
+        self.stacks = stacks
+        self.index_count = index_count
+        self.index_offset = index_offset  # en bytes dentro del EBO
+        self.triangles = index_count // 3
+
+
+def sphere_lod_chain(radius, slices, stacks, layout="pn", min_slices=8):
+    """Cadena de teselaciones (de la más fina a la más gruesa) en un solo VBO/EBO.
+
+    Los índices de cada nivel ya están desplazados, así que cada nivel se dibuja con
+    glDrawElements usando su propio offset dentro del EBO.
+    """
+    floats = sum(LAYOUT_SIZES[key] for key in layout)
+    vertex_blocks = []
+    index_blocks = []
+    levels = []
+    base_vertex = 0
+    index_offset = 0
+    while True:
+        vertex_data, index_data = sphere_geometry(radius, slices, stacks, layout)
+        vertex_blocks.append(vertex_data)
+        index_blocks.append(index_data + np.uint32(base_vertex))
+        levels.append(LOD_Level(slices, stacks, len(index_data), index_offset))
+        base_vertex += len(vertex_data) // floats
+        index_offset += index_data.nbytes
+        if slices // 2 < min_slices or stacks // 2 < 2:
+            break
+        slices //= 2
+        stacks //= 2
+    return np.concatenate(vertex_blocks), np.concatenate(index_blocks), levels
+
+
+class LOD_Selector():
+    """Elige el nivel según el radio proyectado en píxeles, con histéresis para evitar parpadeo"""
+    def __init__(self, levels, max_edge_pixels=8.0, hysteresis=0.25):
+        self.levels = levels
+        self.max_edge_pixels = max_edge_pixels
+        self.hysteresis = hysteresis
+        self.current = None
+
+    def ideal(self, required_slices):
+        # Nivel más grueso que todavía alcanza la densidad pedida
+        for index in range(len(self.levels) - 1, -1, -1):
+            if self.levels[index].slices >= required_slices:
+                return index
+        return 0
+
+    def select(self, pixel_radius):
+        # Aristas de ecuador de ~max_edge_pixels: slices ≈ 2πR / arista
+        required = 2 * pi * pixel_radius / self.max_edge_pixels
+        if self.current is None:
+            self.current = self.ideal(required)
+        else:
+            current = self.levels[self.current]
+            coarser = self.levels[min(self.current + 1, len(self.levels) - 1)]
+            if required > current.slices * (1 + self.hysteresis):
+                self.current = self.ideal(required)
+            elif coarser is not current and required < coarser.slices * (1 - self.hysteresis):
+                self.current = self.ideal(required / (1 - self.hysteresis))
+        return self.levels[self.current]
@@ -4,8 +4,28 @@ import numpy as np
 import pygame
 import random
 from .Utils import *
+from .ObjParser import parse_obj
+from .MeshCache import load_mesh, load_indexed_mesh
 
 
+def mesh_layout(program_id):
+    """Atributos opcionales que lee el programa ("p" + n normal + t uv): solo esos se sueldan"""
+    return ("p" + ("n" if attribute_location(program_id, "vertex_normal") != -1 else "")
+            + ("t" if attribute_location(program_id, "vertex_uv") != -1 else ""))
+
+
+def load_mesh_data(filename, use_cache=True, indexed=True, workers=1, layout="pnt", optimize=True, overdraw=False):
+    """Parte de LoadMesh que no toca GL: (vertices, normals, uvs, indices) listos para Mesh.
+
+    En modo indexado los atributos que no están en layout valen None.
+    """
+    if not indexed:
+        vertices, vertex_normals, vertex_uvs = load_mesh(filename, use_cache, workers)
+        return vertices, vertex_normals, vertex_uvs, None
+    *attributes, indices = load_indexed_mesh(filename, layout, use_cache, workers, optimize, overdraw)
+    channels = dict(zip(layout, attributes))
+    return channels["p"], channels.get("n"), channels.get("t"), indices
+
 
 class LoadMesh(Mesh):
     def __init__(self, filename, program_id, draw_type=GL_TRIANGLES,
@@ -14,52 +34,24 @@ class LoadMesh(Mesh):
                  scale=pygame.Vector3(1, 1, 1),
                  move_rotation=Rotation(0, pygame.Vector3(0, 1, 0)),
                  move_translate=pygame.Vector3(0, 0, 0),
-                 move_scale=pygame.Vector3(1, 1, 1)
+                 move_scale=pygame.Vector3(1, 1, 1),
+                 use_cache=True,
+                 indexed=True,
+                 workers=1,
+                 optimize=True,
+                 overdraw=False
                  ):
-        coordinates, triangles, uvs, uvs_ind, normals, normal_ind = self.load_drawing(filename)
-        vertices = format_vertices(coordinates, triangles)
-        vertex_normals = format_vertices(normals, normal_ind)
-        vertex_uvs = format_vertices(uvs, uvs_ind)
-        colors = []
-        for i in range(len(vertices)):
-            colors.append(1)
-            colors.append(1)
-            colors.append(1)
+        # workers > 1 (o None para archivos grandes) reparte el parseo del OBJ entre procesos;
+        # optimize reordena triángulos y vértices para la caché de vértices (overdraw: clusters exteriores primero)
+        vertices, vertex_normals, vertex_uvs, indices = load_mesh_data(filename, use_cache, indexed, workers,
+                                                                       mesh_layout(program_id), optimize, overdraw)
+        colors = np.ones_like(vertices)
         super().__init__(program_id, vertices, vertex_normals, vertex_uvs, colors, draw_type, location, rotation, scale,
                          move_rotation=move_rotation,
                          move_translate=move_translate,
-                         move_scale=move_scale)
+                         move_scale=move_scale,
+                         indices=indices)
 
     def load_drawing(self, filename):
-        vertices = []
-        triangles = []
-        normals = []
-        normal_ind = []
-        uvs = []
-        uvs_ind = []
-        with open(filename) as fp:
-            line = fp.readline()
-            while line:
-                if line[:2] == "v ":
-                    vx, vy, vz = [float(value) for value in line[2:].split()]
-                    vertices.append((vx, vy, vz))
-                if line[:2] == "vn":
-                    vx, vy, vz = [float(value) for value in line[3:].split()]
-                    normals.append((vx, vy, vz))
-                if line[:2] == "vt":
-                    vx, vy = [float(value) for value in line[3:].split()]
-                    uvs.append((vx, vy))
-                if line[:2] == "f ":
-                    t1, t2, t3 = [value for value in line[2:].split()]
-                    triangles.append([int(value) for value in t1.split('/')][0]-1)
-                    triangles.append([int(value) for value in t2.split('/')][0]-1)
-                    triangles.append([int(value) for value in t3.split('/')][0]-1)
-                    uvs_ind.append([int(value) for value in t1.split('/')][1] - 1)
-                    uvs_ind.append([int(value) for value in t2.split('/')][1] - 1)
-                    uvs_ind.append([int(value) for value in t3.split('/')][1] - 1)
-                    normal_ind.append([int(value) for value in t1.split('/')][2] - 1)
-                    normal_ind.append([int(value) for value in t2.split('/')][2] - 1)
-                    normal_ind.append([int(value) for value in t3.split('/')][2] - 1)
-                line = fp.readline()
-        return vertices, triangles, uvs, uvs_ind, normals, normal_ind
+        return parse_obj(filename)
 
@@ -0,0 +1,236 @@
+import threading
+from math import cos, sin, sqrt, radians
+
+import numpy as np
+
+# Matemática 4x4 en float32, con la convención fila-mayor del proyecto (se suben con GL_TRUE).
+# Todas las operaciones aceptan pilas (..., 4, 4) y un parámetro out= para escribir sin reservar memoria.
+# Con una sola matriz y argumentos escalares se usa un camino rápido: la matriz elemental se escribe
+# en una matriz auxiliar por hilo (vía memoryview, sin pasar por NumPy) y se hace un único matmul.
+
+AXES = {"x": (1.0, 0.0, 0.0), "y": (0.0, 1.0, 0.0), "z": (0.0, 0.0, 1.0),
+        0: (1.0, 0.0, 0.0), 1: (0.0, 1.0, 0.0), 2: (0.0, 0.0, 1.0)}
+
+
+SCALARS = frozenset((int, float, np.float32, np.float64, np.int32, np.int64))
+
+
+def flat_view(matrix):
+    """Vista plana de floats sobre una matriz float32 contigua, para escribir elementos sin pasar por NumPy"""
+    return memoryview(matrix).cast("B").cast("f")
+
+
+def _scratch_matrix():
+    matrix = np.identity(4, dtype=np.float32)
+    return matrix, flat_view(matrix)
+
+
+class _Scratch(threading.local):
+    def __init__(self):
+        # (matriz, vista plana de floats) para cada tipo de matriz elemental
+        self.translation = _scratch_matrix()
+        self.scaling = _scratch_matrix()
+        self.rotation = _scratch_matrix()
+
+
+_scratch = _Scratch()
+
+
+class Rotation:
+    def __init__(self, angle, axis):
+        self.angle = angle
+        self.axis = axis
+
+
+def identity(count=None, out=None):
+    if out is None:
+        out = np.empty((4, 4) if count is None else (count, 4, 4), np.float32)
+    out[...] = 0.0
+    out[..., [0, 1, 2, 3], [0, 1, 2, 3]] = 1.0
+    return out
+
+
+def _output(out, shape):
+    return np.empty(shape, np.float32) if out is None else out
+
+
+def _vector3(x, y=None, z=None):
+    if y is None:
+        return np.asarray(x, np.float32)
+    return np.stack(np.broadcast_arrays(np.float32(x), np.float32(y), np.float32(z)), axis=-1)
+
+
+def axis_vector(axis):
+    """Eje como vector: 'x'/'y'/'z' (mayúsculas o minúsculas), 0/1/2, o cualquier secuencia de 3"""
+    if isinstance(axis, str):
+        return np.array(AXES[axis.lower()], np.float32)
+    if isinstance(axis, (int, np.integer)):
+        return np.array(AXES[int(axis)], np.float32)
+    return np.asarray(axis, np.float32)
+
+
+def multiply(a, b, out=None):
+    return np.matmul(a, b, out=out)
+
+
+def translate(matrix, x, y=None, z=None, out=None):
+    """matrix @ T(x, y, z) en forma cerrada: solo cambia la columna de traslación"""
+    if type(matrix) is np.ndarray and matrix.ndim == 2 and type(x) in SCALARS and type(y) in SCALARS \
+            and type(z) in SCALARS:
+        elemental, view = _scratch.translation
+        view[3], view[7], view[11] = x, y, z
+        return np.matmul(matrix, elemental, out=out)
+    offset = _vector3(x, y, z)
+    shift = np.einsum("...ij,...j->...i", matrix[..., :, :3], offset)
+    shape = np.broadcast_shapes(np.shape(matrix), shift.shape[:-1] + (4, 4))
+    out = _output(out, shape)
+    if out is not matrix:
+        out[...] = matrix
+    out[..., :, 3] += shift
+    return out
+
+
+def scale(matrix, x, y=None, z=None, out=None):
+    """matrix @ S(x, y, z) en forma cerrada: escala las tres primeras columnas; scale(m, s) es uniforme"""
+    if y is None and np.ndim(x) == np.ndim(matrix) - 2:
+        y = z = x
+    if type(matrix) is np.ndarray and matrix.ndim == 2 and type(x) in SCALARS and type(y) in SCALARS \
+            and type(z) in SCALARS:
+        elemental, view = _scratch.scaling
+        view[0], view[5], view[10] = x, y, z
+        return np.matmul(matrix, elemental, out=out)
+    factors = np.ones(np.shape(_vector3(x, y, z))[:-1] + (4,), np.float32)
+    factors[..., :3] = _vector3(x, y, z)
+    shape = np.broadcast_shapes(np.shape(matrix), factors.shape[:-1] + (4, 4))
+    return np.multiply(matrix, factors[..., None, :], out=_output(out, shape))
+
+
+def quaternion(angle, axis):
+    """Cuaternión unitario (x, y, z, w) para un ángulo en grados alrededor de un eje (o pila de ellos)"""
+    axis = axis_vector(axis)
+    norm = np.linalg.norm(axis, axis=-1, keepdims=True)
+    axis = axis / np.where(norm == 0.0, 1.0, norm)
+    half = np.radians(np.asarray(angle, np.float32)) / 2.0
+    shape = np.broadcast_shapes(axis.shape[:-1], np.shape(half))
+    q = np.empty(shape + (4,), np.float32)
+    q[..., :3] = axis * np.sin(half)[..., None]
+    q[..., 3] = np.cos(half)
+    # Eje nulo: rotación identidad
+    q[..., :3] *= (norm != 0.0)
+    q[..., 3] = np.where(norm[..., 0] != 0.0, q[..., 3], 1.0)
+    return q
+
+
+def quaternion_multiply(a, b, out=None):
+    ax, ay, az, aw = np.moveaxis(np.asarray(a, np.float32), -1, 0)
+    bx, by, bz, bw = np.moveaxis(np.asarray(b, np.float32), -1, 0)
+    out = _output(out, np.broadcast_shapes(np.shape(a), np.shape(b)))
+    x = aw * bx + ax * bw + ay * bz - az * by
+    y = aw * by - ax * bz + ay * bw + az * bx
+    z = aw * bz + ax * by - ay * bx + az * bw
+    out[..., 3] = aw * bw - ax * bx - ay * by - az * bz
+    out[..., 0], out[..., 1], out[..., 2] = x, y, z
+    return out
+
+
+def quaternion_normalize(q, out=None):
+    return np.divide(q, np.linalg.norm(q, axis=-1, keepdims=True), out=out)
+
+
+def quaternion_matrix(q, out=None):
+    """Matriz de rotación 4x4 de un cuaternión unitario (o pila de ellos)"""
+    q = np.asarray(q, np.float32)
+    out = identity(out=_output(out, q.shape[:-1] + (4, 4)))
+    rotation_3x3(q, out[..., :3, :3])
+    return out
+
+
+def rotation_3x3(q, out):
+    x, y, z, w = np.moveaxis(q, -1, 0)
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    out[..., 0, 0] = 1 - 2 * (yy + zz)
+    out[..., 0, 1] = 2 * (xy - wz)
+    out[..., 0, 2] = 2 * (xz + wy)
+    out[..., 1, 0] = 2 * (xy + wz)
+    out[..., 1, 1] = 1 - 2 * (xx + zz)
+    out[..., 1, 2] = 2 * (yz - wx)
+    out[..., 2, 0] = 2 * (xz - wy)
+    out[..., 2, 1] = 2 * (yz + wx)
+    out[..., 2, 2] = 1 - 2 * (xx + yy)
+    return out
+
+
+def rotation_matrix(angle, axis, out=None):
+    return quaternion_matrix(quaternion(angle, axis), out)
+
+
+def quaternion_values(angle, axis):
+    """quaternion() para un solo ángulo y eje, como tupla de floats de Python"""
+    if type(axis) is str:
+        axis = AXES[axis.lower()]
+    elif type(axis) is int:
+        axis = AXES[axis]
+    ax, ay, az = axis
+    norm = sqrt(ax * ax + ay * ay + az * az)
+    if not norm:
+        return 0.0, 0.0, 0.0, 1.0
+    half = radians(angle) / 2.0
+    factor = sin(half) / norm
+    return ax * factor, ay * factor, az * factor, cos(half)
+
+
+def multiply_quaternion_values(a, b):
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+            aw * bw - ax * bx - ay * by - az * bz)
+
+
+def compose_values(view, translation, orientation, scale_factors):
+    """compose() de una sola matriz escrita en una flat_view; cada argumento es una secuencia de floats"""
+    x, y, z, w = orientation
+    sx, sy, sz = scale_factors
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    view[0], view[1], view[2] = (1 - 2 * (yy + zz)) * sx, 2 * (xy - wz) * sy, 2 * (xz + wy) * sz
+    view[4], view[5], view[6] = 2 * (xy + wz) * sx, (1 - 2 * (xx + zz)) * sy, 2 * (yz - wx) * sz
+    view[8], view[9], view[10] = 2 * (xz - wy) * sx, 2 * (yz + wx) * sy, (1 - 2 * (xx + yy)) * sz
+    view[3], view[7], view[11] = translation
+    view[12] = view[13] = view[14] = 0.0
+    view[15] = 1.0
+
+
+def _single_rotation(angle, axis):
+    elemental, view = _scratch.rotation
+    compose_values(view, (0.0, 0.0, 0.0), quaternion_values(angle, axis), (1.0, 1.0, 1.0))
+    return elemental
+
+
+def rotate(matrix, angle, axis, local=True, out=None):
+    """matrix @ R (local) o R @ matrix (global); el eje puede ser 'x', 0 o un vector"""
+    if type(matrix) is np.ndarray and matrix.ndim == 2 and type(angle) in SCALARS \
+            and (type(axis) in (str, int) or len(axis) == 3 and type(axis[0]) in SCALARS):
+        rotation = _single_rotation(angle, axis)
+    else:
+        rotation = rotation_matrix(angle, axis)
+    if local:
+        return np.matmul(matrix, rotation, out=out)
+    return np.matmul(rotation, matrix, out=out)
+
+
+def compose(translation, orientation, scale_factors, out=None):
+    """T @ R @ S en forma cerrada a partir de traslación, cuaternión y escala (o pilas de ellos)"""
+    translation = np.asarray(translation, np.float32)
+    orientation = np.asarray(orientation, np.float32)
+    scale_factors = np.asarray(scale_factors, np.float32)
+    shape = np.broadcast_shapes(translation.shape[:-1], orientation.shape[:-1], scale_factors.shape[:-1])
+    out = identity(out=_output(out, shape + (4, 4)))
+    rotation_3x3(orientation, out[..., :3, :3])
+    out[..., :3, :3] *= scale_factors[..., None, :]
+    out[..., :3, 3] = translation
+    return out
@@ -2,6 +2,9 @@ import pygame
 from .Graphics_Data import *
 from .Uniform import *
 from .Transformations import *
+from .Transform import Transform
+from .Culling import Bounds
+from .RenderQueue import render_state
 
 
 class Mesh:
@@ -11,40 +14,55 @@ class Mesh:
                  scale=pygame.Vector3(1, 1, 1),
                  move_rotation=Rotation(0, pygame.Vector3(0, 1, 0)),
                  move_translate=pygame.Vector3(0, 0, 0),
-                 move_scale=pygame.Vector3(1, 1, 1)
+                 move_scale=pygame.Vector3(1, 1, 1),
+                 indices=None
                  ):
         self.vertices = vertices
         self.vertex_normals = vertex_normals
         self.vertex_uvs = vertex_uvs
         self.draw_type = draw_type
+        # Volumen envolvente local para el frustum culling
+        self.bounds = Bounds.from_vertices(vertices)
         self.vao_ref = glGenVertexArrays(1)
-        glBindVertexArray(self.vao_ref)
-        position = Graphics_Data("vec3", self.vertices)
-        position.create_variable(program_id, "position")
-        colors = Graphics_Data("vec3", vertex_colors)
-        colors.create_variable(program_id, "vertex_color")
-        v_normals = Graphics_Data("vec3", vertex_normals)
-        v_normals.create_variable(program_id, "vertex_normal")
+        render_state.bind_vertex_array(self.vao_ref)
+        # Un solo VBO intercalado con los atributos que el programa realmente usa
+        attributes = [("position", 3, vertices),
+                      ("vertex_color", 3, vertex_colors),
+                      ("vertex_normal", 3, vertex_normals),
+                      ("vertex_uv", 2, vertex_uvs)]
+        attributes = [(name, size, data) for name, size, data in attributes
+                      if name == "position" or data is not None and attribute_location(program_id, name) != -1]
+        self.vertex_format = Vertex_Format([(name, size) for name, size, _ in attributes])
+        self.vertex_data = Interleaved_Data(self.vertex_format, [data for _, _, data in attributes])
+        self.vertex_data.create_variables(program_id)
+        self.indices = None
+        if indices is not None:
+            # EBO: se guarda en el VAO mientras está enlazado
+            self.indices = np.ascontiguousarray(indices)
+            self.index_type = GL_UNSIGNED_SHORT if self.indices.dtype == np.uint16 else GL_UNSIGNED_INT
+            self.ebo = glGenBuffers(1)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
         self.program_id = program_id
-        self.transformation_mat = identity_mat()
-        self.transformation_mat = rotateA(self.transformation_mat, rotation.angle, rotation.axis)
-        self.transformation_mat = translate(self.transformation_mat, translation.x, translation.y, translation.z)
-        self.transformation_mat = scale3(self.transformation_mat, scale.x, scale.y, scale.z)
+        # Estado separado (posición, orientación, escala, velocidades); la matriz se recalcula solo si cambia
+        self.transform = Transform.from_legacy(translation, rotation, scale, move_rotation, move_translate, move_scale)
+        self.transformation_mat = self.transform.update()
         self.transformation = Uniform("mat4", self.transformation_mat)
         self.transformation.find_variable(program_id, "model_mat")
-        self.move_rotation = move_rotation
-        self.move_translate = move_translate
-        self.move_scale = move_scale
-        self.program_id = program_id
 
-    def draw(self):
-        self.transformation_mat = rotateA(self.transformation_mat, self.move_rotation.angle, self.move_rotation.axis)
-        self.transformation_mat = translate(self.transformation_mat,
-                                            self.move_translate.x, self.move_translate.y, self.move_translate.z)
-        self.transformation_mat = scale3(self.transformation_mat,
-                                         self.move_scale.x, self.move_scale.y, self.move_scale.z)
-        self.transformation = Uniform("mat4", self.transformation_mat)
-        self.transformation.find_variable(self.program_id, "model_mat")
+    def model_matrix(self, elapsed=None):
+        # elapsed en segundos; sin él se usa el tiempo real desde la última llamada
+        return self.transform.update(elapsed)
+
+    def draw(self, elapsed=None):
+        self.render(self.model_matrix(elapsed))
+
+    def render(self, model_mat):
+        """Dibuja con una matriz de modelo dada (p. ej. la de mundo de un nodo de escena)"""
+        self.transformation.data = model_mat
         self.transformation.load()
-        glBindVertexArray(self.vao_ref)
-        glDrawArrays(self.draw_type, 0, len(self.vertices))
+        render_state.bind_vertex_array(self.vao_ref)
+        if self.indices is not None:
+            glDrawElements(self.draw_type, len(self.indices), self.index_type, None)
+        else:
+            glDrawArrays(self.draw_type, 0, len(self.vertices))
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import re
+import sys
+
+import numpy as np
+
+from .MeshOptimizer import optimize_mesh
+from .ObjParser import parse_obj
+from .Utils import format_vertices, weld_vertices
+
+# Carpeta de caché junto a cada modelo: models/.meshcache/teapot.obj.<clave>.v<versión>.npy
+CACHE_DIRNAME = ".meshcache"
+# Componentes de cada atributo de las mallas indexadas, como en Geometry: p = posición, n = normal, t = uv
+LAYOUT_WIDTHS = {"p": 3, "n": 3, "t": 2}
+# Versión del formato expandido y del parser: al cambiar cualquiera de los dos, subirla invalida las
+# entradas viejas
+MESH_VERSION = 1
+# Versión del formato indexado y de la optimización: al cambiar cualquiera de los dos, subirla invalida
+# las entradas viejas (la clave solo depende del archivo fuente)
+INDEXED_VERSION = 1
+# Variantes indexadas que prepara el precalentado: solo posición (p. ej. Projections) y posición + normal
+PREWARM_LAYOUTS = ["p", "pn"]
+
+
+def cache_path(filename, suffix=""):
+    """Ruta del archivo de caché para el estado actual (ruta, mtime, tamaño) del modelo"""
+    filename = os.path.abspath(filename)
+    stat = os.stat(filename)
+    key = hashlib.sha1(f"{filename}|{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()[:16]
+    folder = os.path.join(os.path.dirname(filename), CACHE_DIRNAME)
+    return os.path.join(folder, f"{os.path.basename(filename)}.{key}{suffix}.npy")
+
+
+def evict_stale(filename, keep=None):
+    """Borra las entradas de caché de un modelo que ya no corresponden al archivo fuente"""
+    folder, name = os.path.split(cache_path(filename) if keep is None else keep)
+    if not os.path.isdir(folder):
+        return
+    # Nombre exacto del modelo seguido de la clave: "teapot.obj." también empieza "teapot.obj.bak.obj.<clave>"
+    pattern = re.compile(re.escape(os.path.basename(filename)) + r"\.([0-9a-f]{16})(\.[^.]+)*\.npy")
+    match = pattern.fullmatch(name)
+    # Mismo modelo y misma clave: las variantes (expandida, indexada...) del estado actual se conservan
+    current = match.group(1) if match else None
+    for entry in os.listdir(folder):
+        match = pattern.fullmatch(entry)
+        if match and match.group(1) != current:
+            try:
+                os.remove(os.path.join(folder, entry))
+            except OSError:
+                pass
+
+
+def mesh_suffix():
+    return f".v{MESH_VERSION}"
+
+
+def load_entry(path, split):
+    """split(array mapeado en memoria) de una entrada, o None si no existe o está dañada (y entonces se borra):
+    la caché nunca debe impedir leer el OBJ"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return split(np.load(path, mmap_mode="r"))
+    except (ValueError, OSError, IndexError) as error:
+        print(f"Entrada de caché dañada {path}: {error}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def load_cached_mesh(filename):
+    """Devuelve (vertices, normals, uvs) mapeados en memoria desde la caché, o None si no hay entrada válida"""
+    path = cache_path(filename, mesh_suffix())
+    evict_stale(filename, keep=path)
+    return load_entry(path, _split)
+
+
+def store_mesh(filename, vertices, normals, uvs):
+    """Guarda los arrays ya expandidos (float32) como un bloque contiguo [posiciones | normales | uvs]"""
+    path = cache_path(filename, mesh_suffix())
+    data = np.concatenate([np.asarray(vertices, np.float32).ravel(),
+                           np.asarray(normals, np.float32).ravel(),
+                           np.asarray(uvs, np.float32).ravel()])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as fp:
+        np.save(fp, data)
+    os.replace(temp, path)
+    evict_stale(filename, keep=path)
+    return path
+
+
+def build_mesh(filename, workers=1):
+    coordinates, triangles, uvs, uvs_ind, normals, normal_ind = parse_obj(filename, workers=workers)
+    return (format_vertices(coordinates, triangles),
+            format_vertices(normals, normal_ind),
+            format_vertices(uvs, uvs_ind))
+
+
+def load_mesh(filename, use_cache=True, workers=1):
+    """(vertices, normals, uvs) expandidos por esquina, usando la caché binaria si es posible.
+
+    workers se pasa a parse_obj cuando hay que leer el OBJ (None = procesos solo para archivos grandes).
+    """
+    if use_cache:
+        cached = load_cached_mesh(filename)
+        if cached is not None:
+            return cached
+    vertices, normals, uvs = build_mesh(filename, workers)
+    if use_cache:
+        try:
+            store_mesh(filename, vertices, normals, uvs)
+        except OSError as error:
+            print(f"No se pudo escribir la caché de {filename}: {error}")
+    return vertices, normals, uvs
+
+
+def indexed_suffix(layout, optimize, overdraw):
+    return (f".{layout}.v{INDEXED_VERSION}" + (".opt" if optimize else "")
+            + (".overdraw" if optimize and overdraw else ""))
+
+
+def load_cached_indexed_mesh(filename, suffix):
+    """(*atributos, indices) de una entrada indexada mapeada en memoria, o None"""
+    return load_entry(cache_path(filename, suffix), _split_indexed)
+
+
+def store_indexed_mesh(filename, suffix, attributes, indices):
+    """Bloque uint32: [tamaño de cabecera, vértices, índices, bytes por índice, componentes...] + atributos + índices.
+
+    Los floats se guardan con sus bits tal cual (vista uint32), así que la entrada es exacta.
+    """
+    path = cache_path(filename, suffix)
+    attributes = [np.asarray(attribute, np.float32).reshape(len(attributes[0]), int(np.prod(np.shape(attribute)[1:])))
+                  for attribute in attributes]
+    header = [len(attributes[0]), len(indices), np.asarray(indices).itemsize] + [a.shape[1] for a in attributes]
+    data = np.concatenate([np.array([len(header) + 1] + header, np.uint32)] +
+                          [np.ascontiguousarray(attribute).view(np.uint32).ravel() for attribute in attributes] +
+                          [np.asarray(indices, np.uint32)])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as fp:
+        np.save(fp, data)
+    os.replace(temp, path)
+    evict_stale(filename, keep=path)
+    return path
+
+
+def load_indexed_mesh(filename, layout="pnt", use_cache=True, workers=1, optimize=True, overdraw=False):
+    """Malla soldada (un array por letra de layout, e índices) con los atributos de layout.
+
+    Solo se sueldan los atributos pedidos: si el programa no lee uvs, dos esquinas con la misma posición
+    y normal son un solo vértice aunque sus uvs difieran. Con optimize los triángulos y vértices se
+    reordenan para la caché de vértices (glApp/MeshOptimizer.py). El resultado se guarda en la caché.
+    """
+    suffix = indexed_suffix(layout, optimize, overdraw)
+    if use_cache:
+        cached = load_cached_indexed_mesh(filename, suffix)
+        if cached is not None:
+            return cached
+    channels = dict(zip("pnt", load_mesh(filename, use_cache, workers)))
+    *attributes, indices = weld_vertices(*[channels[key] for key in layout])
+    if optimize:
+        *attributes, indices = optimize_mesh(indices, *attributes, overdraw=overdraw)
+    if use_cache:
+        try:
+            store_indexed_mesh(filename, suffix, attributes, indices)
+        except OSError as error:
+            print(f"No se pudo escribir la caché de {filename}: {error}")
+    return (*attributes, indices)
+
+
+def prewarm(folder="models"):
+    for entry in sorted(os.listdir(folder)):
+        if not entry.lower().endswith(".obj"):
+            continue
+        filename = os.path.join(folder, entry)
+        try:
+            vertices, _, _ = load_mesh(filename, workers=None)
+        except (ValueError, IndexError) as error:
+            print(f"{filename}: omitido ({error})")
+            continue
+        print(f"{filename}: {len(vertices)} vértices -> {cache_path(filename, mesh_suffix())}")
+        for layout in PREWARM_LAYOUTS:
+            welded = load_indexed_mesh(filename, layout)
+            print(f"    {layout}: {len(welded[0])} vértices, {len(welded[-1]) // 3} triángulos optimizados -> "
+                  f"{cache_path(filename, indexed_suffix(layout, True, False))}")
+
+
+def _split(data):
+    if data.ndim != 1 or len(data) % 8:
+        raise ValueError("tamaño de entrada inválido")
+    count = len(data) // 8
+    vertices = data[:count * 3].reshape(count, 3)
+    normals = data[count * 3:count * 6].reshape(count, 3)
+    uvs = data[count * 6:].reshape(count, 2)
+    return vertices, normals, uvs
+
+
+def _split_indexed(data):
+    size = int(data[0])
+    vertex_count, index_count, index_bytes, *widths = (int(value) for value in data[1:size])
+    arrays = []
+    offset = size
+    for width in widths:
+        arrays.append(data[offset:offset + vertex_count * width].view(np.float32).reshape(vertex_count, width))
+        offset += vertex_count * width
+    if offset + index_count != len(data):
+        raise ValueError("tamaño de entrada inválido")
+    indices = data[offset:offset + index_count]
+    return (*arrays, indices.astype(np.uint16) if index_bytes == 2 else indices)
+
+
+if __name__ == "__main__":
+    # Precalentar la caché: python -m glApp.MeshCache [carpeta...]
+    for folder in sys.argv[1:] or ["models"]:
+        prewarm(folder)
@@ -2,6 +2,9 @@ import pygame
 from .Graphics_Data import *
 from .Uniform import *
 from .Transformations import *
+from .Transform import Transform
+from .Culling import Bounds
+from .RenderQueue import render_state
 
 
 class MovingMesh:
@@ -13,26 +16,27 @@ class MovingMesh:
                  ):
         self.vertices = vertices
         self.draw_type = draw_type
+        self.bounds = Bounds.from_vertices(vertices)
         self.vao_ref = glGenVertexArrays(1)
-        glBindVertexArray(self.vao_ref)
+        render_state.bind_vertex_array(self.vao_ref)
         position = Graphics_Data("vec3", self.vertices)
         position.create_variable(program_id, "position")
         colors = Graphics_Data("vec3", vertex_colors)
         colors.create_variable(program_id, "vertex_color")
         self.program_id = program_id
-        self.transformation_mat = identity_mat()
-        self.transformation_mat = rotateA(self.transformation_mat, rotation.angle, rotation.axis)
-        self.transformation_mat = translate(self.transformation_mat, translation.x, translation.y, translation.z)
-        self.transformation_mat = scale3(self.transformation_mat, scale.x, scale.y, scale.z)
+        self.transform = Transform.from_legacy(translation, rotation, scale, move_rotation)
+        self.transformation_mat = self.transform.update()
         self.transformation = Uniform("mat4", self.transformation_mat)
         self.transformation.find_variable(program_id, "model_mat")
-        self.move_rotation = move_rotation
-        self.program_id = program_id
 
-    def draw(self):
-        self.transformation_mat = rotateA(self.transformation_mat, self.move_rotation.angle, self.move_rotation.axis)
-        self.transformation = Uniform("mat4", self.transformation_mat)
-        self.transformation.find_variable(self.program_id, "model_mat")
+    def model_matrix(self, elapsed=None):
+        return self.transform.update(elapsed)
+
+    def draw(self, elapsed=None):
+        self.render(self.model_matrix(elapsed))
+
+    def render(self, model_mat):
+        self.transformation.data = model_mat
         self.transformation.load()
-        glBindVertexArray(self.vao_ref)
+        render_state.bind_vertex_array(self.vao_ref)
         glDrawArrays(self.draw_type, 0, len(self.vertices))
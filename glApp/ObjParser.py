@@ -0,0 +1,319 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Tamaño de bloque para leer archivos grandes sin cargarlos completos
+CHUNK_SIZE = 64 * 1024 * 1024
+# Con workers=None solo se reparte entre procesos a partir de este tamaño
+PARALLEL_MIN_SIZE = 16 * 1024 * 1024
+# Trozos por proceso: trozos más pequeños reparten mejor las zonas de vértices y de caras
+RANGES_PER_WORKER = 4
+# Conteo inicial en los trozos paralelos: un índice negativo (relativo) queda cerca de este valor y se
+# distingue de los absolutos (< 2^31) y de los ausentes (-1) al unir los trozos
+RELATIVE_BASE = 1 << 40
+
+# (registro, tipo, componentes) de los arrays de resultado, en el orden en que se guardan en memoria compartida
+_FIELDS = [("v", np.float32, 3), ("vt", np.float32, 2), ("vn", np.float32, 3),
+           ("f", np.int64, 1), ("ft", np.int64, 1), ("fn", np.int64, 1)]
+
+_NL = ord("\n")
+_CR = ord("\r")
+_TAB = ord("\t")
+_SPACE = ord(" ")
+_SLASH = ord("/")
+_V = ord("v")
+_T = ord("t")
+_N = ord("n")
+_F = ord("f")
+
+
+def parse_obj(filename, chunk_size=CHUNK_SIZE, workers=1):
+    """Lee un .obj y devuelve (vertices, triangles, uvs, uvs_ind, normals, normal_ind) como arrays NumPy.
+
+    Los índices son base 0 y las caras con más de tres esquinas se triangulan en abanico.
+    Un índice de uv o normal ausente (formas v y v//vn o v/vt) se marca con -1.
+    Con workers > 1 el archivo se reparte entre procesos (parse_obj_parallel); workers=None usa todos los
+    núcleos solo si el archivo pasa de PARALLEL_MIN_SIZE. El resultado es idéntico en todos los casos.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+        if os.path.getsize(filename) < PARALLEL_MIN_SIZE:
+            workers = 1
+    if workers > 1:
+        return parse_obj_parallel(filename, workers, chunk_size)
+    parts = {key: [] for key, _, _ in _FIELDS}
+    seen = np.zeros(3, np.int64)
+    with open(filename, "rb") as fp:
+        _parse_stream(fp, None, parts, seen, chunk_size)
+    return _results([_concat(parts[key], np.float32 if key[0] == "v" else np.int32) for key, _, _ in _FIELDS])
+
+
+def _results(arrays):
+    vertices, uvs, normals, triangles, uvs_ind, normal_ind = arrays
+    # Con todos los registros leídos (y los trozos paralelos ya unidos) cada índice debe existir
+    _check_range("v", triangles, len(vertices) // 3, False)
+    _check_range("vt", uvs_ind, len(uvs) // 2, True)
+    _check_range("vn", normal_ind, len(normals) // 3, True)
+    return vertices.reshape(-1, 3), triangles, uvs.reshape(-1, 2), uvs_ind, normals.reshape(-1, 3), normal_ind
+
+
+def _check_range(kind, indices, count, optional):
+    valid = indices < count
+    valid &= indices >= (-1 if optional else 0)
+    if not valid.all():
+        index = int(indices[np.argmin(valid)])
+        raise ValueError(f"Índice de {kind} inválido en el archivo OBJ: {index + 1} con {count} registros {kind}")
+
+
+def _parse_stream(fp, length, parts, seen, chunk_size):
+    """Lee length bytes (None = hasta el final) desde la posición actual de fp en bloques de líneas completas"""
+    tail = b""
+    while length is None or length > 0:
+        block = fp.read(chunk_size if length is None else min(chunk_size, length))
+        if not block:
+            break
+        if length is not None:
+            length -= len(block)
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        tail = block[cut:]
+        if cut:
+            _parse_block(block[:cut], parts, seen)
+    if tail:
+        _parse_block(tail + b"\n", parts, seen)
+
+
+def line_ranges(filename, count):
+    """(inicio, fin) en bytes de hasta count trozos de tamaño parecido que empiezan y terminan en un salto de línea"""
+    size = os.path.getsize(filename)
+    cuts = [0]
+    with open(filename, "rb") as fp:
+        for index in range(1, count):
+            position = size * index // count
+            if position <= cuts[-1]:
+                continue
+            # Desde el byte anterior: si ya es un salto de línea, el corte cae justo en position
+            fp.seek(position - 1)
+            while True:
+                block = fp.read(64 * 1024)
+                found = block.find(b"\n")
+                if found >= 0:
+                    position += found
+                    break
+                if not block:
+                    position = size
+                    break
+                position += len(block)
+            if cuts[-1] < position < size:
+                cuts.append(position)
+    cuts.append(size)
+    return [(start, end) for start, end in zip(cuts[:-1], cuts[1:]) if end > start]
+
+
+def parse_obj_parallel(filename, workers=None, chunk_size=CHUNK_SIZE, executor=None):
+    """parse_obj repartiendo rangos de líneas entre procesos.
+
+    Cada proceso deja sus arrays en un bloque de memoria compartida y devuelve solo su nombre y tamaños;
+    aquí se copian a los arrays finales y los índices relativos (negativos en el OBJ) se rebasan con el
+    número de vértices de los trozos anteriores. executor permite reutilizar un ProcessPoolExecutor.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = line_ranges(filename, workers * RANGES_PER_WORKER)
+    if executor is None:
+        with ProcessPoolExecutor(workers) as pool:
+            return _parse_ranges(pool, filename, ranges, chunk_size)
+    return _parse_ranges(executor, filename, ranges, chunk_size)
+
+
+def _parse_ranges(executor, filename, ranges, chunk_size):
+    """Reparte los rangos en executor y une los trozos. Los trabajadores ya no rastrean sus bloques: aunque
+    un trozo falle (p. ej. una cara mal escrita) se espera a todos y se borran los que llegaron a crearse"""
+    futures = {executor.submit(_parse_range, filename, start, end, chunk_size): index
+               for index, (start, end) in enumerate(ranges)}
+    pieces = [None] * len(ranges)
+    error = None
+    for future in as_completed(futures):
+        try:
+            pieces[futures[future]] = future.result()
+        except BaseException as exception:
+            if error is None:
+                error = exception
+                # Los trozos que no han empezado ya no hacen falta
+                for pending in futures:
+                    pending.cancel()
+    blocks = []
+    try:
+        for piece in pieces:
+            if piece is not None:
+                blocks.append(shared_memory.SharedMemory(name=piece[0]))
+        if error is not None:
+            raise error
+        return _merge(blocks, [counts for _, counts in pieces])
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _parse_range(filename, start, end, chunk_size):
+    """En el proceso trabajador: parsea [start, end) y lo deja en memoria compartida; devuelve (nombre, tamaños)"""
+    parts = {key: [] for key, _, _ in _FIELDS}
+    seen = np.full(3, RELATIVE_BASE, np.int64)
+    with open(filename, "rb") as fp:
+        fp.seek(start)
+        _parse_stream(fp, end - start, parts, seen, chunk_size)
+    arrays = [_concat(parts[key], dtype) for key, dtype, _ in _FIELDS]
+    counts = [len(array) for array in arrays]
+    offsets, size = _layout(counts)
+    block = shared_memory.SharedMemory(create=True, size=max(1, size))
+    for (_, dtype, _), array, count, offset in zip(_FIELDS, arrays, counts, offsets):
+        np.frombuffer(block.buf, dtype, count, offset)[:] = array
+    block.close()
+    # El bloque pasa al proceso principal, que lo borra tras copiarlo; si el rastreador del trabajador lo
+    # siguiera teniendo registrado lo borraría al terminar el pool
+    resource_tracker.unregister(block._name, "shared_memory")
+    return block.name, counts
+
+
+def _layout(counts):
+    """Offsets en bytes de cada array dentro del bloque compartido (alineados a 8) y tamaño total"""
+    offsets = []
+    size = 0
+    for (_, dtype, _), count in zip(_FIELDS, counts):
+        offsets.append(size)
+        size += -(-count * np.dtype(dtype).itemsize // 8) * 8
+    return offsets, size
+
+
+def _merge(blocks, counts):
+    counts = np.array(counts, np.int64)
+    # Elementos leídos antes de cada trozo (v, vt, vn): la base de sus índices relativos
+    elements = counts[:, :3] // [width for _, _, width in _FIELDS[:3]]
+    before = np.cumsum(elements, axis=0) - elements
+    starts = np.cumsum(counts, axis=0) - counts
+    arrays = [np.empty(total, np.float32 if key[0] == "v" else np.int32)
+              for (key, _, _), total in zip(_FIELDS, counts.sum(axis=0))]
+    for block, piece_counts, piece_starts, piece_before in zip(blocks, counts, starts, before):
+        for index, ((key, dtype, _), count, offset) in enumerate(zip(_FIELDS, piece_counts, _layout(piece_counts)[0])):
+            data = np.frombuffer(block.buf, dtype, count, offset)
+            target = arrays[index][piece_starts[index]:piece_starts[index] + count]
+            if key[0] == "v":
+                target[...] = data
+            else:
+                relative = data >= RELATIVE_BASE // 2
+                target[...] = np.where(relative, data - RELATIVE_BASE + piece_before[index - 3], data)
+            # Sin vistas vivas sobre block.buf, o close() falla
+            del data
+    return _results(arrays)
+
+
+def _concat(arrays, dtype):
+    if not arrays:
+        return np.zeros(0, dtype)
+    return np.concatenate(arrays).astype(dtype, copy=False).ravel()
+
+
+def _parse_block(data, parts, seen):
+    buf = np.frombuffer(data, np.uint8).copy()
+    buf[(buf == _CR) | (buf == _TAB)] = _SPACE
+
+    is_nl = buf == _NL
+    ends = np.flatnonzero(is_nl)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    line_length = ends - starts + 1
+
+    c0 = buf[starts]
+    c1 = buf[np.minimum(starts + 1, len(buf) - 1)]
+    is_v = (c0 == _V) & (c1 == _SPACE)
+    is_vt = (c0 == _V) & (c1 == _T)
+    is_vn = (c0 == _V) & (c1 == _N)
+    is_f = (c0 == _F) & (c1 == _SPACE)
+
+    # Borrar el prefijo de cada registro para quedarnos solo con los números
+    buf[starts[is_v | is_vt | is_vn | is_f]] = _SPACE
+    buf[starts[is_vt | is_vn] + 1] = _SPACE
+
+    # Conteo de tokens por línea
+    solid = (buf != _SPACE) & ~is_nl
+    token_start = solid.copy()
+    token_start[1:] &= ~solid[:-1]
+    token_pos = np.flatnonzero(token_start)
+    token_line = np.searchsorted(ends, token_pos)
+    tokens_per_line = np.bincount(token_line, minlength=len(ends))
+
+    parts["v"].append(_read_floats(buf, line_length, is_v, tokens_per_line, 3))
+    parts["vt"].append(_read_floats(buf, line_length, is_vt, tokens_per_line, 2))
+    parts["vn"].append(_read_floats(buf, line_length, is_vn, tokens_per_line, 3))
+
+    if is_f.any():
+        before = np.stack([np.cumsum(is_v), np.cumsum(is_vt), np.cumsum(is_vn)]) + seen[:, None]
+        _read_faces(buf, line_length, is_f, tokens_per_line, token_pos, token_line, before, parts)
+
+    seen += [is_v.sum(), is_vt.sum(), is_vn.sum()]
+
+
+def _read_floats(buf, line_length, lines, tokens_per_line, width):
+    count = int(lines.sum())
+    if count == 0:
+        return np.zeros((0, width), np.float32)
+    text = buf[np.repeat(lines, line_length)].tobytes()
+    values = np.fromstring(text, dtype=np.float32, sep=" ")
+    widths = tokens_per_line[lines]
+    if len(values) != widths.sum() or widths.min() < width:
+        raise ValueError("Registro de vértice inválido en el archivo OBJ")
+    if (widths == width).all():
+        return values.reshape(-1, width)
+    # Registros con componentes extra (w, colores): tomar solo las primeras
+    offsets = np.cumsum(widths) - widths
+    return values[offsets[:, None] + np.arange(width)]
+
+
+def _read_faces(buf, line_length, is_f, tokens_per_line, token_pos, token_line, before, parts):
+    face_bytes = np.repeat(is_f, line_length)
+    slash = (buf == _SLASH) & face_bytes
+    slash_pos = np.flatnonzero(slash)
+    double_pos = slash_pos[np.flatnonzero(np.diff(slash_pos) == 1)]
+
+    n_tokens = len(token_pos)
+    slashes = np.bincount(np.searchsorted(token_pos, slash_pos, side="right") - 1, minlength=n_tokens)
+    doubles = np.bincount(np.searchsorted(token_pos, double_pos, side="right") - 1, minlength=n_tokens) > 0
+
+    face_token = is_f[token_line]
+    slashes = slashes[face_token]
+    doubles = doubles[face_token]
+    corner_line = token_line[face_token]
+
+    # v -> 1 componente, v/vt y v//vn -> 2, v/vt/vn -> 3
+    components = np.where(slashes == 2, np.where(doubles, 2, 3), slashes + 1)
+    buf[slash_pos] = _SPACE
+    values = np.fromstring(buf[face_bytes].tobytes(), dtype=np.int64, sep=" ")
+    if len(values) != components.sum() or (slashes > 2).any():
+        raise ValueError("Registro de cara inválido en el archivo OBJ")
+
+    offsets = np.cumsum(components) - components
+    last = len(values) - 1
+    v_ind = values[offsets]
+    vt_ind = np.where((slashes >= 1) & ~doubles, values[np.minimum(offsets + 1, last)], 0)
+    vn_ind = np.where(slashes == 2, values[offsets + components - 1], 0)
+
+    # Triangulación en abanico de quads y n-gonos
+    corners = tokens_per_line[is_f]
+    first = np.cumsum(corners) - corners
+    n_tris = np.maximum(corners - 2, 0)
+    tri_first = np.repeat(first, n_tris)
+    local = np.arange(n_tris.sum()) - np.repeat(np.cumsum(n_tris) - n_tris, n_tris) + 1
+    order = np.stack([tri_first, tri_first + local, tri_first + local + 1], axis=1).ravel()
+
+    corner_line = corner_line[order]
+    parts["f"].append(_resolve(v_ind[order], before[0][corner_line]))
+    parts["ft"].append(_resolve(vt_ind[order], before[1][corner_line]))
+    parts["fn"].append(_resolve(vn_ind[order], before[2][corner_line]))
+
+
+def _resolve(indices, before):
+    # Índices OBJ: positivos base 1, negativos relativos al último elemento leído, 0 = ausente
+    return np.where(indices > 0, indices - 1, np.where(indices < 0, before + indices, -1))
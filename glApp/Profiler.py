@@ -0,0 +1,192 @@
+"""Perfilador de frames: spans de CPU con nombre, tiempo de GPU con consultas GL_TIME_ELAPSED y trazas de Chrome.
+
+Desactivado (por defecto) span() devuelve un contexto vacío compartido, así que el coste es una llamada.
+Se activa con GLAPP_PROFILE=<traza.json>: al salir de mainloop imprime p50/p95/p99 y escribe la traza
+(se abre en chrome://tracing o https://ui.perfetto.dev).
+"""
+import collections
+import ctypes
+import json
+import os
+import time
+
+import numpy as np
+from OpenGL.GL import *
+
+PROFILE_ENV = "GLAPP_PROFILE"
+
+# Hilos de la traza de Chrome
+CPU_TRACK, GPU_TRACK = 0, 1
+
+
+class _Null_Span():
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _Null_Span()
+
+
+class _Span():
+    __slots__ = ("profiler", "name", "gpu", "start", "query")
+
+    def __init__(self, profiler, name, gpu):
+        self.profiler = profiler
+        self.name = name
+        self.gpu = gpu
+
+    def __enter__(self):
+        self.query = self.profiler.begin_query() if self.gpu else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        profiler = self.profiler
+        profiler.record_cpu(self.name, self.start, end)
+        if self.query is not None:
+            profiler.end_query(self.name, self.start, self.query)
+        return False
+
+
+class Profiler():
+    """Spans de CPU y GPU con estadísticas móviles de los últimos window valores por nombre.
+
+    Las consultas de GPU no se pueden anidar: un span con gpu=True dentro de otro que ya mide GPU
+    solo mide CPU. Por defecto se mide la GPU del frame entero; con gpu_draws=True, la de cada draw().
+    Los resultados de GPU se leen con al menos un frame de retraso y solo si ya están disponibles,
+    así que el pipeline nunca se detiene esperando a la GPU.
+    """
+    def __init__(self, enabled=False, window=300, max_events=200000, gpu_draws=False):
+        self.enabled = enabled
+        self.window = window
+        self.max_events = max_events
+        self.gpu_draws = gpu_draws
+        self.cpu = {}
+        self.gpu = {}
+        self.events = []
+        self.origin = time.perf_counter()
+        self.free_queries = []
+        self.gpu_active = False
+        self.gpu_started = False
+        self.frame_queries = []
+        self.pending = collections.deque()
+        self.frames = 0
+
+    def span(self, name, gpu=False):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, gpu)
+
+    def draw_span(self, drawable):
+        """Span de un draw() con el nombre de la clase del objeto"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, "draw " + type(drawable).__name__, self.gpu_draws)
+
+    def begin_query(self):
+        if self.gpu_active:
+            return None
+        query = self.free_queries.pop() if self.free_queries else int(glGenQueries(1)[0])
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self.gpu_active = True
+        return query
+
+    def end_query(self, name, start, query):
+        glEndQuery(GL_TIME_ELAPSED)
+        self.gpu_active = False
+        self.frame_queries.append((name, start, query))
+
+    def record_cpu(self, name, start, end):
+        self.record(self.cpu, CPU_TRACK, name, start, (end - start) * 1000)
+
+    def record(self, table, track, name, start, milliseconds):
+        values = table.get(name)
+        if values is None:
+            values = table[name] = collections.deque(maxlen=self.window)
+        values.append(milliseconds)
+        if len(self.events) < self.max_events:
+            self.events.append((track, name, start, milliseconds))
+
+    def end_frame(self):
+        """Cierra el frame y recoge, sin esperar, los resultados de GPU de frames anteriores"""
+        if not self.enabled:
+            return
+        self.pending.append(self.frame_queries)
+        self.frame_queries = []
+        self.frames += 1
+        # Doble buffer: el frame recién enviado nunca se lee; los anteriores solo si la GPU ya terminó
+        while len(self.pending) > 1:
+            queries = self.pending[0]
+            if queries and not glGetQueryObjectiv(queries[-1][2], GL_QUERY_RESULT_AVAILABLE):
+                break
+            self.collect(self.pending.popleft())
+
+    def collect(self, queries):
+        # El primer frame con consultas se descarta: incluye compilación y subidas diferidas del driver,
+        # y Mesa llvmpipe devuelve basura en la primera consulta de tiempo del contexto
+        discard = not self.gpu_started
+        self.gpu_started = self.gpu_started or bool(queries)
+        nanoseconds = ctypes.c_uint64()
+        for name, start, query in queries:
+            glGetQueryObjectui64v(query, GL_QUERY_RESULT, ctypes.byref(nanoseconds))
+            self.free_queries.append(query)
+            if discard:
+                continue
+            # La GPU empieza el trabajo del span después de su inicio en CPU: se sitúa ahí en la traza
+            self.record(self.gpu, GPU_TRACK, name, start, nanoseconds.value / 1e6)
+
+    def finish(self, path=None):
+        """Espera los resultados de GPU pendientes, imprime el informe y escribe la traza si hay ruta"""
+        if not self.enabled:
+            return None
+        self.pending.append(self.frame_queries)
+        self.frame_queries = []
+        while self.pending:
+            self.collect(self.pending.popleft())
+        self.print_report()
+        if path:
+            self.export_chrome_trace(path)
+        return self.statistics()
+
+    def statistics(self):
+        """{nombre: {"cpu": {...}, "gpu": {...}}} con count, mean, p50, p95 y p99 en milisegundos"""
+        result = {}
+        for kind, table in [("cpu", self.cpu), ("gpu", self.gpu)]:
+            for name, values in table.items():
+                values = np.fromiter(values, np.float64, len(values))
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                result.setdefault(name, {})[kind] = {"count": len(values), "mean": float(values.mean()),
+                                                     "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+        return result
+
+    def print_report(self):
+        print(f"📊 Perfil ({self.frames} frames, últimos {self.window} valores por span; ms)")
+        print(f"    {'span':<28}{'CPU p50':>9}{'p95':>8}{'p99':>8}{'GPU p50':>10}{'p95':>8}{'p99':>8}")
+        for name, kinds in self.statistics().items():
+            line = f"    {name:<28}"
+            for kind in ("cpu", "gpu"):
+                values = kinds.get(kind)
+                line += ("" if kind == "cpu" else "  ")
+                line += (f"{values['p50']:8.3f}{values['p95']:8.3f}{values['p99']:8.3f}" if values
+                         else f"{'-':>8}{'-':>8}{'-':>8}")
+            print(line)
+
+    def export_chrome_trace(self, path):
+        """Formato Trace Event de Chrome: un evento completo ("X") por span, CPU y GPU en hilos separados"""
+        events = [{"name": "thread_name", "ph": "M", "pid": 0, "tid": CPU_TRACK, "args": {"name": "CPU"}},
+                  {"name": "thread_name", "ph": "M", "pid": 0, "tid": GPU_TRACK, "args": {"name": "GPU"}}]
+        for track, name, start, milliseconds in self.events:
+            events.append({"name": name, "ph": "X", "pid": 0, "tid": track,
+                           "ts": (start - self.origin) * 1e6, "dur": milliseconds * 1000})
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+# Un perfilador por proceso, como render_state; GLAPP_PROFILE lo activa
+profiler = Profiler(enabled=bool(os.environ.get(PROFILE_ENV)))
@@ -5,6 +5,7 @@ from glApp.Triangle import *
 from glApp.Axes import *
 from glApp.Cube import *
 from glApp.LoadMesh import *
+from glApp.AssetManager import asset_manager
 
 
 vertex_shader = r'''
@@ -33,7 +34,7 @@ void main()
 '''
 
 
-class Projections(PyOGLApp):
+class Projections(PyOGApp):
 
     def __init__(self):
         super().__init__(850, 200, 1000, 800)
@@ -49,18 +50,19 @@ class Projections(PyOGLApp):
         self.triangle = Triangle(self.program_id, pygame.Vector3(0.5, -0.5, 0))
         self.axes = Axes(self.program_id, pygame.Vector3(0, 0, 0))
         self.cube = Cube(self.program_id)
-        self.teapot = LoadMesh("models/teapot.obj", self.program_id,
-                               scale=pygame.Vector3(5, 10, 5),
-                               rotation=Rotation(45, pygame.Vector3(1, 0, 1)))
+        # Se lee en segundo plano; hasta que esté subida se dibuja su caja envolvente
+        self.teapot = asset_manager.load_mesh("models/teapot.obj", self.program_id,
+                                              scale=pygame.Vector3(5, 10, 5),
+                                              rotation=Rotation(45, pygame.Vector3(1, 0, 1)))
         self.camera = Camera(self.program_id, self.screen_width, self.screen_height)
-        glEnable(GL_DEPTH_TEST)
+        render_state.set_capability(GL_DEPTH_TEST, True)
 
     def camera_init(self):
         pass
 
     def display(self):
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glUseProgram(self.program_id)
+        render_state.use_program(self.program_id)
         self.camera.update()
         #self.square.draw()
         #self.triangle.draw()
@@ -1,6 +1,12 @@
 import pygame
 from pygame.locals import *
 from .Camera import *
+from .RenderQueue import render_state
+from .ShaderCache import shader_cache
+from .ShaderLibrary import shader_library, SHADER_WATCH_ENV
+from .AssetManager import asset_manager
+from .Profiler import profiler, PROFILE_ENV
+from . import HEADLESS_ENV
 import os
 from OpenGL.GL import *
 from OpenGL.GLU import *
@@ -13,15 +19,27 @@ class PyOGApp():
         
         pygame.init()
         
-        # Configuración OpenGL moderna
-        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
-        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
-        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
-        pygame.display.gl_set_attribute(pygame.GL_DEPTH_SIZE, 24)
-        pygame.display.gl_set_attribute(pygame.GL_DOUBLEBUFFER, 1)
-        
-        self.screen = pygame.display.set_mode((screen_width, screen_height), DOUBLEBUF | OPENGL)
-        pygame.display.set_caption('Esfera Metálica - Blinn-Phong')
+        self.headless = None
+        if os.environ.get(HEADLESS_ENV):
+            # Sin ventana: contexto EGL y FBO, ver glApp/Headless.py
+            from .Headless import Headless_Session
+            self.headless = Headless_Session(screen_width, screen_height)
+            self.screen = None
+        else:
+            # Configuración OpenGL moderna
+            pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
+            pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
+            pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
+            pygame.display.gl_set_attribute(pygame.GL_DEPTH_SIZE, 24)
+            pygame.display.gl_set_attribute(pygame.GL_DOUBLEBUFFER, 1)
+            
+            self.screen = pygame.display.set_mode((screen_width, screen_height), DOUBLEBUF | OPENGL)
+            pygame.display.set_caption('Esfera Metálica - Blinn-Phong')
+        # Contexto nuevo: el caché de estado GL y el de programas empiezan vacíos
+        render_state.invalidate()
+        shader_cache.invalidate()
+        shader_library.invalidate()
+        asset_manager.invalidate()
         
         self.camera = None
         self.program_id = None
@@ -44,24 +62,43 @@ class PyOGApp():
         pass
 
     def mainloop(self):
+        if self.headless is not None:
+            # Número fijo de frames, sin límite de fps ni captura del ratón
+            self.headless.run(self)
+            pygame.quit()
+            return
         done = False
         self.initialise()
         pygame.event.set_grab(True)
         pygame.mouse.set_visible(False)
+        if os.environ.get(SHADER_WATCH_ENV):
+            # Recarga en caliente: editar glApp/shaders/*.vert|frag|glsl reenlaza sin reiniciar
+            shader_library.watch()
 
         while not done:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    done = True
-                if event.type == KEYDOWN:
-                    if event.key == K_ESCAPE:
-                        pygame.mouse.set_visible(True)
-                        pygame.event.set_grab(False)
-                    if event.key == K_SPACE:
-                        pygame.mouse.set_visible(False)
-                        pygame.event.set_grab(True)
-            self.camera_init()
-            self.display()
-            pygame.display.flip()
-            self.clock.tick(60)
+            shader_library.update()
+            # Mallas cargadas en segundo plano: se suben dentro del presupuesto del frame
+            with profiler.span("assets"):
+                asset_manager.update()
+            with profiler.span("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        done = True
+                    if event.type == KEYDOWN:
+                        if event.key == K_ESCAPE:
+                            pygame.mouse.set_visible(True)
+                            pygame.event.set_grab(False)
+                        if event.key == K_SPACE:
+                            pygame.mouse.set_visible(False)
+                            pygame.event.set_grab(True)
+            with profiler.span("camera_init"):
+                self.camera_init()
+            with profiler.span("display", gpu=not profiler.gpu_draws):
+                self.display()
+            with profiler.span("flip"):
+                pygame.display.flip()
+            with profiler.span("tick"):
+                self.clock.tick(60)
+            profiler.end_frame()
+        profiler.finish(os.environ.get(PROFILE_ENV))
         pygame.quit()
\ No newline at end of file
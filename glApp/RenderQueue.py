@@ -0,0 +1,157 @@
+import collections
+
+import numpy as np
+from OpenGL.GL import *
+
+from .Profiler import profiler
+
+# Pasadas en el orden en que se dibujan
+OPAQUE, TRANSPARENT = 0, 1
+
+# Bits de cada campo de la clave de orden (entero de 64 bits)
+PROGRAM_BITS, MATERIAL_BITS, VAO_BITS, DEPTH_BITS = 8, 12, 12, 24
+
+
+class Render_State():
+    """Caché del estado GL: programa, VAO, capacidades, blend y escritura de profundidad.
+
+    Solo llama a GL si el valor cambia; issued y skipped cuentan las llamadas hechas y evitadas.
+    Si algo cambia el estado GL por fuera, hay que llamar a invalidate().
+    """
+    def __init__(self):
+        self.issued = collections.Counter()
+        self.skipped = collections.Counter()
+        self.invalidate()
+
+    def invalidate(self):
+        self.program = None
+        self.vao = None
+        self.capabilities = {}
+        self.blend_factors = None
+        self.depth_write = None
+
+    def reset_counters(self):
+        self.issued.clear()
+        self.skipped.clear()
+
+    def _changed(self, name, changed):
+        (self.issued if changed else self.skipped)[name] += 1
+        return changed
+
+    def use_program(self, program_id):
+        if self._changed("glUseProgram", program_id != self.program):
+            glUseProgram(program_id)
+            self.program = program_id
+
+    def bind_vertex_array(self, vao):
+        if self._changed("glBindVertexArray", vao != self.vao):
+            glBindVertexArray(vao)
+            self.vao = vao
+
+    def set_capability(self, capability, enabled):
+        if self._changed("glEnable/glDisable", self.capabilities.get(capability) != enabled):
+            (glEnable if enabled else glDisable)(capability)
+            self.capabilities[capability] = enabled
+
+    def blend_func(self, source, destination):
+        if self._changed("glBlendFunc", self.blend_factors != (source, destination)):
+            glBlendFunc(source, destination)
+            self.blend_factors = (source, destination)
+
+    def depth_mask(self, enabled):
+        if self._changed("glDepthMask", self.depth_write != enabled):
+            glDepthMask(enabled)
+            self.depth_write = enabled
+
+
+# Un solo contexto GL por aplicación: un solo caché compartido por todos los objetos
+render_state = Render_State()
+
+
+class Render_Queue():
+    """Recoge los objetos de un frame, los ordena por clave y los dibuja minimizando cambios de estado.
+
+    Clave opaca: (pasada, programa, material, VAO, profundidad) -> de delante hacia atrás dentro de cada grupo.
+    Clave transparente: (pasada, profundidad invertida, programa, material, VAO) -> de atrás hacia delante.
+    El material es drawable.material si el objeto lo define (p. ej. los que comparten textura); si no, cada
+    objeto fija sus propios uniforms y el material es el par (programa, VAO): los objetos con el mismo par
+    forman un grupo y se ordenan por profundidad dentro de él.
+    """
+    def __init__(self, camera, state=render_state, transparent_depth_write=True):
+        self.camera = camera
+        self.state = state
+        # Por defecto los transparentes escriben profundidad, como hasta ahora en main2.py
+        self.transparent_depth_write = transparent_depth_write
+        self.items = []
+        self.ranks = {}
+
+    def rank(self, kind, value, bits):
+        # Identificadores arbitrarios -> enteros pequeños para empaquetar en la clave; se reparten de nuevo
+        # en cada frame (sort_keys), así que no crecen ni se saturan con los objetos de frames anteriores
+        ranks = self.ranks.setdefault(kind, {})
+        if value not in ranks:
+            ranks[value] = min(len(ranks), (1 << bits) - 1)
+        return ranks[value]
+
+    def submit(self, drawable, model_mat=None):
+        if model_mat is None:
+            model_mat = drawable.model_matrix()
+        self.items.append((drawable, model_mat))
+
+    def sort_keys(self):
+        self.ranks = {}
+        drawables = [drawable for drawable, _ in self.items]
+        vao_names = [getattr(drawable, "vao_ref", getattr(drawable, "vao", 0)) for drawable in drawables]
+        passes = np.array([TRANSPARENT if getattr(drawable, "transparent", False) else OPAQUE
+                           for drawable in drawables], np.uint64)
+        programs = np.array([self.rank("program", drawable.program_id, PROGRAM_BITS) for drawable in drawables],
+                            np.uint64)
+        materials = [getattr(drawable, "material", None) or (drawable.program_id, vao)
+                     for drawable, vao in zip(drawables, vao_names)]
+        materials = np.array([self.rank("material", material, MATERIAL_BITS) for material in materials], np.uint64)
+        vaos = np.array([self.rank("vao", vao, VAO_BITS) for vao in vao_names], np.uint64)
+
+        # Distancia a la cámara de cada origen de modelo, cuantizada en [0, far]
+        positions = np.array([model_mat[:3, 3] for _, model_mat in self.items], np.float64)
+        view = self.camera.transformation
+        distance = -(positions @ view[2, :3] + view[2, 3])
+        far = self.camera.far_plane
+        scale = (1 << DEPTH_BITS) - 1
+        depth = np.clip(distance / far, 0.0, 1.0) * scale
+        depth = depth.astype(np.uint64)
+
+        state_bits = PROGRAM_BITS + MATERIAL_BITS + VAO_BITS
+        state_key = (programs << np.uint64(MATERIAL_BITS + VAO_BITS)) | (materials << np.uint64(VAO_BITS)) | vaos
+        opaque = (state_key << np.uint64(DEPTH_BITS)) | depth
+        transparent = ((np.uint64(scale) - depth) << np.uint64(state_bits)) | state_key
+        keys = np.where(passes == TRANSPARENT, transparent, opaque)
+        return passes, keys | (passes << np.uint64(63))
+
+    def flush(self):
+        """Ordena y dibuja todo lo enviado en este frame; devuelve el número de objetos dibujados"""
+        if not self.items:
+            return 0
+        passes, keys = self.sort_keys()
+        order = np.argsort(keys, kind="stable")
+        current_pass = None
+        for index in order:
+            drawable, model_mat = self.items[index]
+            if passes[index] != current_pass:
+                current_pass = passes[index]
+                self.begin_pass(current_pass)
+            self.state.use_program(drawable.program_id)
+            with profiler.draw_span(drawable):
+                drawable.render(model_mat)
+        count = len(self.items)
+        self.items = []
+        return count
+
+    def begin_pass(self, render_pass):
+        self.state.set_capability(GL_DEPTH_TEST, True)
+        if render_pass == OPAQUE:
+            self.state.set_capability(GL_BLEND, False)
+            self.state.depth_mask(True)
+        else:
+            self.state.set_capability(GL_BLEND, True)
+            self.state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+            self.state.depth_mask(self.transparent_depth_write)
@@ -0,0 +1,260 @@
+import time
+
+import numpy as np
+from OpenGL.GL import *
+
+from .Transform import Transform
+from .Culling import Bounds_Array
+from .BVH import Object_BVH
+from .RenderQueue import render_state
+from .Profiler import profiler
+
+
+class Scene_Node():
+    """Nodo con transformación local, un objeto dibujable opcional (Mesh, esferas...) e hijos.
+
+    La matriz de mundo se guarda en el grafo y solo se recalcula cuando el nodo o un antecesor cambió.
+    Si se modifica self.transform directamente hay que llamar a mark_dirty().
+    """
+    def __init__(self, drawable=None, transform=None, name=None):
+        self.drawable = drawable
+        self.transform = Transform() if transform is None else transform
+        self.name = name
+        self.parent = None
+        self.children = []
+        self.visible = True
+        self.graph = None
+        self.index = None
+        self.depth = 0
+
+    def add(self, child):
+        if child.parent is not None:
+            child.parent.remove(child)
+        child.parent = self
+        self.children.append(child)
+        if self.graph is not None:
+            self.graph.register(child)
+        return child
+
+    def remove(self, child):
+        self.children.remove(child)
+        child.parent = None
+        if self.graph is not None:
+            self.graph.unregister(child)
+
+    def walk(self):
+        """Recorre el subárbol en profundidad, empezando por este nodo"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    @property
+    def world_matrix(self):
+        return self.graph.world_mats[self.index]
+
+    def mark_dirty(self):
+        if self.graph is not None:
+            self.graph.dirty.add(self)
+
+    def set_position(self, x, y, z):
+        self.transform.set_position(x, y, z)
+        self.mark_dirty()
+
+    def set_orientation(self, angle, axis):
+        self.transform.set_orientation(angle, axis)
+        self.mark_dirty()
+
+    def set_scale(self, x, y, z):
+        self.transform.set_scale(x, y, z)
+        self.mark_dirty()
+
+    def translate(self, x, y, z, local=True):
+        self.transform.translate(x, y, z, local)
+        self.mark_dirty()
+
+    def rotate(self, angle, axis, local=True):
+        self.transform.rotate(angle, axis, local)
+        self.mark_dirty()
+
+    def set_motion(self, velocity=None, angular_velocity=None, scale_velocity=None):
+        """Velocidades por segundo; los nodos en movimiento se integran en Scene_Graph.update()"""
+        if velocity is not None:
+            self.transform.velocity = tuple(map(float, velocity))
+        if angular_velocity is not None:
+            self.transform.angular_velocity = angular_velocity
+        if scale_velocity is not None:
+            self.transform.scale_velocity = tuple(map(float, scale_velocity))
+        if self.graph is not None:
+            self.graph.refresh_motion(self)
+
+    def set_visible(self, visible):
+        self.visible = visible
+        if self.graph is not None:
+            self.graph.draw_list_dirty = True
+
+
+class Scene_Graph():
+    """Árbol de Scene_Node con matrices locales y de mundo en arrays (N, 4, 4).
+
+    update() solo integra los nodos en movimiento y recalcula los subárboles marcados,
+    nivel a nivel con un matmul por lotes; draw_list() es plana y ordenada por programa y VAO.
+    A partir de bvh_threshold objetos el culling usa un Object_BVH que se reajusta cuando algo se mueve.
+    """
+    def __init__(self, capacity=64, bvh_threshold=2048):
+        self.bvh_threshold = bvh_threshold
+        self.bvh = None
+        self.bvh_stale = False
+        self.local_mats = np.zeros((capacity, 4, 4), np.float32)
+        self.world_mats = np.zeros((capacity, 4, 4), np.float32)
+        self.parents = np.zeros(capacity, np.int64)
+        self.free = list(range(capacity - 1, 0, -1))
+        self.nodes = {}
+        self.dirty = set()
+        self.moving = set()
+        self.draw_list_dirty = True
+        self.sorted_nodes = []
+        self.sorted_indices = np.zeros(0, np.int64)
+        self.sorted_bounds = None
+        self.last_time = None
+        self.matrices_updated = 0
+        self.root = Scene_Node(name="root")
+        self.root.graph = self
+        self.root.index = 0
+        self.local_mats[0] = self.world_mats[0] = np.identity(4, dtype=np.float32)
+        self.nodes[0] = self.root
+
+    def add(self, node, parent=None):
+        return (self.root if parent is None else parent).add(node)
+
+    def grow(self):
+        capacity = len(self.local_mats)
+        self.local_mats = np.concatenate([self.local_mats, np.zeros_like(self.local_mats)])
+        self.world_mats = np.concatenate([self.world_mats, np.zeros_like(self.world_mats)])
+        self.parents = np.concatenate([self.parents, np.zeros_like(self.parents)])
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def register(self, node):
+        for child in node.walk():
+            if not self.free:
+                self.grow()
+            child.graph = self
+            child.index = self.free.pop()
+            child.depth = child.parent.depth + 1
+            self.parents[child.index] = child.parent.index
+            self.local_mats[child.index] = child.transform.update(0.0)
+            self.nodes[child.index] = child
+            self.refresh_motion(child)
+        self.dirty.add(node)
+        self.draw_list_dirty = True
+
+    def unregister(self, node):
+        for child in node.walk():
+            del self.nodes[child.index]
+            self.free.append(child.index)
+            self.dirty.discard(child)
+            self.moving.discard(child)
+            child.graph = None
+            child.index = None
+        self.draw_list_dirty = True
+
+    def refresh_motion(self, node):
+        if node.transform.moving:
+            self.moving.add(node)
+        else:
+            self.moving.discard(node)
+
+    def update(self, elapsed=None):
+        """Integra el movimiento (elapsed en segundos, o el tiempo real) y actualiza las matrices de mundo"""
+        now = time.perf_counter()
+        if elapsed is None:
+            elapsed = 0.0 if self.last_time is None else now - self.last_time
+        self.last_time = now
+        for node in self.moving:
+            node.transform.integrate(elapsed)
+        self.dirty.update(self.moving)
+        self.matrices_updated = 0
+        if not self.dirty:
+            return
+
+        for node in self.dirty:
+            self.local_mats[node.index] = node.transform.update(0.0)
+        # Subárboles por nivel: un nodo marcado dentro de otro subárbol marcado se visita una sola vez
+        levels = {}
+        visited = set()
+        for node in self.dirty:
+            if node in visited:
+                continue
+            for child in node.walk():
+                if child in visited:
+                    continue
+                visited.add(child)
+                levels.setdefault(child.depth, []).append(child.index)
+        self.dirty.clear()
+        for depth in sorted(levels):
+            indices = np.array(levels[depth])
+            self.world_mats[indices] = np.matmul(self.world_mats[self.parents[indices]], self.local_mats[indices])
+            self.matrices_updated += len(indices)
+        self.bvh_stale = True
+
+    @staticmethod
+    def sort_key(node):
+        drawable = node.drawable
+        vao = getattr(drawable, "vao_ref", getattr(drawable, "vao", 0))
+        return getattr(drawable, "program_id", 0), vao
+
+    def draw_list(self):
+        """Nodos visibles con algo que dibujar, agrupados por programa y VAO; se recalcula solo si cambia el árbol"""
+        if self.draw_list_dirty:
+            nodes = []
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                if not node.visible:
+                    continue
+                if node.drawable is not None:
+                    nodes.append(node)
+                stack.extend(reversed(node.children))
+            self.sorted_nodes = sorted(nodes, key=self.sort_key)
+            self.sorted_indices = np.array([node.index for node in self.sorted_nodes], np.int64)
+            self.sorted_bounds = Bounds_Array([getattr(node.drawable, "bounds", None) for node in self.sorted_nodes])
+            self.bvh = None
+            self.draw_list_dirty = False
+        return self.sorted_nodes
+
+    def visible_bvh(self, culler):
+        """Posiciones en draw_list() de los nodos que la consulta de frustum del BVH no descarta"""
+        model_mats = self.world_mats[self.sorted_indices]
+        if self.bvh is None:
+            self.bvh = Object_BVH(model_mats, self.sorted_bounds)
+        elif self.bvh_stale:
+            self.bvh.refit_objects(model_mats)
+        self.bvh_stale = False
+        if culler.planes is None:
+            culler.update()
+        return self.bvh.query_frustum(culler.planes)
+
+    def draw(self, culler=None, queue=None):
+        """Dibuja la lista ordenada; con un Frustum_Culler se prueban todos los nodos a la vez antes de dibujar.
+
+        Con un Render_Queue los nodos visibles se envían a la cola y se reordenan por pasada y profundidad.
+        """
+        nodes = self.draw_list()
+        if culler is not None and len(nodes) >= self.bvh_threshold:
+            visible = np.sort(self.visible_bvh(culler))
+            culler.count(len(nodes), len(visible))
+            nodes = [nodes[index] for index in visible]
+        elif culler is not None:
+            mask = culler.test(self.world_mats[self.sorted_indices], self.sorted_bounds)
+            nodes = [node for node, visible in zip(nodes, mask) if visible]
+        if queue is not None:
+            for node in nodes:
+                queue.submit(node.drawable, node.world_matrix)
+            queue.flush()
+            return
+        for node in nodes:
+            drawable = node.drawable
+            render_state.use_program(drawable.program_id)
+            with profiler.draw_span(drawable):
+                drawable.render(node.world_matrix)
@@ -0,0 +1,160 @@
+"""Caché de programas GLSL: un programa por fuente dentro del proceso y binarios enlazados en disco entre ejecuciones.
+
+Dentro de un contexto, create_program() con las mismas fuentes devuelve el mismo programa (clave: sha256 de
+las fuentes). Al enlazar se guarda el binario del driver (glGetProgramBinary) en .shadercache/; en la siguiente
+ejecución se carga con glProgramBinary sin compilar. La clave incluye vendor, renderer y versión de GL, y si
+el driver rechaza un binario (actualización del driver, archivo dañado) se borra y se recompila.
+
+GLAPP_SHADER_CACHE=<carpeta> cambia la carpeta; GLAPP_SHADER_CACHE=0 desactiva la caché en disco.
+"""
+import ctypes
+import hashlib
+import os
+import struct
+
+from OpenGL.GL import *
+
+from .Utils import delete_program, link_program, reflect_program
+
+SHADER_CACHE_ENV = "GLAPP_SHADER_CACHE"
+CACHE_DIRNAME = ".shadercache"
+
+# Cabecera de cada archivo: firma y formato binario del driver
+MAGIC = b"GLPB"
+HEADER = struct.Struct("<4sI")
+
+
+def source_key(vertex_shader_code, fragment_shader_code):
+    return hashlib.sha256(f"{vertex_shader_code}\0{fragment_shader_code}".encode()).hexdigest()
+
+
+def driver_key():
+    """Identifica el driver actual: un binario solo vale para el mismo vendor, renderer y versión"""
+    names = [glGetString(name) or b"" for name in (GL_VENDOR, GL_RENDERER, GL_VERSION)]
+    return hashlib.sha256(b"|".join(names)).hexdigest()[:16]
+
+
+class Shader_Cache():
+    """Programas enlazados por sha256 de las fuentes, con binarios persistentes en folder (None: solo en memoria)"""
+    def __init__(self, folder=CACHE_DIRNAME):
+        self.folder = folder
+        self.programs = {}
+        self.driver = None
+        self.binary_formats = None
+        self.stats = {"hits": 0, "loaded": 0, "compiled": 0, "rejected": 0}
+
+    def invalidate(self):
+        """Contexto nuevo: los programas del anterior ya no existen"""
+        self.programs.clear()
+        self.driver = None
+        self.binary_formats = None
+
+    def program(self, vertex_shader_code, fragment_shader_code):
+        key = source_key(vertex_shader_code, fragment_shader_code)
+        program_id = self.programs.get(key)
+        if program_id is not None:
+            self.stats["hits"] += 1
+            return program_id
+        path = self.binary_path(key)
+        program_id = self.load_binary(path) if path else None
+        if program_id is None:
+            program_id = link_program(vertex_shader_code, fragment_shader_code, retrievable=bool(path))
+            self.stats["compiled"] += 1
+            if path:
+                self.store_binary(path, program_id)
+        self.programs[key] = program_id
+        return program_id
+
+    def relink(self, program_id, vertex_shader_code, fragment_shader_code):
+        """Reenlaza program_id con fuentes nuevas sin cambiar su id, así los objetos que lo usan no cambian.
+
+        Las fuentes se prueban antes en un programa aparte: si no compilan o no enlazan se lanza RuntimeError
+        y program_id queda intacto. Se conservan los bindings de los bloques de uniforms (p. ej. Camera).
+        """
+        delete_program(link_program(vertex_shader_code, fragment_shader_code))
+        bindings = {}
+        name = ctypes.create_string_buffer(256)
+        binding = GLint()
+        for index in range(glGetProgramiv(program_id, GL_ACTIVE_UNIFORM_BLOCKS)):
+            glGetActiveUniformBlockName(program_id, index, len(name), None, name)
+            glGetActiveUniformBlockiv(program_id, index, GL_UNIFORM_BLOCK_BINDING, ctypes.byref(binding))
+            bindings[name.value.decode()] = binding.value
+        link_program(vertex_shader_code, fragment_shader_code, program_id=program_id)
+        for name, binding in bindings.items():
+            index = glGetUniformBlockIndex(program_id, name)
+            if index != GL_INVALID_INDEX:
+                glUniformBlockBinding(program_id, index, binding)
+        for key in [key for key, value in self.programs.items() if value == program_id]:
+            del self.programs[key]
+        self.programs[source_key(vertex_shader_code, fragment_shader_code)] = program_id
+        self.stats["compiled"] += 1
+
+    def binary_path(self, key):
+        if not self.folder:
+            return None
+        if self.binary_formats is None:
+            # Sin formatos de binario (algunos drivers) la caché queda solo en memoria
+            self.binary_formats = int(glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS))
+            self.driver = driver_key()
+        if self.binary_formats == 0:
+            return None
+        return os.path.join(self.folder, f"{key[:32]}.{self.driver}.bin")
+
+    def load_binary(self, path):
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        if len(data) <= HEADER.size or data[:len(MAGIC)] != MAGIC:
+            self.reject(path)
+            return None
+        _, binary_format = HEADER.unpack_from(data)
+        binary = data[HEADER.size:]
+        program_id = glCreateProgram()
+        glProgramBinary(program_id, binary_format, binary, len(binary))
+        if not glGetProgramiv(program_id, GL_LINK_STATUS):
+            # Binario obsoleto o dañado: el driver lo rechaza y se vuelve a compilar desde las fuentes
+            glDeleteProgram(program_id)
+            self.reject(path)
+            return None
+        reflect_program(program_id)
+        self.stats["loaded"] += 1
+        return program_id
+
+    def reject(self, path):
+        self.stats["rejected"] += 1
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def store_binary(self, path, program_id):
+        size = int(glGetProgramiv(program_id, GL_PROGRAM_BINARY_LENGTH))
+        if size == 0:
+            return
+        binary = (ctypes.c_ubyte * size)()
+        length = GLsizei()
+        binary_format = GLenum()
+        glGetProgramBinary(program_id, size, ctypes.byref(length), ctypes.byref(binary_format), binary)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            # Escritura atómica: otro proceso nunca lee un binario a medias
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as file:
+                file.write(HEADER.pack(MAGIC, binary_format.value))
+                file.write(bytes(binary)[:length.value])
+            os.replace(temp, path)
+        except OSError as error:
+            print(f"No se pudo escribir la caché de shaders en {self.folder}: {error}")
+
+
+def _folder_from_env():
+    value = os.environ.get(SHADER_CACHE_ENV)
+    if value is None:
+        return CACHE_DIRNAME
+    return None if value in ("", "0") else value
+
+
+# Una caché por proceso, como render_state; create_program() pasa por ella
+shader_cache = Shader_Cache(_folder_from_env())
@@ -0,0 +1,204 @@
+"""Biblioteca de shaders: GLSL en glApp/shaders con #include, variantes por #define y recarga en caliente.
+
+program("surface", WAVES=1, FRESNEL=1) preprocesa surface.vert y surface.frag con esos defines, enlaza el
+programa la primera vez que se pide y lo guarda por (nombre, defines): solo existen las permutaciones que
+la escena usa. Las fuentes resultantes pasan por la caché de programas (glApp/ShaderCache.py).
+
+Con watch() (o GLAPP_SHADER_WATCH=1 en PyOGApp) un hilo vigila los archivos de cada variante y los vuelve a
+preprocesar al cambiar; update(), llamado cada frame en el hilo de GL, reenlaza esos programas en su sitio.
+Si la nueva versión no compila se imprime el error y se sigue con la anterior.
+
+Uso: python -m glApp.ShaderLibrary surface WAVES=1 FRESNEL=1   (imprime las fuentes preprocesadas)
+"""
+import os
+import re
+import sys
+import threading
+
+from .ShaderCache import shader_cache
+
+SHADER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shaders")
+SHADER_WATCH_ENV = "GLAPP_SHADER_WATCH"
+STAGES = (".vert", ".frag")
+
+INCLUDE = re.compile(r'^\s*#include\s+"([^"]+)"\s*$')
+
+
+def define_lines(defines):
+    """#define en orden fijo (mismas fuentes, misma clave en la caché); True vale 1 y False lo omite"""
+    lines = []
+    for name, value in sorted(defines.items()):
+        if value is False or value is None:
+            continue
+        lines.append(f"#define {name} {1 if value is True else value}")
+    return lines
+
+
+class Shader_Variant():
+    """Un programa de la biblioteca: fuentes actuales y archivos (con su mtime) de los que dependen"""
+    def __init__(self, name, defines, program_id, sources, files):
+        self.name = name
+        self.defines = defines
+        self.program_id = program_id
+        self.sources = sources
+        self.files = files
+
+    def label(self):
+        return " ".join([self.name] + [f"{key}={value}" for key, value in sorted(self.defines.items())])
+
+
+class Shader_Library():
+    def __init__(self, folder=SHADER_DIR):
+        self.folder = folder
+        self.variants = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.watcher = None
+        self.stopping = threading.Event()
+
+    def invalidate(self):
+        """Contexto nuevo: las variantes se vuelven a enlazar cuando se pidan"""
+        with self.lock:
+            self.variants.clear()
+            self.pending.clear()
+
+    def sources(self, name, **defines):
+        """(vertex, fragment) preprocesados, sin tocar GL"""
+        sources, _ = self.preprocess(name, defines)
+        return sources
+
+    def program(self, name, **defines):
+        key = (name, frozenset(defines.items()))
+        variant = self.variants.get(key)
+        if variant is None:
+            sources, files = self.preprocess(name, defines)
+            try:
+                program_id = shader_cache.program(*sources)
+            except RuntimeError:
+                self.print_files(files)
+                raise
+            variant = Shader_Variant(name, dict(defines), program_id, sources, files)
+            with self.lock:
+                self.variants[key] = variant
+        return variant.program_id
+
+    def preprocess(self, name, defines):
+        """Fuentes de cada etapa y {ruta: mtime} de todos los archivos leídos"""
+        files = {}
+        sources = tuple(self.expand(os.path.join(self.folder, name + stage), define_lines(defines), files)
+                        for stage in STAGES)
+        return sources, files
+
+    def expand(self, path, defines, files):
+        lines = []
+        self.include(path, lines, files, set(), ())
+        # Los defines van justo después de #version, que debe ser la primera línea
+        if lines and lines[0].startswith("#version"):
+            return "\n".join(lines[:1] + defines + [f"#line 2 {list(files).index(os.path.normpath(path))}"]
+                             + lines[1:]) + "\n"
+        return "\n".join(defines + lines) + "\n"
+
+    def include(self, path, lines, files, included, stack):
+        """Copia path en lines resolviendo #include; cada archivo entra una sola vez por etapa (como #pragma once)"""
+        path = os.path.normpath(path)
+        if path in stack:
+            raise ValueError(f"#include circular: {' -> '.join(stack + (path,))}")
+        if path in included:
+            return
+        included.add(path)
+        if path not in files:
+            files[path] = os.stat(path).st_mtime_ns
+        # Los números de fuente de #line son índices en files: un error "N:línea" señala el archivo N
+        number = list(files).index(path)
+        if stack:
+            lines.append(f"#line 1 {number}")
+        with open(path) as file:
+            text = file.read().splitlines()
+        for line_number, line in enumerate(text, 1):
+            match = INCLUDE.match(line)
+            if match is None:
+                lines.append(line)
+                continue
+            # Relativo al archivo que incluye y, si no, a la carpeta de la biblioteca
+            target = os.path.join(os.path.dirname(path), match.group(1))
+            if not os.path.exists(target):
+                target = os.path.join(self.folder, match.group(1))
+            if not os.path.exists(target):
+                raise FileNotFoundError(f"{path}:{line_number}: no se encuentra \"{match.group(1)}\"")
+            self.include(target, lines, files, included, stack + (path,))
+            lines.append(f"#line {line_number + 1} {number}")
+
+    def print_files(self, files):
+        print("   Archivos (número de fuente en los errores): " +
+              ", ".join(f"{index}={os.path.relpath(path, self.folder)}" for index, path in enumerate(files)))
+
+    def watch(self, interval=0.5):
+        """Vigila en segundo plano los archivos de las variantes ya creadas"""
+        if self.watcher is None:
+            self.stopping.clear()
+            self.watcher = threading.Thread(target=self.poll_files, args=(interval,), name="shader-watch",
+                                            daemon=True)
+            self.watcher.start()
+
+    def stop(self):
+        if self.watcher is not None:
+            self.stopping.set()
+            self.watcher.join()
+            self.watcher = None
+
+    def poll_files(self, interval):
+        while not self.stopping.wait(interval):
+            with self.lock:
+                variants = list(self.variants.items())
+            for key, variant in variants:
+                if not any(self.mtime(path) != mtime for path, mtime in variant.files.items()):
+                    continue
+                try:
+                    sources, files = self.preprocess(variant.name, variant.defines)
+                except (OSError, ValueError) as error:
+                    print(f"❌ Shader {variant.label()}: {error}")
+                    # No repetir el error hasta el próximo cambio
+                    variant.files = {path: self.mtime(path) for path in variant.files}
+                    continue
+                variant.files = files
+                with self.lock:
+                    self.pending[key] = sources
+
+    def mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def update(self):
+        """En el hilo de GL: reenlaza las variantes cuyos archivos cambiaron; devuelve cuántas se recargaron"""
+        if not self.pending:
+            return 0
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        reloaded = 0
+        for key, sources in pending.items():
+            variant = self.variants.get(key)
+            if variant is None or sources == variant.sources:
+                continue
+            try:
+                shader_cache.relink(variant.program_id, *sources)
+            except RuntimeError:
+                self.print_files(variant.files)
+                print(f"❌ Shader {variant.label()}: se mantiene la versión anterior")
+                continue
+            variant.sources = sources
+            reloaded += 1
+            print(f"🔄 Shader {variant.label()} recargado (programa {variant.program_id})")
+        return reloaded
+
+
+# Una biblioteca por proceso, como shader_cache
+shader_library = Shader_Library()
+
+
+if __name__ == "__main__":
+    name, *pairs = sys.argv[1:] or ["surface"]
+    vertex, fragment = shader_library.sources(name, **dict(pair.split("=", 1) for pair in pairs))
+    print(vertex)
+    print(fragment)
@@ -1,54 +1,20 @@
 import pygame
 from OpenGL.GL import *
+from .Utils import uniform_location
+from .Geometry import sphere_geometry
+from .LOD import sphere_lod_chain, LOD_Selector
+from .Culling import Bounds
+from .RenderQueue import render_state
 import numpy as np
-
-class Rotation:
-    def __init__(self, angle, axis):
-        self.angle = angle
-        self.axis = axis
+from .Matrices import Rotation, identity, translate, rotate
 
 def identity_matrix():
-    return np.identity(4, dtype=np.float32)
-
-def translate(matrix, x, y, z):
-    translation = np.identity(4, dtype=np.float32)
-    translation[0, 3] = x
-    translation[1, 3] = y
-    translation[2, 3] = z
-    return np.dot(matrix, translation)
-
-def rotate(matrix, angle, axis, local=True):
-    angle_rad = np.radians(angle)
-    cos_angle = np.cos(angle_rad)
-    sin_angle = np.sin(angle_rad)
-    
-    rotation = np.identity(4, dtype=np.float32)
-    
-    if axis == "x" or axis == 0:
-        rotation[1, 1] = cos_angle
-        rotation[1, 2] = -sin_angle
-        rotation[2, 1] = sin_angle
-        rotation[2, 2] = cos_angle
-    elif axis == "y" or axis == 1:
-        rotation[0, 0] = cos_angle
-        rotation[0, 2] = sin_angle
-        rotation[2, 0] = -sin_angle
-        rotation[2, 2] = cos_angle
-    elif axis == "z" or axis == 2:
-        rotation[0, 0] = cos_angle
-        rotation[0, 1] = -sin_angle
-        rotation[1, 0] = sin_angle
-        rotation[1, 1] = cos_angle
-    
-    if local:
-        return np.dot(matrix, rotation)
-    else:
-        return np.dot(rotation, matrix)
+    return identity()
 
 class Sphere:
     def __init__(self, program_id, radius=1.0, slices=128, stacks=64, 
                  location=pygame.Vector3(0, 0, 0), 
-                 move_rotation=None, move_translate=None):
+                 move_rotation=None, move_translate=None, lod=False, camera=None):
         self.program_id = program_id
         self.radius = radius
         self.slices = slices
@@ -56,6 +22,12 @@ class Sphere:
         self.location = location
         self.move_rotation = move_rotation
         self.move_translate = move_translate
+        self.bounds = Bounds.from_sphere(radius)
+        # LOD: cadena de teselaciones elegida por el radio proyectado (requiere cámara)
+        self.lod = lod
+        self.camera = camera
+        self.lod_selector = None
+        self.triangles_drawn = 0
         
         # 🎯 COLOR METÁLICO ÚNICO
         self.metal_color = pygame.Vector3(0.7, 0.7, 0.8)  # Plateado
@@ -71,53 +43,29 @@ class Sphere:
         print(f"🎯 Esfera metálica creada - Color: ({self.metal_color.x}, {self.metal_color.y}, {self.metal_color.z})")
 
     def create_geometry(self):
-        vertices = []
-        normals = []
-        indices = []
-        
-        # SOLO vértices y normales - SIN colores por vértice
-        for i in range(self.stacks + 1):
-            phi = np.pi * i / self.stacks
-            
-            for j in range(self.slices + 1):
-                theta = 2 * np.pi * j / self.slices
-                
-                x = self.radius * np.sin(phi) * np.cos(theta)
-                y = self.radius * np.cos(phi)
-                z = self.radius * np.sin(phi) * np.sin(theta)
-                
-                normal = pygame.Vector3(x, y, z).normalize()
-                
-                vertices.extend([x, y, z])
-                normals.extend([normal.x, normal.y, normal.z])
-        
-        # Generar índices
-        for i in range(self.stacks):
-            for j in range(self.slices):
-                first = i * (self.slices + 1) + j
-                second = first + self.slices + 1
-                
-                indices.extend([first, second, first + 1])
-                indices.extend([second, second + 1, first + 1])
-        
-        self.vertex_attributes = vertices + normals
-        self.index_data = indices
-        self.vertex_count = len(indices)
+        # Posición + normal intercaladas (coincide con el stride de setup_buffers)
+        if self.lod:
+            self.vertex_attributes, self.index_data, levels = sphere_lod_chain(self.radius, self.slices, self.stacks, "pn")
+            self.lod_selector = LOD_Selector(levels)
+            self.vertex_count = levels[0].index_count
+        else:
+            self.vertex_attributes, self.index_data = sphere_geometry(self.radius, self.slices, self.stacks, "pn")
+            self.vertex_count = len(self.index_data)
 
     def setup_buffers(self):
         self.vao = glGenVertexArrays(1)
         self.vbo = glGenBuffers(1)
         self.ebo = glGenBuffers(1)
         
-        glBindVertexArray(self.vao)
+        render_state.bind_vertex_array(self.vao)
         
         # VBO - solo posiciones y normales
-        vertex_data = np.array(self.vertex_attributes, dtype=np.float32)
+        vertex_data = self.vertex_attributes
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
         glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_STATIC_DRAW)
         
         # EBO
-        index_data = np.array(self.index_data, dtype=np.uint32)
+        index_data = self.index_data
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
         glBufferData(GL_ELEMENT_ARRAY_BUFFER, index_data.nbytes, index_data, GL_STATIC_DRAW)
         
@@ -132,21 +80,9 @@ class Sphere:
         glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(12))
         glEnableVertexAttribArray(1)
         
-        glBindVertexArray(0)
+        render_state.bind_vertex_array(0)
 
-    def draw(self):
-        glUseProgram(self.program_id)
-        
-        # 🎯 PASAR COLOR METÁLICO COMO UNIFORM
-        metal_color_loc = glGetUniformLocation(self.program_id, "metal_color")
-        shininess_loc = glGetUniformLocation(self.program_id, "material_shininess")
-        specular_loc = glGetUniformLocation(self.program_id, "material_specular_strength")
-        
-        glUniform3f(metal_color_loc, self.metal_color.x, self.metal_color.y, self.metal_color.z)
-        glUniform1f(shininess_loc, self.shininess)
-        glUniform1f(specular_loc, self.specular_strength)
-        
-        # Matriz de modelo
+    def model_matrix(self):
         model_mat = identity_matrix()
         
         if self.move_rotation is not None:
@@ -154,11 +90,32 @@ class Sphere:
                              self.move_rotation.axis, True)
         
         model_mat = translate(model_mat, self.location.x, self.location.y, self.location.z)
+        return model_mat
+
+    def draw(self):
+        self.render(self.model_matrix())
+
+    def render(self, model_mat):
+        """Dibuja con una matriz de modelo dada (p. ej. la de mundo de un nodo de escena)"""
+        render_state.use_program(self.program_id)
+        
+        # 🎯 PASAR COLOR METÁLICO COMO UNIFORM
+        metal_color_loc = uniform_location(self.program_id, "material_color")
+        shininess_loc = uniform_location(self.program_id, "material_shininess")
+        specular_loc = uniform_location(self.program_id, "material_specular_strength")
+        
+        glUniform3f(metal_color_loc, self.metal_color.x, self.metal_color.y, self.metal_color.z)
+        glUniform1f(shininess_loc, self.shininess)
+        glUniform1f(specular_loc, self.specular_strength)
         
-        model_mat_loc = glGetUniformLocation(self.program_id, "model_mat")
+        model_mat_loc = uniform_location(self.program_id, "model_mat")
         glUniformMatrix4fv(model_mat_loc, 1, GL_TRUE, model_mat)
         
         # Dibujar
-        glBindVertexArray(self.vao)
-        glDrawElements(GL_TRIANGLES, self.vertex_count, GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
\ No newline at end of file
+        index_count, index_offset = self.vertex_count, None
+        if self.lod_selector is not None and self.camera is not None:
+            level = self.lod_selector.select(self.camera.projected_radius(model_mat[:3, 3], self.radius))
+            index_count, index_offset = level.index_count, ctypes.c_void_p(level.index_offset)
+        self.triangles_drawn = index_count // 3
+        render_state.bind_vertex_array(self.vao)
+        glDrawElements(GL_TRIANGLES, index_count, GL_UNSIGNED_INT, index_offset)
\ No newline at end of file
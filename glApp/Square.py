@@ -11,4 +11,4 @@ class Square(Mesh):
                   [0.0, 1.0, 0.0],
                   [0.0, 0.0, 1.0],
                   [1.0, 0.0, 1.0]]
-        super().__init__(program_id, vertices, colors, GL_TRIANGLE_FAN, location)
\ No newline at end of file
+        super().__init__(program_id, vertices, None, None, colors, GL_TRIANGLE_FAN, location)
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""Buffers de vértices que se reescriben cada frame desde la CPU sin detener el pipeline.
+
+Un solo buffer GL dividido en regiones (triple buffer por defecto): el frame k escribe la región k % 3
+mientras la GPU puede seguir leyendo las de los dos frames anteriores. Tras los draws que leen una región
+se pone una fence; antes de volver a escribirla se espera a esa fence, que normalmente ya está señalada.
+
+Con GL 4.4 o ARB_buffer_storage el buffer se mapea una sola vez (persistente y coherente) y map() devuelve
+una vista NumPy de la región, donde se puede calcular directamente con out=... sin copias. Si no, cada
+región se mapea con GL_MAP_UNSYNCHRONIZED_BIT (la sincronización la hacen las fences) y unmap() la cierra.
+"""
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+# Espera máxima (ns) a la fence de una región que la GPU aún está leyendo
+FENCE_TIMEOUT = 5 * 10 ** 9
+STREAM_REGIONS = 3
+
+
+def supports_buffer_storage():
+    if not bool(glBufferStorage):
+        return False
+    if (int(glGetIntegerv(GL_MAJOR_VERSION)), int(glGetIntegerv(GL_MINOR_VERSION))) >= (4, 4):
+        return True
+    extensions = (glGetStringi(GL_EXTENSIONS, index) for index in range(glGetIntegerv(GL_NUM_EXTENSIONS)))
+    return b"GL_ARB_buffer_storage" in extensions
+
+
+def _memory(address, size):
+    return np.frombuffer((ctypes.c_ubyte * size).from_address(address), np.uint8)
+
+
+class Stream_Buffer():
+    """regions regiones de region_size bytes en un buffer GL de target (por defecto GL_ARRAY_BUFFER).
+
+    Uso por frame: view = map(dtype, shape) -> escribir en view -> unmap() -> draws con offset/region -> fence().
+    Una región conserva lo escrito en ella la vez anterior (hace regions frames), así que basta con
+    actualizar los atributos que cambian. Las vistas de map() dejan de ser válidas tras delete().
+    Con GL_ELEMENT_ARRAY_BUFFER hay que crearlo con el VAO correspondiente enlazado.
+    """
+    def __init__(self, region_size, regions=STREAM_REGIONS, target=GL_ARRAY_BUFFER, persistent=None):
+        self.region_size = region_size
+        self.regions = regions
+        self.target = target
+        self.persistent = supports_buffer_storage() if persistent is None else persistent
+        self.fences = [None] * regions
+        # map() avanza a la región 0 la primera vez
+        self.region = regions - 1
+        self.mapped = False
+        # Veces que hubo que esperar a la GPU antes de escribir una región
+        self.stalls = 0
+        self.buffer_ref = glGenBuffers(1)
+        size = region_size * regions
+        glBindBuffer(target, self.buffer_ref)
+        if self.persistent:
+            flags = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT
+            glBufferStorage(target, size, None, flags)
+            self.memory = _memory(glMapBufferRange(target, 0, size, flags), size)
+        else:
+            glBufferData(target, size, None, GL_STREAM_DRAW)
+            self.memory = None
+
+    @property
+    def offset(self):
+        """Offset en bytes de la región actual"""
+        return self.region * self.region_size
+
+    def map(self, dtype=np.uint8, shape=None):
+        """Vista NumPy escribible de la siguiente región; solo espera si la GPU todavía la está leyendo.
+
+        Si la región anterior sigue mapeada (se escribió pero no se dibujó, p. ej. un objeto descartado por
+        culling) se cierra antes: GL no permite mapear dos rangos del mismo buffer a la vez.
+        """
+        self.unmap()
+        self.region = (self.region + 1) % self.regions
+        self.wait(self.region)
+        if self.persistent:
+            view = self.memory[self.offset:self.offset + self.region_size]
+        else:
+            glBindBuffer(self.target, self.buffer_ref)
+            address = glMapBufferRange(self.target, self.offset, self.region_size,
+                                       GL_MAP_WRITE_BIT | GL_MAP_UNSYNCHRONIZED_BIT)
+            view = _memory(address, self.region_size)
+            self.mapped = True
+        view = view.view(dtype)
+        if shape is None:
+            return view
+        return view[:int(np.prod(shape))].reshape(shape)
+
+    def unmap(self):
+        """Termina la escritura de la región actual; con el buffer persistente no hace nada"""
+        if self.mapped:
+            glBindBuffer(self.target, self.buffer_ref)
+            glUnmapBuffer(self.target)
+            self.mapped = False
+
+    def write(self, array):
+        """Copia array a la siguiente región (una copia, directa a la memoria del buffer); devuelve su offset"""
+        array = np.asarray(array)
+        np.copyto(self.map(array.dtype, array.shape), array)
+        self.unmap()
+        return self.offset
+
+    def fence(self):
+        """Después de los draws que leen la región actual: no se reescribe hasta que la GPU los termine"""
+        if self.fences[self.region] is not None:
+            glDeleteSync(self.fences[self.region])
+        self.fences[self.region] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+    def wait(self, region):
+        fence = self.fences[region]
+        if fence is None:
+            return
+        self.fences[region] = None
+        if glClientWaitSync(fence, 0, 0) == GL_TIMEOUT_EXPIRED:
+            self.stalls += 1
+            glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, FENCE_TIMEOUT)
+        glDeleteSync(fence)
+
+    def delete(self):
+        for fence in self.fences:
+            if fence is not None:
+                glDeleteSync(fence)
+        self.fences = [None] * self.regions
+        glBindBuffer(self.target, self.buffer_ref)
+        if self.persistent or self.mapped:
+            glUnmapBuffer(self.target)
+        self.memory = None
+        glDeleteBuffers(1, [self.buffer_ref])
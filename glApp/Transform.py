@@ -0,0 +1,117 @@
+import time
+from math import sqrt
+
+from .Matrices import identity, flat_view, quaternion_values, multiply_quaternion_values, compose_values
+
+# Los parámetros move_* históricos se aplicaban una vez por frame con el reloj fijo a 60 fps
+FRAME_RATE = 60.0
+
+
+def _rotate_vector(q, v):
+    # v' = v + 2w (u x v) + 2 u x (u x v), con q = (u, w) unitario
+    x, y, z, w = q
+    vx, vy, vz = v
+    cx, cy, cz = y * vz - z * vy, z * vx - x * vz, x * vy - y * vx
+    return (vx + 2 * (w * cx + y * cz - z * cy),
+            vy + 2 * (w * cy + z * cx - x * cz),
+            vz + 2 * (w * cz + x * cy - y * cx))
+
+
+class Transform():
+    """Posición, orientación (cuaternión x, y, z, w), escala y velocidades de un objeto.
+
+    La matriz de modelo (T @ R @ S) se reconstruye desde el estado solo cuando algo cambia,
+    así que no acumula error de float32 y un objeto estático no hace trabajo por frame.
+    Las velocidades van en unidades por segundo; la lineal está en ejes locales como el antiguo move_translate.
+    El estado se guarda en floats de Python: para un solo objeto es más rápido que operar con arrays pequeños.
+    """
+    def __init__(self, position=(0, 0, 0), orientation=(0, 0, 0, 1), scale=(1, 1, 1),
+                 velocity=(0, 0, 0), angular_velocity=None, scale_velocity=(1, 1, 1)):
+        self.position = tuple(map(float, position))
+        self.orientation = tuple(map(float, orientation))
+        self.scale = tuple(map(float, scale))
+        self.velocity = tuple(map(float, velocity))
+        # Rotation(grados por segundo, eje) y factor de escala por segundo
+        self.angular_velocity = angular_velocity
+        self.scale_velocity = tuple(map(float, scale_velocity))
+        self.matrix = identity()
+        self.matrix_view = flat_view(self.matrix)
+        self.dirty = True
+        self.last_time = None
+
+    @classmethod
+    def from_legacy(cls, translation, rotation, scale, move_rotation=None, move_translate=None, move_scale=None):
+        """Equivalente a los argumentos de Mesh: identidad @ R @ T @ S y movimientos por frame a FRAME_RATE"""
+        orientation = quaternion_values(rotation.angle, rotation.axis)
+        # La traslación inicial se aplicaba después de la rotación, en ejes ya rotados
+        transform = cls(_rotate_vector(orientation, translation), orientation, scale)
+        if move_rotation is not None and move_rotation.angle != 0:
+            transform.angular_velocity = type(move_rotation)(move_rotation.angle * FRAME_RATE, move_rotation.axis)
+        if move_translate is not None:
+            transform.velocity = tuple(value * FRAME_RATE for value in move_translate)
+        if move_scale is not None:
+            transform.scale_velocity = tuple(value ** FRAME_RATE for value in move_scale)
+        return transform
+
+    @property
+    def moving(self):
+        return bool(self.angular_velocity is not None and self.angular_velocity.angle
+                    or any(self.velocity) or self.scale_velocity != (1.0, 1.0, 1.0))
+
+    def set_position(self, x, y, z):
+        self.position = (float(x), float(y), float(z))
+        self.dirty = True
+
+    def set_orientation(self, angle, axis):
+        self.orientation = quaternion_values(angle, axis)
+        self.dirty = True
+
+    def set_scale(self, x, y, z):
+        self.scale = (float(x), float(y), float(z))
+        self.dirty = True
+
+    def translate(self, x, y, z, local=True):
+        if local:
+            sx, sy, sz = self.scale
+            x, y, z = _rotate_vector(self.orientation, (x * sx, y * sy, z * sz))
+        px, py, pz = self.position
+        self.position = (px + x, py + y, pz + z)
+        self.dirty = True
+
+    def rotate(self, angle, axis, local=True):
+        step = quaternion_values(angle, axis)
+        if local:
+            x, y, z, w = multiply_quaternion_values(self.orientation, step)
+        else:
+            x, y, z, w = multiply_quaternion_values(step, self.orientation)
+        # Renormalizar en cada paso evita que el error de redondeo se acumule
+        norm = sqrt(x * x + y * y + z * z + w * w)
+        self.orientation = (x / norm, y / norm, z / norm, w / norm)
+        self.dirty = True
+
+    def integrate(self, elapsed):
+        """Avanza las velocidades elapsed segundos"""
+        if elapsed <= 0:
+            return
+        # Mismo orden que el antiguo M @ R @ T @ S por frame
+        if self.angular_velocity is not None and self.angular_velocity.angle:
+            self.rotate(self.angular_velocity.angle * elapsed, self.angular_velocity.axis)
+        if any(self.velocity):
+            vx, vy, vz = self.velocity
+            self.translate(vx * elapsed, vy * elapsed, vz * elapsed)
+        if self.scale_velocity != (1.0, 1.0, 1.0):
+            self.scale = tuple(value * rate ** elapsed for value, rate in zip(self.scale, self.scale_velocity))
+            self.dirty = True
+
+    def update(self, elapsed=None):
+        """Integra el movimiento (elapsed en segundos, o el tiempo real desde la última llamada) y devuelve la matriz"""
+        now = time.perf_counter()
+        if elapsed is None:
+            elapsed = 0.0 if self.last_time is None else now - self.last_time
+        self.last_time = now
+        if self.moving:
+            self.integrate(elapsed)
+        if self.dirty:
+            compose_values(self.matrix_view, self.position, self.orientation, self.scale)
+            self.dirty = False
+        return self.matrix
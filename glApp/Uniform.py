@@ -1,4 +1,6 @@
 from OpenGL.GL import *
+import numpy as np
+from .Utils import uniform_location
 
 class Uniform():
     def __init__(self, data_type, data):
@@ -7,10 +9,48 @@ class Uniform():
         self.variable_id = None
 
     def find_variable(self, program_id, variable_name):
-        self.variable_id = glGetUniformLocation(program_id, variable_name)
+        self.variable_id = uniform_location(program_id, variable_name)
 
     def load(self):
         if self.data_type == "vec3":
             glUniform3f(self.variable_id, self.data[0], self.data[1], self.data[2])
         elif self.data_type == "mat4":
-            glUniformMatrix4fv(self.variable_id, 1, GL_TRUE, self.data)
\ No newline at end of file
+            glUniformMatrix4fv(self.variable_id, 1, GL_TRUE, self.data)
+
+# Alineación y tamaño en floats de cada tipo según std140
+STD140_LAYOUT = {"float": (1, 1), "vec2": (2, 2), "vec3": (4, 3), "vec4": (4, 4), "mat4": (4, 16)}
+
+class Uniform_Block():
+    """Uniform buffer std140 compartido por varios programas; se sube una vez por frame con load()"""
+    def __init__(self, block_name, fields, binding):
+        self.block_name = block_name
+        self.binding = binding
+        self.offsets = {}
+        offset = 0
+        for name, data_type in fields:
+            align, size = STD140_LAYOUT[data_type]
+            offset = -(-offset // align) * align
+            self.offsets[name] = (offset, size)
+            offset += size
+        self.data = np.zeros(-(-offset // 4) * 4, np.float32)
+        self.buffer_ref = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.buffer_ref)
+        glBufferData(GL_UNIFORM_BUFFER, self.data.nbytes, None, GL_DYNAMIC_DRAW)
+        glBindBufferBase(GL_UNIFORM_BUFFER, binding, self.buffer_ref)
+
+    def attach(self, program_id):
+        """Enlaza el bloque del programa a este buffer; False si el programa no lo declara"""
+        index = glGetUniformBlockIndex(program_id, self.block_name)
+        if index == GL_INVALID_INDEX:
+            return False
+        glUniformBlockBinding(program_id, index, self.binding)
+        return True
+
+    def set(self, name, value):
+        # Las matrices se declaran row_major en GLSL, así que se copian tal cual
+        offset, size = self.offsets[name]
+        self.data[offset:offset + size] = np.ravel(value)
+
+    def load(self):
+        glBindBuffer(GL_UNIFORM_BUFFER, self.buffer_ref)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, self.data.nbytes, self.data)
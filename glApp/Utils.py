@@ -1,5 +1,6 @@
 from OpenGL.GL import *
 from OpenGL.GL.shaders import compileProgram, compileShader
+import numpy as np
 
 def compile_shader(shader_type, source):
     shader_id = glCreateShader(shader_type)
@@ -15,21 +16,107 @@ def compile_shader(shader_type, source):
     return shader_id
 
 def create_program(vertex_shader_code, fragment_shader_code):
+    """Programa enlazado, compartido si ya existe uno con las mismas fuentes (ver glApp/ShaderCache.py)"""
+    from .ShaderCache import shader_cache
+    return shader_cache.program(vertex_shader_code, fragment_shader_code)
+
+def link_program(vertex_shader_code, fragment_shader_code, retrievable=False, program_id=None):
+    """Compila y enlaza; con program_id reenlaza ese programa en su sitio (el id no cambia)"""
     vertex_shader_id = compile_shader(GL_VERTEX_SHADER, vertex_shader_code)
     fragment_shader_id = compile_shader(GL_FRAGMENT_SHADER, fragment_shader_code)
     
-    program_id = glCreateProgram()
+    if program_id is None:
+        program_id = glCreateProgram()
     glAttachShader(program_id, vertex_shader_id)
     glAttachShader(program_id, fragment_shader_id)
+    if retrievable:
+        # Permite leer el binario enlazado con glGetProgramBinary
+        glProgramParameteri(program_id, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
     glLinkProgram(program_id)
     
+    # El programa enlazado ya no necesita los shaders: se sueltan para poder reenlazarlo con otros
+    glDetachShader(program_id, vertex_shader_id)
+    glDetachShader(program_id, fragment_shader_id)
+    glDeleteShader(vertex_shader_id)
+    glDeleteShader(fragment_shader_id)
+    
     # Verificar enlace
     if not glGetProgramiv(program_id, GL_LINK_STATUS):
         error = glGetProgramInfoLog(program_id).decode()
         print(f"Error enlazando programa: {error}")
         raise RuntimeError("Program linking failed")
     
-    glDeleteShader(vertex_shader_id)
-    glDeleteShader(fragment_shader_id)
-    
-    return program_id
\ No newline at end of file
+    reflect_program(program_id)
+    return program_id
+
+def delete_program(program_id):
+    glDeleteProgram(program_id)
+    program_uniforms.pop(program_id, None)
+    program_attributes.pop(program_id, None)
+
+# Ubicaciones de uniforms y atributos por programa, consultadas una sola vez al enlazar
+program_uniforms = {}
+program_attributes = {}
+
+def reflect_program(program_id):
+    uniforms = {}
+    for index in range(glGetProgramiv(program_id, GL_ACTIVE_UNIFORMS)):
+        name = glGetActiveUniform(program_id, index)[0].decode()
+        if name.endswith("[0]"):
+            name = name[:-3]
+        uniforms[name] = glGetUniformLocation(program_id, name)
+    attributes = {}
+    for index in range(glGetProgramiv(program_id, GL_ACTIVE_ATTRIBUTES)):
+        name = glGetActiveAttrib(program_id, index)[0].decode()
+        attributes[name] = glGetAttribLocation(program_id, name)
+    program_uniforms[program_id] = uniforms
+    program_attributes[program_id] = attributes
+
+def uniform_location(program_id, name):
+    locations = program_uniforms.setdefault(program_id, {})
+    if name not in locations:
+        # Programa no creado con create_program o uniform inactivo: consultar una vez y recordar
+        locations[name] = glGetUniformLocation(program_id, name)
+    return locations[name]
+
+def attribute_location(program_id, name):
+    locations = program_attributes.setdefault(program_id, {})
+    if name not in locations:
+        locations[name] = glGetAttribLocation(program_id, name)
+    return locations[name]
+
+def format_vertices(coordinates, triangles):
+    """Expande los índices de cada triángulo a una lista plana de vértices (índices -1 dan ceros)"""
+    coordinates = np.asarray(coordinates, np.float32)
+    triangles = np.asarray(triangles, np.int64)
+    if coordinates.ndim == 1:
+        coordinates = coordinates.reshape(-1, 3)
+    if len(coordinates) == 0:
+        return np.zeros((len(triangles), coordinates.shape[1]), np.float32)
+    vertices = coordinates[np.maximum(triangles, 0)]
+    vertices[triangles < 0] = 0.0
+    return vertices
+
+
+def weld_vertices(*attributes):
+    """Une las esquinas con atributos idénticos; devuelve los atributos únicos y el array de índices"""
+    # Componentes por esquina a partir de la forma, para que una malla sin caras (0 esquinas) también sirva
+    widths = [int(np.prod(np.shape(attribute)[1:])) for attribute in attributes]
+    # + 0.0 convierte -0.0 en 0.0 para que ambos se comparen igual byte a byte
+    rows = np.ascontiguousarray(np.hstack([np.asarray(attribute, np.float32).reshape(-1, width)
+                                           for attribute, width in zip(attributes, widths)]) + np.float32(0.0))
+    keys = rows.view(np.dtype((np.void, rows.itemsize * rows.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    # Mantener el orden de primera aparición para no perder localidad
+    order = np.argsort(first)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    index_type = np.uint16 if len(order) <= 0xFFFF else np.uint32
+    indices = remap[inverse.ravel()].astype(index_type)
+    unique = rows[first[order]]
+    welded = []
+    start = 0
+    for width in widths:
+        welded.append(np.ascontiguousarray(unique[:, start:start + width]))
+        start += width
+    return (*welded, indices)
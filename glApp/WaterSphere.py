@@ -1,54 +1,23 @@
 import pygame
 from OpenGL.GL import *
+from .Utils import uniform_location
+from .Geometry import sphere_geometry
+from .LOD import sphere_lod_chain, LOD_Selector
+from .Culling import Bounds
+from .RenderQueue import render_state
+from .StreamBuffer import Stream_Buffer
+from .WaterSurface import Gerstner_Waves, Water_Simulation
 import numpy as np
+from .Matrices import Rotation, identity, translate, rotate
 
 def identity_matrix():
-    return np.identity(4, dtype=np.float32)
-
-def translate(matrix, x, y, z):
-    translation = np.identity(4, dtype=np.float32)
-    translation[0, 3] = x
-    translation[1, 3] = y
-    translation[2, 3] = z
-    return np.dot(matrix, translation)
-
-def rotate(matrix, angle, axis, local=True):
-    angle_rad = np.radians(angle)
-    cos_angle = np.cos(angle_rad)
-    sin_angle = np.sin(angle_rad)
-    
-    rotation = np.identity(4, dtype=np.float32)
-    
-    if axis == "x" or axis == 0:
-        rotation[1, 1] = cos_angle
-        rotation[1, 2] = -sin_angle
-        rotation[2, 1] = sin_angle
-        rotation[2, 2] = cos_angle
-    elif axis == "y" or axis == 1:
-        rotation[0, 0] = cos_angle
-        rotation[0, 2] = sin_angle
-        rotation[2, 0] = -sin_angle
-        rotation[2, 2] = cos_angle
-    elif axis == "z" or axis == 2:
-        rotation[0, 0] = cos_angle
-        rotation[0, 1] = -sin_angle
-        rotation[1, 0] = sin_angle
-        rotation[1, 1] = cos_angle
-    
-    if local:
-        return np.dot(matrix, rotation)
-    else:
-        return np.dot(rotation, matrix)
-
-class Rotation:
-    def __init__(self, angle, axis):
-        self.angle = angle
-        self.axis = axis
+    return identity()
 
 class WaterSphere:
     def __init__(self, program_id, radius=1.0, slices=128, stacks=64, 
                  location=pygame.Vector3(0, 0, 0), 
-                 move_rotation=None, move_translate=None):
+                 move_rotation=None, move_translate=None, lod=False, camera=None, dynamic=False, persistent=None,
+                 waves=None, threaded=False):
         self.program_id = program_id
         self.radius = radius
         self.slices = slices
@@ -56,13 +25,37 @@ class WaterSphere:
         self.location = location
         self.move_rotation = move_rotation
         self.move_translate = move_translate
+        self.bounds = Bounds.from_sphere(radius)
+        # Se dibuja con blending en la pasada transparente de Render_Queue
+        self.transparent = True
+        # LOD: cadena de teselaciones elegida por el radio proyectado (requiere cámara)
+        self.lod = lod
+        self.camera = camera
+        self.lod_selector = None
+        self.triangles_drawn = 0
         
         # 🌊 PROPIEDADES VISUALES
         self.water_color = pygame.Vector3(0.2, 0.4, 0.8)
+        # Uniform "time" del shader de agua (segundos); render() lo fija si no es None
+        self.time = None
         
         self.vertex_data = None
         self.index_data = None
         self.vertex_count = 0
+        # Vértices dinámicos: anillo de regiones escrito cada frame con stream_vertices()
+        self.dynamic = dynamic
+        self.persistent = persistent
+        self.stream = None
+        # Olas simuladas en la CPU (waves=True o un Gerstner_Waves); se avanzan con animate(tiempo)
+        self.simulation = None
+        if waves is not None and waves is not False:
+            if lod:
+                raise ValueError("Las olas simuladas no admiten LOD: la simulación usa una sola rejilla")
+            if waves is True:
+                waves = Gerstner_Waves(radius, slices, stacks)
+            self.simulation = Water_Simulation(waves, threaded)
+            self.bounds = Bounds.from_sphere(radius + waves.max_displacement)
+            self.dynamic = True
         
         self.create_geometry()
         self.setup_buffers()
@@ -70,72 +63,33 @@ class WaterSphere:
         print(f"🌊 Esfera de agua creada: {self.slices}x{self.stacks} resolución")
 
     def create_geometry(self):
-        vertices = []
-        normals = []
-        texcoords = []
-        indices = []
-        
-        # Generar geometría
-        for i in range(self.stacks + 1):
-            v = i / self.stacks  # 0 a 1
-            phi = v * np.pi      # 0 a π
-            
-            for j in range(self.slices + 1):
-                u = j / self.slices  # 0 a 1
-                theta = u * 2 * np.pi  # 0 a 2π
-                
-                # Coordenadas esféricas
-                x = self.radius * np.sin(phi) * np.cos(theta)
-                y = self.radius * np.cos(phi)
-                z = self.radius * np.sin(phi) * np.sin(theta)
-                
-                # Normal
-                normal = pygame.Vector3(x, y, z).normalize()
-                
-                # Coordenadas UV
-                uv_x = u
-                uv_y = 1.0 - v  # Invertir V para mapping correcto
-                
-                vertices.extend([x, y, z])
-                normals.extend([normal.x, normal.y, normal.z])
-                texcoords.extend([uv_x, uv_y])
-        
-        # Generar índices
-        for i in range(self.stacks):
-            for j in range(self.slices):
-                first = i * (self.slices + 1) + j
-                second = first + self.slices + 1
-                
-                # Dos triángulos por cuadrilátero
-                indices.extend([first, second, first + 1])
-                indices.extend([second, second + 1, first + 1])
-        
-        # Intercalar datos: posición(3) + normal(3) + uv(2)
-        interleaved = []
-        vertex_count = len(vertices) // 3
-        
-        for i in range(vertex_count):
-            # Posición
-            interleaved.extend(vertices[i*3 : i*3+3])
-            # Normal
-            interleaved.extend(normals[i*3 : i*3+3])
-            # UV
-            interleaved.extend(texcoords[i*2 : i*2+2])
-        
-        self.vertex_data = np.array(interleaved, dtype=np.float32)
-        self.index_data = np.array(indices, dtype=np.uint32)
-        self.vertex_count = len(indices)
+        # Datos intercalados: posición(3) + normal(3) + uv(2)
+        if self.lod:
+            self.vertex_data, self.index_data, levels = sphere_lod_chain(self.radius, self.slices, self.stacks, "pnt")
+            self.lod_selector = LOD_Selector(levels)
+            self.vertex_count = levels[0].index_count
+        else:
+            self.vertex_data, self.index_data = sphere_geometry(self.radius, self.slices, self.stacks, "pnt")
+            self.vertex_count = len(self.index_data)
 
     def setup_buffers(self):
         self.vao = glGenVertexArrays(1)
         self.vbo = glGenBuffers(1)
         self.ebo = glGenBuffers(1)
         
-        glBindVertexArray(self.vao)
+        render_state.bind_vertex_array(self.vao)
         
         # VBO
+        if self.dynamic:
+            self.stream = Stream_Buffer(self.vertex_data.nbytes, persistent=self.persistent)
+            glDeleteBuffers(1, [self.vbo])
+            self.vbo = self.stream.buffer_ref
+            # Todas las regiones empiezan con la geometría base
+            for _ in range(self.stream.regions):
+                self.stream.write(self.vertex_data)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferData(GL_ARRAY_BUFFER, self.vertex_data.nbytes, self.vertex_data, GL_STATIC_DRAW)
+        if not self.dynamic:
+            glBufferData(GL_ARRAY_BUFFER, self.vertex_data.nbytes, self.vertex_data, GL_STATIC_DRAW)
         
         # EBO
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
@@ -156,12 +110,20 @@ class WaterSphere:
         glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(24))
         glEnableVertexAttribArray(2)
         
-        glBindVertexArray(0)
+        render_state.bind_vertex_array(0)
 
-    def draw(self):
-        glUseProgram(self.program_id)
-        
-        # Matriz de modelo
+    def stream_vertices(self):
+        """Vista (vértices, 8) [posición | normal | uv] de la siguiente región (dynamic=True); se dibuja en el próximo draw().
+
+        La región conserva lo que se escribió en ella hace stream.regions frames: se puede escribir solo lo que cambia.
+        """
+        return self.stream.map(np.float32, (self.vertex_data.size // 8, 8))
+
+    def animate(self, time):
+        """Avanza las olas al instante time (segundos) y las escribe en la región del próximo draw()"""
+        self.simulation.write(time, self.stream_vertices())
+
+    def model_matrix(self):
         model_mat = identity_matrix()
         
         if self.move_rotation is not None:
@@ -169,11 +131,32 @@ class WaterSphere:
                              self.move_rotation.axis, True)
         
         model_mat = translate(model_mat, self.location.x, self.location.y, self.location.z)
+        return model_mat
+
+    def draw(self):
+        self.render(self.model_matrix())
+
+    def render(self, model_mat):
+        """Dibuja con una matriz de modelo dada (p. ej. la de mundo de un nodo de escena)"""
+        render_state.use_program(self.program_id)
         
-        model_mat_loc = glGetUniformLocation(self.program_id, "model_mat")
+        model_mat_loc = uniform_location(self.program_id, "model_mat")
         glUniformMatrix4fv(model_mat_loc, 1, GL_TRUE, model_mat)
+        if self.time is not None:
+            glUniform1f(uniform_location(self.program_id, "time"), self.time)
         
         # Dibujar
-        glBindVertexArray(self.vao)
-        glDrawElements(GL_TRIANGLES, self.vertex_count, GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
\ No newline at end of file
+        index_count, index_offset = self.vertex_count, None
+        if self.lod_selector is not None and self.camera is not None:
+            level = self.lod_selector.select(self.camera.projected_radius(model_mat[:3, 3], self.radius))
+            index_count, index_offset = level.index_count, ctypes.c_void_p(level.index_offset)
+        self.triangles_drawn = index_count // 3
+        render_state.bind_vertex_array(self.vao)
+        if self.stream is None:
+            glDrawElements(GL_TRIANGLES, index_count, GL_UNSIGNED_INT, index_offset)
+            return
+        # Región escrita en este frame: los atributos apuntan a la primera y el vértice base salta a ella
+        self.stream.unmap()
+        glDrawElementsBaseVertex(GL_TRIANGLES, index_count, GL_UNSIGNED_INT, index_offset,
+                                 self.stream.region * (self.vertex_data.size // 8))
+        self.stream.fence()
\ No newline at end of file
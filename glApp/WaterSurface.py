@@ -0,0 +1,125 @@
+"""Simulación de olas en la CPU sobre la rejilla de WaterSphere: suma de olas de Gerstner vectorizada en NumPy.
+
+La rejilla es la de sphere_geometry: (stacks + 1) x (slices + 1) vértices con θ = 2π·u y φ = π·v. Cada ola
+tiene números de onda enteros (m en θ, n en φ), así que la costura θ = 0 / 2π coincide; la amplitud se
+multiplica por sin φ para que los polos (vértices repetidos) no se separen. Cada ola desplaza los vértices
+a lo largo de la normal (altura) y en su dirección de avance sobre la esfera (la cresta afilada de Gerstner).
+Las normales se recalculan con diferencias finitas sobre la rejilla.
+
+Con threaded=True un hilo calcula el paso del frame siguiente mientras el hilo de GL dibuja el actual
+(NumPy suelta el GIL en las operaciones grandes); el tiempo de ese paso se predice con el último intervalo.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# (m, n, amplitud, inclinación de Gerstner, velocidad angular): olas por defecto para una esfera de radio 1
+DEFAULT_WAVES = [(6, 3, 0.030, 0.6, 1.1),
+                 (-9, 5, 0.018, 0.5, 1.7),
+                 (13, -8, 0.010, 0.4, 2.3),
+                 (4, 11, 0.008, 0.3, 2.9)]
+
+
+class Gerstner_Waves():
+    """Olas de Gerstner sobre una esfera de radius con slices x stacks segmentos"""
+    def __init__(self, radius=1.0, slices=128, stacks=64, waves=DEFAULT_WAVES):
+        self.radius = radius
+        waves = np.asarray(waves, np.float32).reshape(-1, 5)
+        m, n, amplitude, steepness, self.speed = waves.T
+        theta = np.arange(slices + 1, dtype=np.float32) * np.float32(2 * np.pi / slices)
+        phi = np.arange(stacks + 1, dtype=np.float32) * np.float32(np.pi / stacks)
+        # La última columna es la costura: mismo θ que la primera para que coincidan exactamente
+        theta[-1] = 0.0
+        theta, phi = np.meshgrid(theta, phi)
+        sin_t, cos_t, sin_p, cos_p = np.sin(theta), np.cos(theta), np.sin(phi), np.cos(phi)
+        # Todo por componentes (3, filas, columnas): las operaciones recorren memoria contigua
+        # Misma orientación que sphere_surface en Geometry.py
+        self.normal = np.stack([sin_p * cos_t, cos_p, sin_p * sin_t])
+        self.base = radius * self.normal
+        # Tangentes unitarias: este (θ creciente) y sur (φ creciente)
+        east = np.stack([-sin_t, np.zeros_like(sin_t), cos_t])
+        south = np.stack([cos_p * cos_t, -sin_p, cos_p * sin_t])
+        # Fase sin tiempo de cada ola sobre la rejilla: (olas, filas, columnas)
+        self.phase = m[:, None, None] * theta + n[:, None, None] * phi
+        # Amplitudes por ola; el desplazamiento lateral va en la dirección de avance (m, n) normalizada
+        length = np.hypot(m, n)
+        self.height_amplitude = amplitude
+        self.east_amplitude = amplitude * steepness * m / length
+        self.south_amplitude = amplitude * steepness * n / length
+        # sin φ apaga las olas en los polos; se aplica junto con las direcciones de desplazamiento
+        self.height_axis = sin_p * self.normal
+        self.east_axis = sin_p * east
+        self.south_axis = sin_p * south
+        # Cota del desplazamiento de un vértice, para el volumen envolvente
+        self.max_displacement = float(np.sum(amplitude * (1.0 + steepness)))
+
+    def positions(self, time):
+        """Posiciones (3, filas, columnas) en el instante time"""
+        phase = self.phase - (self.speed * np.float32(time))[:, None, None]
+        sin_phase, cos_phase = np.sin(phase), np.cos(phase)
+        # Suma de olas como producto con las amplitudes: (olas,) x (olas, filas, columnas)
+        height = np.tensordot(self.height_amplitude, sin_phase, 1)
+        east = np.tensordot(self.east_amplitude, cos_phase, 1)
+        south = np.tensordot(self.south_amplitude, cos_phase, 1)
+        positions = self.base + height * self.height_axis
+        positions += east * self.east_axis
+        positions += south * self.south_axis
+        return positions
+
+    def normals(self, positions):
+        """Normales (3, filas, columnas) por diferencias centradas; en la costura se usan las columnas del otro lado"""
+        d_u = np.empty_like(positions)
+        d_u[:, :, 1:-1] = positions[:, :, 2:] - positions[:, :, :-2]
+        d_u[:, :, 0] = positions[:, :, 1] - positions[:, :, -2]
+        d_u[:, :, -1] = d_u[:, :, 0]
+        d_v = np.empty_like(positions)
+        d_v[:, 1:-1] = positions[:, 2:] - positions[:, :-2]
+        d_v[:, 0] = positions[:, 1] - positions[:, 0]
+        d_v[:, -1] = positions[:, -1] - positions[:, -2]
+        # Producto vectorial d_u x d_v componente a componente
+        normals = np.empty_like(positions)
+        normals[0] = d_u[1] * d_v[2] - d_u[2] * d_v[1]
+        normals[1] = d_u[2] * d_v[0] - d_u[0] * d_v[2]
+        normals[2] = d_u[0] * d_v[1] - d_u[1] * d_v[0]
+        # En los polos d_u es cero: la normal es la de la esfera (allí las olas no desplazan)
+        normals[:, 0] = self.normal[:, 0]
+        normals[:, -1] = self.normal[:, -1]
+        normals /= np.sqrt(normals[0] * normals[0] + normals[1] * normals[1] + normals[2] * normals[2])
+        return normals
+
+    def step(self, time, out):
+        """Escribe posición y normal del instante time en out (vértices, >= 6) [posición | normal | ...]"""
+        positions = self.positions(time)
+        out[:, :3] = positions.reshape(3, -1).T
+        out[:, 3:6] = self.normals(positions).reshape(3, -1).T
+
+
+class Water_Simulation():
+    """Ejecuta los pasos de waves en el hilo de GL o, con threaded=True, un frame por delante en otro hilo"""
+    def __init__(self, waves, threaded=False):
+        self.waves = waves
+        self.threaded = threaded
+        self.pool = ThreadPoolExecutor(1, thread_name_prefix="water") if threaded else None
+        self.future = None
+        self.scratch = None
+        self.last_time = None
+
+    def write(self, time, out):
+        """Deja en out el estado de time (con threaded, el calculado en el frame anterior para este instante)"""
+        if not self.threaded:
+            self.waves.step(time, out)
+            return
+        if self.future is None:
+            self.scratch = np.empty((len(out), 6), np.float32)
+            self.waves.step(time, self.scratch)
+        else:
+            self.future.result()
+        out[:, :6] = self.scratch
+        # Próximo frame: mismo intervalo que el último
+        step = 0.0 if self.last_time is None else time - self.last_time
+        self.last_time = time
+        self.future = self.pool.submit(self.waves.step, time + step, self.scratch)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
@@ -0,0 +1,15 @@
+import os
+
+# Con GLAPP_HEADLESS=<frames> PyOGApp dibuja en un FBO sin ventana (ver glApp/Headless.py)
+HEADLESS_ENV = "GLAPP_HEADLESS"
+
+
+def use_egl():
+    """Contexto EGL sin superficie para PyOpenGL y SDL sin vídeo; hay que llamarla antes de importar OpenGL"""
+    os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+if os.environ.get(HEADLESS_ENV):
+    use_egl()
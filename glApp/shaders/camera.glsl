@@ -0,0 +1,8 @@
+// Bloque de cámara compartido (binding 0, ver glApp/Camera.py)
+layout (std140, row_major) uniform Camera
+{
+    mat4 projection_mat;
+    mat4 view_mat;
+    vec3 view_pos;
+    vec3 light_pos;
+};
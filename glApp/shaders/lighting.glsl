@@ -0,0 +1,19 @@
+// Modelos especulares para SPECULAR_MODEL
+#define SPECULAR_NONE 0
+#define SPECULAR_PHONG 1
+#define SPECULAR_BLINN 2
+
+#ifndef SPECULAR_MODEL
+#define SPECULAR_MODEL SPECULAR_PHONG
+#endif
+
+float specular_term(vec3 norm, vec3 light_dir, vec3 view_dir, float shininess)
+{
+#if SPECULAR_MODEL == SPECULAR_BLINN
+    vec3 halfway_dir = normalize(light_dir + view_dir);
+    return pow(max(dot(norm, halfway_dir), 0.0), shininess);
+#else
+    vec3 reflect_dir = reflect(-light_dir, norm);
+    return pow(max(dot(view_dir, reflect_dir), 0.0), shininess);
+#endif
+}
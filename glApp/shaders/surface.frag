@@ -0,0 +1,106 @@
+#version 330 core
+// Material de superficie Blinn-Phong con variantes por #define:
+//   SPECULAR_MODEL     SPECULAR_NONE, SPECULAR_PHONG (por defecto) o SPECULAR_BLINN
+//   WAVES              normal animada con las UVs y el uniform time, alfa variable (agua)
+//   FRESNEL            mezcla hacia el color de la luz en ángulos rasantes
+//   INSTANCED          color por instancia en lugar del uniform material_color
+//   AMBIENT_STRENGTH, DIFFUSE_STRENGTH, SPECULAR_GAIN, COLOR_MIX, TRANSPARENCY: constantes del material
+//   MULTIPLY_COLOR     multiplica el resultado por el color (aspecto mate)
+//   MATERIAL_COLOR, SHININESS, SPECULAR_STRENGTH: fijan como constante lo que si no es uniform
+#include "camera.glsl"
+#include "lighting.glsl"
+
+#ifndef AMBIENT_STRENGTH
+#define AMBIENT_STRENGTH 0.1
+#endif
+#ifndef TRANSPARENCY
+#define TRANSPARENCY 0.7
+#endif
+
+in vec3 frag_normal;
+in vec3 frag_pos;
+#ifdef WAVES
+in vec3 view_dir;
+in vec2 uv;
+uniform float time;
+#endif
+
+#ifdef INSTANCED
+in vec3 material_color;
+#elif defined(MATERIAL_COLOR)
+const vec3 material_color = MATERIAL_COLOR;
+#else
+uniform vec3 material_color;
+#endif
+
+#if SPECULAR_MODEL != SPECULAR_NONE
+#ifdef SHININESS
+const float material_shininess = SHININESS;
+#else
+uniform float material_shininess;
+#endif
+#ifdef SPECULAR_STRENGTH
+const float material_specular_strength = SPECULAR_STRENGTH;
+#else
+uniform float material_specular_strength;
+#endif
+#endif
+
+out vec4 final_color;
+
+void main()
+{
+    vec3 light_color = vec3(1.0, 1.0, 1.0);
+
+    vec3 norm = normalize(frag_normal);
+    vec3 light_dir = normalize(light_pos - frag_pos);
+#ifdef WAVES
+    // Ondas con UVs y tiempo que deforman la normal
+    vec2 animated_uv = uv;
+    animated_uv.x += sin(time * 2.0 + uv.y * 8.0) * 0.02;
+    animated_uv.y += cos(time * 1.5 + uv.x * 6.0) * 0.02;
+    float wave_pattern = sin(animated_uv.x * 20.0 + time * 3.0) *
+                        cos(animated_uv.y * 15.0 + time * 2.0) * 0.1;
+    norm = normalize(norm + vec3(wave_pattern, 0.0, wave_pattern) * 0.3);
+#else
+    vec3 view_dir = normalize(view_pos - frag_pos);
+#endif
+
+    vec3 ambient = AMBIENT_STRENGTH * material_color;
+    float diff = max(dot(norm, light_dir), 0.0);
+#ifdef DIFFUSE_STRENGTH
+    vec3 diffuse = diff * material_color * DIFFUSE_STRENGTH;
+#else
+    vec3 diffuse = diff * material_color;
+#endif
+    vec3 result = ambient + diffuse;
+
+#ifdef FRESNEL
+    float fresnel = pow(1.0 - max(dot(norm, view_dir), 0.0), 2.0);
+    fresnel = mix(0.1, 0.6, fresnel);
+    result = mix(result, light_color, fresnel * 0.7);
+#endif
+
+#if SPECULAR_MODEL != SPECULAR_NONE
+    float spec = specular_term(norm, light_dir, view_dir, material_shininess);
+    vec3 specular = material_specular_strength * spec * light_color;
+#ifdef SPECULAR_GAIN
+    specular = specular * SPECULAR_GAIN;
+#endif
+    result = result + specular;
+#endif
+
+#ifdef COLOR_MIX
+    result = mix(result, material_color, COLOR_MIX);
+#endif
+#ifdef MULTIPLY_COLOR
+    result = result * material_color;
+#endif
+
+#ifdef WAVES
+    float alpha = clamp(TRANSPARENCY + wave_pattern * 0.2, 0.5, 0.9);
+#else
+    float alpha = 1.0;
+#endif
+    final_color = vec4(result, alpha);
+}
@@ -0,0 +1,42 @@
+#version 330 core
+// Vértices de las esferas y mallas con material de superficie.
+// INSTANCED: matriz de modelo y color por instancia (glApp/InstancedMesh.py) en lugar de model_mat.
+// WAVES: pasa las UVs y la dirección de vista que usa el agua.
+#include "camera.glsl"
+
+layout (location = 0) in vec3 position;
+layout (location = 1) in vec3 vertex_normal;
+
+#ifdef WAVES
+layout (location = 2) in vec2 texcoord;
+out vec3 view_dir;
+out vec2 uv;
+#endif
+
+#ifdef INSTANCED
+layout (location = 3) in mat4 instance_model_mat;
+layout (location = 7) in vec4 instance_color;
+out vec3 material_color;
+#else
+uniform mat4 model_mat;
+#endif
+
+out vec3 frag_normal;
+out vec3 frag_pos;
+
+void main()
+{
+#ifdef INSTANCED
+    mat4 model = instance_model_mat;
+    material_color = instance_color.rgb;
+#else
+    mat4 model = model_mat;
+#endif
+    gl_Position = projection_mat * view_mat * model * vec4(position, 1.0);
+    frag_normal = mat3(transpose(inverse(model))) * vertex_normal;
+    frag_pos = vec3(model * vec4(position, 1.0));
+#ifdef WAVES
+    view_dir = normalize(-frag_pos);
+    uv = texcoord;
+#endif
+}